@@ -0,0 +1,79 @@
+"""Compara o custo por passo dos motores denso e de frente de fogo.
+
+Varre a área da grade com dois tipos de foco: um ponto no centro (frente
+curta) e uma linha atravessando a grade (frente do tamanho da largura).
+
+    python benchmarks/bench_engines.py --sizes 100 200 400 800 --steps 20
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fire_automata import (  # noqa: E402
+    BURNING,
+    CELL_ELEVATION_LAYER,
+    CELL_MOISTURE_LAYER,
+    CELL_STATUS_LAYER,
+    TREE,
+    make_engine,
+)
+
+
+def make_grid(size, ignition, seed):
+    rng = np.random.default_rng(seed)
+    grid = np.zeros((size, size, 3), dtype=float)
+    grid[:, :, CELL_STATUS_LAYER] = TREE
+    grid[:, :, CELL_ELEVATION_LAYER] = rng.uniform(0, 25, (size, size))
+    grid[:, :, CELL_MOISTURE_LAYER] = rng.uniform(0.1, 0.4, (size, size))
+    if ignition == "point":
+        grid[size // 2, size // 2, CELL_STATUS_LAYER] = BURNING
+    else:
+        grid[size // 2, :, CELL_STATUS_LAYER] = BURNING
+    return grid
+
+
+def time_engine(name, size, ignition, steps, seed):
+    grid = make_grid(size, ignition, seed)
+    engine = make_engine(name, grid, rng=np.random.default_rng(seed))
+    # Aquecimento em uma cópia, fora da medição
+    make_engine(name, grid).step(grid.copy())
+    start = time.perf_counter()
+    for _ in range(steps):
+        grid = engine.step(grid)
+    elapsed = time.perf_counter() - start
+    status = grid[:, :, CELL_STATUS_LAYER]
+    front = int(np.count_nonzero(status == BURNING))
+    return elapsed / steps, front
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100, 200, 400, 800, 1600]
+    )
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(
+        f"{'lado':>6} {'foco':>6} {'frente':>7} "
+        f"{'dense ms':>10} {'frontier ms':>12} {'ganho':>7}"
+    )
+    for size in args.sizes:
+        for ignition in ("point", "line"):
+            dense, front = time_engine("dense", size, ignition, args.steps, args.seed)
+            frontier, _ = time_engine("frontier", size, ignition, args.steps, args.seed)
+            print(
+                f"{size:>6} {ignition:>6} {front:>7} {dense * 1e3:>10.3f} "
+                f"{frontier * 1e3:>12.3f} {dense / frontier:>6.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,500 @@
+"""Suíte de benchmarks: geração de terreno, passo do fogo, desenho e gás de rede.
+
+Roda sem janela (o pygame usa o driver de vídeo "dummy") e com seeds fixas, então
+os números são comparáveis entre commits na mesma máquina. Cada caso é executado uma
+vez sob `tracemalloc`, como aquecimento e para medir o pico de memória alocada
+pelo Python e pelo NumPy (superfícies do SDL não entram), e depois
+`--repeats` vezes cronometradas (ou mais, até somar `MIN_SECONDS`, nos casos
+pequenos); vale a melhor repetição.
+
+    python benchmarks/bench_suite.py --profile quick --output referencia.json
+    python benchmarks/bench_suite.py --profile quick --compare referencia.json
+
+A referência depende da máquina e não fica no repositório: gere-a localmente
+com `--output`, a partir do commit de comparação.
+
+Com `--compare`, casos mais lentos (ou com mais memória) que a referência além
+de `--tolerance` são marcados como regressão e o processo sai com código 1; o
+mesmo vale para casos que não existem na referência, que precisa ser gerada de
+novo quando um caso é adicionado.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import zlib
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np  # noqa: E402
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+WATER_DIR = os.path.join(ROOT, "previus-water-simulation-discarted-tries")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, WATER_DIR)
+
+from fire_automata import (  # noqa: E402
+    BURNED,
+    TREE,
+    FireSimulation,
+    ISOMETRIC_3D,
+    initialize_grid,
+)
+
+BASE_SEED = 20240601
+# O modo "legacy" sorteia célula a célula em Python, e o isométrico desenha um
+# polígono por célula: acima destes lados os casos levariam minutos.
+LEGACY_TERRAIN_MAX_SIZE = 1000
+ISOMETRIC_MAX_SIZE = 200
+RASTER_PIXELS = 800  # Lado da janela do renderizador raster
+SCATTERED_POINTS = 16
+# Casos rápidos repetem até somar este tempo medido, para reduzir o ruído,
+# desde que as repetições extras (com a preparação) não passem de MAX_SECONDS
+MIN_SECONDS = 0.5
+MAX_SECONDS = 5.0
+
+# As densidades ficam em torno do limiar de percolação de sítios da rede
+# quadrada (~0.593), onde o tamanho do incêndio varia mais.
+PROFILES = {
+    "quick": {
+        "sizes": [50, 200, 1000],
+        "densities": [0.55, 0.59, 0.65],
+        "ignitions": ["point", "line", "scattered"],
+        "water_sizes": [100, 500],
+        "steps": 30,
+        "frames": 30,
+    },
+    "full": {
+        "sizes": [50, 200, 500, 1000, 2000, 4000],
+        "densities": [0.5, 0.55, 0.59, 0.62, 0.65, 0.7],
+        "ignitions": ["point", "line", "scattered"],
+        "water_sizes": [100, 500, 1000, 2000],
+        "steps": 20,
+        "frames": 20,
+    },
+}
+
+GROUPS = ("terrain", "step", "render", "water", "water-render")
+
+# Métrica usada na comparação com a referência e se maior é melhor
+PRIMARY_METRICS = {
+    "terrain": ("cells_per_second", True),
+    "step": ("cells_per_second", True),
+    "render": ("frame_ms", False),
+    "water": ("cells_per_second", True),
+    "water-render": ("frame_ms", False),
+}
+
+
+def measure(setup, run, repeats, track_memory=True):
+    """Executa `run(setup())` e devolve `(melhor tempo, resultado, pico em bytes)`.
+
+    Só `run` é cronometrado; a passada com `tracemalloc` inclui `setup`.
+    """
+    peak = None
+    if track_memory:
+        tracemalloc.start()
+        run(setup())
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    best, result = float("inf"), None
+    total, runs = 0.0, 0
+    deadline = None
+    while True:
+        if runs >= repeats:
+            deadline = deadline or time.perf_counter() + MAX_SECONDS
+            if total >= MIN_SECONDS or time.perf_counter() >= deadline:
+                break
+        state = setup()
+        start = time.perf_counter()
+        result = run(state)
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        total += elapsed
+        runs += 1
+    return best, result, peak
+
+
+def case_seed(*key):
+    """Seed fixa de um caso, derivada de `BASE_SEED` e dos parâmetros."""
+    return BASE_SEED + zlib.crc32("/".join(map(str, key)).encode())
+
+
+def ignition_points(grid, layout, seed):
+    rows, cols = grid.shape[:2]
+    status = grid.status
+    if layout == "point":
+        status[rows // 2, cols // 2] = TREE
+        return [(cols // 2, rows // 2)]
+    if layout == "line":
+        status[rows // 2, :] = TREE
+        return [(x, rows // 2) for x in range(cols)]
+    ys, xs = np.nonzero(status == TREE)
+    chosen = np.random.default_rng(seed).choice(ys.size, SCATTERED_POINTS, False)
+    return [(int(xs[i]), int(ys[i])) for i in chosen]
+
+
+def bench_terrain(profile, repeats, track_memory):
+    for size in profile["sizes"]:
+        for mode in ("legacy", "fast", "fractal"):
+            if mode == "legacy" and size > LEGACY_TERRAIN_MAX_SIZE:
+                continue
+            seed = case_seed("terrain", size, mode)
+            elapsed, _, peak = measure(
+                lambda: None,
+                lambda _: initialize_grid(size, size, seed=seed, mode=mode),
+                repeats,
+                track_memory,
+            )
+            yield f"terrain/{mode}/{size}", {"size": size, "mode": mode}, peak, {
+                "seconds": elapsed,
+                "cells_per_second": size * size / elapsed,
+            }
+
+
+def bench_step(profile, repeats, track_memory):
+    steps = profile["steps"]
+    for size in profile["sizes"]:
+        for density in profile["densities"]:
+            for layout in profile["ignitions"]:
+                for engine in ("dense", "frontier", "kernel", "event"):
+                    seed = case_seed("step", size, density, layout)
+
+                    def setup():
+                        grid = initialize_grid(size, size, density, seed, mode="fast")
+                        simulation = FireSimulation(
+                            grid,
+                            engine,
+                            rng=np.random.default_rng(seed),
+                            **ISOMETRIC_3D.engine_rules(engine),
+                        )
+                        for x, y in ignition_points(grid, layout, seed):
+                            simulation.start_fire(x, y)
+                        return simulation
+
+                    def run(simulation):
+                        for _ in range(steps):
+                            simulation.step()
+                        return simulation
+
+                    elapsed, simulation, peak = measure(
+                        setup, run, repeats, track_memory
+                    )
+                    status = simulation.grid.status
+                    yield (
+                        f"step/{engine}/{size}/d{density}/{layout}",
+                        {
+                            "size": size,
+                            "density": density,
+                            "ignition": layout,
+                            "engine": engine,
+                            "steps": steps,
+                        },
+                        peak,
+                        {
+                            "step_ms": elapsed / steps * 1e3,
+                            "steps_per_second": steps / elapsed,
+                            "cells_per_second": steps * size * size / elapsed,
+                            # Determinístico: muda só se o comportamento mudar
+                            "burned": int(np.count_nonzero(status == BURNED)),
+                        },
+                    )
+
+
+def _frame_metrics(frame_times, first_frame):
+    frame_times = np.array(frame_times) * 1e3
+    return {
+        "first_frame_ms": first_frame * 1e3,
+        "frame_ms": float(np.median(frame_times)),
+        "frame_p95_ms": float(np.percentile(frame_times, 95)),
+        "frames_per_second": 1e3 / float(np.median(frame_times)),
+    }
+
+
+def bench_render(profile, repeats, track_memory):
+    import pygame
+
+    from fire_automata import render
+
+    pygame.display.init()
+    frames = profile["frames"]
+    for size in profile["sizes"]:
+        for view in ("raster", "isometric"):
+            if view == "isometric" and size > ISOMETRIC_MAX_SIZE:
+                continue
+            seed = case_seed("render", size)
+
+            def setup():
+                grid = initialize_grid(size, size, seed=seed, mode="fast")
+                simulation = FireSimulation(
+                    grid, "frontier", rng=np.random.default_rng(seed)
+                )
+                for x, y in ignition_points(grid, "point", seed):
+                    simulation.start_fire(x, y)
+                if view == "raster":
+                    cell_size = max(1, RASTER_PIXELS // size)
+                    renderer = render.RasterRenderer(cell_size, 25.0)
+                    surface = pygame.Surface((size * cell_size, size * cell_size))
+                else:
+                    cell_size = max(1, ISOMETRIC_3D.cell_size * 50 // size)
+                    width, height = ISOMETRIC_3D.screen_size
+                    renderer = render.IsometricRenderer(
+                        (width, height), cell_size, (width // 2, height // 4)
+                    )
+                    surface = pygame.Surface((width, height))
+                return simulation, renderer, surface
+
+            def run(state):
+                """Primeiro quadro completo, depois um quadro por passo."""
+                simulation, renderer, surface = state
+                start = time.perf_counter()
+                renderer.draw(surface, simulation.grid)
+                first_frame = time.perf_counter() - start
+                frame_times = []
+                for _ in range(frames):
+                    simulation.step()
+                    start = time.perf_counter()
+                    renderer.draw(surface, simulation.grid)
+                    frame_times.append(time.perf_counter() - start)
+                return frame_times, first_frame
+
+            _, (frame_times, first_frame), peak = measure(
+                setup, run, repeats, track_memory
+            )
+            yield f"render/{view}/{size}", {
+                "size": size,
+                "view": view,
+                "frames": frames,
+            }, peak, _frame_metrics(frame_times, first_frame)
+
+
+def _water_state(linhas, colunas, seed):
+    """Rede com 20% das direções ocupadas e fontes na primeira coluna."""
+    rng = np.random.default_rng(seed)
+    bits = rng.random((6, linhas, colunas)) < 0.2
+    estados = (bits * (1 << np.arange(6))[:, None, None]).sum(axis=0)
+    fontes = np.zeros((linhas, colunas), dtype=bool)
+    fontes[:, 0] = True
+    return estados.astype(np.uint8), fontes
+
+
+def bench_water(profile, repeats, track_memory):
+    from campos_fhp import CamposMacroscopicos
+    from motor_fhp import MOTORES
+
+    steps = profile["steps"]
+    for size in profile["water_sizes"]:
+        for tipo in MOTORES:
+            seed = case_seed("water", size)
+
+            def setup():
+                motor = MOTORES[tipo](size, size)
+                motor.estados, motor.fontes = _water_state(size, size, seed)
+                motor.atualizar_mascaras()
+                return motor, CamposMacroscopicos(size, size)
+
+            def run(state):
+                # Os mesmos passos de `Simulacao._atualizar_estado`
+                motor, campos = state
+                for _ in range(steps):
+                    motor.passo()
+                    campos.acumular(motor.estados)
+                return motor
+
+            elapsed, motor, peak = measure(setup, run, repeats, track_memory)
+            yield f"water/{tipo}/{size}", {
+                "size": size,
+                "engine": tipo,
+                "steps": steps,
+            }, peak, {
+                "step_ms": elapsed / steps * 1e3,
+                "steps_per_second": steps / elapsed,
+                "cells_per_second": steps * size * size / elapsed,
+                "particles": int(np.unpackbits(motor.estados).sum()),
+            }
+
+
+def bench_water_render(profile, repeats, track_memory):
+    import riverpygame
+
+    frames = profile["frames"]
+    for campo in (False, True):
+        seed = case_seed("water-render", campo)
+
+        def setup():
+            simulacao = riverpygame.Simulacao()
+            motor = simulacao.motor
+            motor.estados, motor.fontes = _water_state(
+                motor.linhas, motor.colunas, seed
+            )
+            motor.atualizar_mascaras()
+            simulacao.mostrar_campo = campo
+            return simulacao
+
+        def run(simulacao):
+            frame_times = []
+            start = time.perf_counter()
+            simulacao._desenhar()
+            first_frame = time.perf_counter() - start
+            for _ in range(frames):
+                simulacao._atualizar_estado()
+                start = time.perf_counter()
+                simulacao._desenhar()
+                frame_times.append(time.perf_counter() - start)
+            return frame_times, first_frame
+
+        _, (frame_times, first_frame), peak = measure(setup, run, repeats, track_memory)
+        view = "campo" if campo else "particulas"
+        yield f"water-render/{view}/{riverpygame.GRID_WIDTH}", {
+            "size": riverpygame.GRID_WIDTH,
+            "view": view,
+            "frames": frames,
+        }, peak, _frame_metrics(frame_times, first_frame)
+
+
+BENCHMARKS = {
+    "terrain": bench_terrain,
+    "step": bench_step,
+    "render": bench_render,
+    "water": bench_water,
+    "water-render": bench_water_render,
+}
+
+
+def machine_info():
+    import pygame
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pygame": pygame.version.ver,
+        "commit": commit or None,
+    }
+
+
+def primary(group, metrics):
+    name, higher_is_better = PRIMARY_METRICS[group]
+    return name, metrics[name], higher_is_better
+
+
+def format_row(name, result):
+    metric, value, _ = primary(result["group"], result["metrics"])
+    peak = result["peak_memory_mb"]
+    peak_text = f"{peak:9.1f}" if peak is not None else f"{'-':>9}"
+    return f"{name:<42} {metric:>17} {value:>14.4g} {peak_text}"
+
+
+def compare(results, baseline, tolerance):
+    """Imprime a razão contra a referência.
+
+    Devolve `(regressions, missing)`: os casos que regrediram e os que não
+    existem na referência.
+    """
+    regressions = []
+    missing = []
+    print(f"\n{'caso':<42} {'métrica':>17} {'atual/ref':>10} {'memória':>9}")
+    for name, result in results.items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            missing.append(name)
+            print(f"{name:<42} {'-':>17} {'-':>10} {'-':>9} SEM REFERÊNCIA")
+            continue
+        metric, value, higher_is_better = primary(result["group"], result["metrics"])
+        ratio = value / reference["metrics"][metric]
+        slower = ratio < 1 - tolerance if higher_is_better else ratio > 1 + tolerance
+        memory_ratio = None
+        if result["peak_memory_mb"] and reference.get("peak_memory_mb"):
+            memory_ratio = result["peak_memory_mb"] / reference["peak_memory_mb"]
+        more_memory = memory_ratio is not None and memory_ratio > 1 + tolerance
+        notes = []
+        if slower:
+            notes.append("REGRESSÃO")
+        if more_memory:
+            notes.append("MEMÓRIA")
+        burned = result["metrics"].get("burned")
+        if burned is not None and burned != reference["metrics"].get("burned"):
+            notes.append("resultado mudou")
+        if slower or more_memory:
+            regressions.append(name)
+        memory_text = f"{memory_ratio:>8.2f}x" if memory_ratio else f"{'-':>9}"
+        print(f"{name:<42} {metric:>17} {ratio:>9.2f}x {memory_text} {' '.join(notes)}")
+    return regressions, missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument("--only", nargs="+", choices=GROUPS, default=list(GROUPS))
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true")
+    parser.add_argument("--output", help="grava os resultados em JSON")
+    parser.add_argument("--compare", help="JSON de referência")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    profile = PROFILES[args.profile]
+    results = {}
+    print(f"{'caso':<42} {'métrica':>17} {'valor':>14} {'pico MB':>9}")
+    for group in args.only:
+        for name, params, peak, metrics in BENCHMARKS[group](
+            profile, args.repeats, not args.no_memory
+        ):
+            results[name] = {
+                "group": group,
+                "params": params,
+                "metrics": metrics,
+                "peak_memory_mb": peak / 2**20 if peak is not None else None,
+            }
+            print(format_row(name, results[name]), flush=True)
+
+    if args.output:
+        report = {
+            "profile": args.profile,
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "base_seed": BASE_SEED,
+            "repeats": args.repeats,
+            "machine": machine_info(),
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResultados salvos em {args.output}.")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions, missing = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(
+                f"\n{len(regressions)} caso(s) acima da tolerância de "
+                f"{args.tolerance:.0%}."
+            )
+        if missing:
+            print(
+                f"\n{len(missing)} caso(s) sem referência em {args.compare}; "
+                "gere a referência de novo com --output."
+            )
+        if regressions or missing:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Autômato celular de propagação de incêndios florestais.
+
+O pacote não importa o pygame: terreno, regras, motores e execução em lote
+podem ser usados em testes, benchmarks e processos trabalhadores sem
+display. A interface gráfica fica em `fire_automata.viewer`.
+"""
+
+from .brush import BrushEditor, brush_mask
+from .camera import Camera
+from .config import ARTICLE, CONFIGS, ISOMETRIC_3D, FireConfig
+from .counter_rng import CounterRNG
+from .engine import (
+    ENGINES,
+    BatchedEngine,
+    DenseEngine,
+    EventEngine,
+    FrontierEngine,
+    KernelEngine,
+    make_engine,
+    run_step_vectorized,
+)
+from .grid import FireGrid
+from .history import HistoryRecorder, Snapshot, load_snapshot, save_snapshot
+from .lod import StatusPyramid
+from .parallel import ParallelEngine
+from .rules import (
+    BURNED,
+    BURNING,
+    CELL_ELEVATION_LAYER,
+    CELL_MOISTURE_LAYER,
+    CELL_STATUS_LAYER,
+    EMPTY,
+    TREE,
+    ignition_table,
+    neighborhood_offsets,
+    run_step_loop,
+    start_fire,
+)
+from .simulation import FireSimulation
+from .stats import FireStats, open_stats_writer
+from .terrain import TERRAIN_MODES, fractal_field, initialize_grid
+from .tiled import TiledEngine, TiledGrid
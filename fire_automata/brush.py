@@ -0,0 +1,203 @@
+"""Pincéis de edição da grade: fogo, elevação e umidade.
+
+Cada aplicação recorta a máscara do pincel contra as bordas da grade e altera
+a região com operações em fatias do NumPy. As pinceladas (do botão
+pressionado até ser solto) podem ser desfeitas, e cada edição devolve a região
+alterada, para que o renderizador redesenhe só ela.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from .rules import BURNING, CELL_STATUS_LAYER, TREE
+
+BRUSH_SHAPES = ("square", "circle")
+BRUSH_FALLOFFS = ("constant", "linear", "smooth")
+DEFAULT_UNDO_STROKES = 32
+
+
+@lru_cache(maxsize=None)
+def brush_mask(radius, shape="square", falloff="constant"):
+    """Pesos `(2r + 1, 2r + 1)` em [0, 1]; fora da forma o peso é 0.
+
+    `falloff` define como o peso cai do centro para a borda: `"constant"`
+    (1 em toda a forma), `"linear"` ou `"smooth"` (curva em S).
+    """
+    offsets = np.arange(-radius, radius + 1)
+    dy, dx = np.meshgrid(offsets, offsets, indexing="ij")
+    if shape == "square":
+        distance = np.maximum(np.abs(dy), np.abs(dx)).astype(float)
+    elif shape == "circle":
+        distance = np.hypot(dy, dx)
+    else:
+        raise ValueError(f"forma de pincel desconhecida: {shape!r}")
+    inside = distance <= radius + 0.5
+    # Distância relativa, 0 no centro e < 1 na última célula da forma
+    t = distance / (radius + 1)
+    if falloff == "constant":
+        weights = np.ones_like(t)
+    elif falloff == "linear":
+        weights = 1 - t
+    elif falloff == "smooth":
+        weights = 1 - t * t * (3 - 2 * t)
+    else:
+        raise ValueError(f"perfil de pincel desconhecido: {falloff!r}")
+    weights = np.where(inside, weights, 0.0)
+    weights.setflags(write=False)
+    return weights
+
+
+def clip_brush(grid_x, grid_y, radius, rows, cols):
+    """Fatias `(linhas, colunas)` da grade e da máscara, recortadas nas bordas.
+
+    Retorna `None` se o pincel estiver inteiro fora da grade.
+    """
+    y0, y1 = max(grid_y - radius, 0), min(grid_y + radius + 1, rows)
+    x0, x1 = max(grid_x - radius, 0), min(grid_x + radius + 1, cols)
+    if y0 >= y1 or x0 >= x1:
+        return None
+    top, left = grid_y - radius, grid_x - radius
+    region = (slice(y0, y1), slice(x0, x1))
+    mask = (slice(y0 - top, y1 - top), slice(x0 - left, x1 - left))
+    return region, mask
+
+
+class BrushEditor:
+    """Aplica pincéis sobre a grade de uma `FireSimulation`, com desfazer.
+
+    Os pontos de ignição pintados ficam em `ignition_points`, um conjunto de
+    `(x, y)`. Cada pincelada guarda os valores anteriores das regiões de
+    terreno alteradas e as células incendiadas; `undo` desfaz a última. Com
+    perfil de queda, fogo usa só a área da forma, e elevação e umidade mudam
+    proporcionalmente ao peso.
+    """
+
+    def __init__(
+        self,
+        simulation,
+        radius=0,
+        shape="square",
+        falloff="constant",
+        max_undo=DEFAULT_UNDO_STROKES,
+    ):
+        self.simulation = simulation
+        self.radius = radius
+        self.shape = shape
+        self.falloff = falloff
+        self.max_undo = max_undo
+        self.ignition_points = set()
+        self._strokes = []
+        self._stroke = None
+
+    @property
+    def mask(self):
+        return brush_mask(self.radius, self.shape, self.falloff)
+
+    def cycle_shape(self):
+        index = BRUSH_SHAPES.index(self.shape)
+        self.shape = BRUSH_SHAPES[(index + 1) % len(BRUSH_SHAPES)]
+
+    def cycle_falloff(self):
+        index = BRUSH_FALLOFFS.index(self.falloff)
+        self.falloff = BRUSH_FALLOFFS[(index + 1) % len(BRUSH_FALLOFFS)]
+
+    def clear(self):
+        """Esquece os pontos de ignição e o histórico (nova grade)."""
+        self.ignition_points.clear()
+        self._strokes.clear()
+        self._stroke = None
+
+    def begin_stroke(self):
+        if self._stroke is None:
+            self._stroke = {"terrain": [], "ignited": []}
+
+    def end_stroke(self):
+        stroke, self._stroke = self._stroke, None
+        if stroke is not None and (stroke["terrain"] or stroke["ignited"]):
+            self._strokes.append(stroke)
+            del self._strokes[: -self.max_undo]
+
+    def _window(self, grid_x, grid_y):
+        rows, cols = self.simulation.grid.shape[:2]
+        return clip_brush(grid_x, grid_y, self.radius, rows, cols)
+
+    def ignite_points(self, points):
+        """Incendeia os pontos `(x, y)` de um cenário salvo e os guarda todos.
+
+        Retorna `(xs, ys)` das células que pegaram fogo.
+        """
+        points = list(points)
+        self.ignition_points.update(points)
+        if not points:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        xs, ys = np.array(points).T
+        return self._ignite(xs, ys)
+
+    def _ignite(self, xs, ys):
+        xs, ys = self.simulation.start_fires(xs, ys)
+        self.ignition_points.update(zip(xs.tolist(), ys.tolist()))
+        if self._stroke is not None:
+            self._stroke["ignited"].append((xs, ys))
+        return xs, ys
+
+    def paint_fire(self, grid_x, grid_y):
+        """Incendeia as ÁRVORES sob o pincel; devolve a região alterada."""
+        window = self._window(grid_x, grid_y)
+        if window is None:
+            return None
+        region, mask = window
+        status = self.simulation.grid[:, :, CELL_STATUS_LAYER][region]
+        ys, xs = np.nonzero((self.mask[mask] > 0) & (status == TREE))
+        self.begin_stroke()
+        self._ignite(xs + region[1].start, ys + region[0].start)
+        return region
+
+    def paint_layer(self, layer, grid_x, grid_y, amount, low, high):
+        """Soma `amount * peso` à camada `layer` sob o pincel, limitado a [low, high].
+
+        Avisa a simulação (`terrain_changed`), para motores que pré-calculam o
+        terreno, e devolve a região alterada.
+        """
+        window = self._window(grid_x, grid_y)
+        if window is None:
+            return None
+        region, mask = window
+        values = self.simulation.grid[:, :, layer][region]
+        self.begin_stroke()
+        self._stroke["terrain"].append((layer, region, values.copy()))
+        np.clip(
+            values + amount * self.mask[mask], low, high, out=values, casting="unsafe"
+        )
+        self.simulation.terrain_changed(region)
+        return region
+
+    def undo(self):
+        """Desfaz a última pincelada; devolve as regiões alteradas."""
+        self.end_stroke()
+        if not self._strokes:
+            return []
+        stroke = self._strokes.pop()
+        grid = self.simulation.grid
+        regions = []
+        for layer, region, previous in reversed(stroke["terrain"]):
+            grid[:, :, layer][region] = previous
+            self.simulation.terrain_changed(region)
+            regions.append(region)
+        status = grid[:, :, CELL_STATUS_LAYER]
+        for xs, ys in stroke["ignited"]:
+            # Só volta a ÁRVORE o que ainda não se espalhou nem queimou
+            still = status[ys, xs] == BURNING
+            status[ys[still], xs[still]] = TREE
+            self.ignition_points.difference_update(zip(xs.tolist(), ys.tolist()))
+            if xs.size:
+                regions.append(
+                    (
+                        slice(int(ys.min()), int(ys.max()) + 1),
+                        slice(int(xs.min()), int(xs.max()) + 1),
+                    )
+                )
+        if stroke["ignited"]:
+            # O motor e as estatísticas voltam a ler a grade inteira
+            self.simulation.reset(grid, self.simulation.step_count)
+        return regions
@@ -0,0 +1,44 @@
+"""Câmera com deslocamento e zoom para os renderizadores.
+
+Os renderizadores posicionam as células em coordenadas de "mundo", os pixels
+que usariam sem câmera; a câmera leva o mundo para a tela com
+`tela = mundo * zoom + pan`.
+"""
+
+MIN_ZOOM = 1 / 256
+MAX_ZOOM = 16.0
+
+
+class Camera:
+    def __init__(self, zoom=1.0, pan=(0.0, 0.0), min_zoom=MIN_ZOOM, max_zoom=MAX_ZOOM):
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+        self.zoom = zoom
+        self.pan_x, self.pan_y = pan
+
+    @property
+    def state(self):
+        """`(zoom, pan_x, pan_y)`, para detectar mudanças de câmera."""
+        return self.zoom, self.pan_x, self.pan_y
+
+    def reset(self):
+        self.zoom = 1.0
+        self.pan_x = self.pan_y = 0.0
+
+    def to_screen(self, world_x, world_y):
+        return world_x * self.zoom + self.pan_x, world_y * self.zoom + self.pan_y
+
+    def to_world(self, screen_x, screen_y):
+        return (screen_x - self.pan_x) / self.zoom, (screen_y - self.pan_y) / self.zoom
+
+    def move(self, dx, dy):
+        """Desloca a vista em pixels de tela."""
+        self.pan_x += dx
+        self.pan_y += dy
+
+    def zoom_at(self, factor, screen_x, screen_y):
+        """Multiplica o zoom mantendo fixo o ponto sob `(screen_x, screen_y)`."""
+        world_x, world_y = self.to_world(screen_x, screen_y)
+        self.zoom = min(max(self.zoom * factor, self.min_zoom), self.max_zoom)
+        self.pan_x = screen_x - world_x * self.zoom
+        self.pan_y = screen_y - world_y * self.zoom
@@ -0,0 +1,128 @@
+"""Configurações das duas variantes do simulador sobre o mesmo motor."""
+
+from dataclasses import dataclass, replace
+
+from .rules import (
+    DOWNHILL_MULTIPLIER,
+    IGNITION_PROB,
+    NEIGHBORHOODS,
+    SLOPE_COEFFICIENT,
+    SPOTTING_DECAY,
+    UPHILL_MULTIPLIER,
+)
+from .terrain import TREE_DENSITY, initialize_grid
+
+
+@dataclass(frozen=True)
+class FireConfig:
+    """Parâmetros de uma variante: janela, grade, terreno e regras."""
+
+    title: str
+    screen_size: tuple
+    cell_size: int
+    grid_cols: int
+    grid_rows: int
+    view: str  # "isometric" ou "raster"
+    fps: int = 60
+    sim_steps_per_second: int = 60
+    tree_density: float = TREE_DENSITY
+    ignition_prob: float = IGNITION_PROB
+    uphill_multiplier: float = UPHILL_MULTIPLIER
+    downhill_multiplier: float = DOWNHILL_MULTIPLIER
+    # Elevação máxima do terreno sorteado e limite dos pincéis
+    initial_max_elevation: float = 25.0
+    max_elevation: float = 100.0
+    integer_elevation: bool = False
+    terrain_mode: str = "legacy"  # "legacy", "fast" ou "fractal"
+    step_engine: str = "frontier"  # "dense", "frontier", "kernel" ou "event"
+    # Só para o motor "kernel": vizinhança, vento (vx, vy) em m/s e declive
+    neighborhood: str = "moore"
+    kernel_radius: int = 1
+    wind: tuple = (0.0, 0.0)
+    slope_coefficient: float = SLOPE_COEFFICIENT
+    spotting_decay: float = SPOTTING_DECAY
+
+    @property
+    def rules(self):
+        """Parâmetros de regra no formato aceito pelos motores."""
+        return {
+            "ignition_prob": self.ignition_prob,
+            "uphill_multiplier": self.uphill_multiplier,
+            "downhill_multiplier": self.downhill_multiplier,
+        }
+
+    def engine_rules(self, engine=None):
+        """`rules` mais os parâmetros próprios do motor (padrão: `step_engine`)."""
+        rules = self.rules
+        if (engine or self.step_engine) == "kernel":
+            rules.update(
+                neighborhood=self.neighborhood,
+                radius=self.kernel_radius,
+                wind=self.wind,
+                slope_coefficient=self.slope_coefficient,
+                spotting_decay=self.spotting_decay,
+            )
+        return rules
+
+    def initialize_grid(self, seed=None, cols=None, rows=None):
+        return initialize_grid(
+            cols if cols is not None else self.grid_cols,
+            rows if rows is not None else self.grid_rows,
+            self.tree_density,
+            seed,
+            max_elevation=self.initial_max_elevation,
+            integer_elevation=self.integer_elevation,
+            mode=self.terrain_mode,
+        )
+
+
+ISOMETRIC_3D = FireConfig(
+    title="Simulador de Fogo Florestal 3D",
+    screen_size=(1200, 700),
+    cell_size=12,
+    grid_cols=50,
+    grid_rows=50,
+    view="isometric",
+    ignition_prob=0.7,
+)
+
+ARTICLE = FireConfig(
+    title="Simulador de Fogo Florestal com Elevação e Umidade",
+    screen_size=(900, 500),
+    cell_size=8,
+    grid_cols=900 // 8,
+    grid_rows=500 // 8,
+    view="raster",
+    ignition_prob=0.72,
+    initial_max_elevation=100,
+    max_elevation=100,
+    integer_elevation=True,
+)
+
+CONFIGS = {"3d": ISOMETRIC_3D, "article": ARTICLE}
+
+
+def add_kernel_arguments(parser):
+    """Opções de linha de comando do motor "kernel" (`--engine kernel`)."""
+    parser.add_argument("--neighborhood", choices=NEIGHBORHOODS, default=None)
+    parser.add_argument("--radius", type=int, default=None)
+    parser.add_argument(
+        "--wind",
+        type=float,
+        nargs=2,
+        metavar=("VX", "VY"),
+        default=None,
+        help="vento em m/s, no sentido das colunas e das linhas",
+    )
+
+
+def with_kernel_arguments(config, args):
+    """Aplica ao `config` as opções de `add_kernel_arguments` que foram dadas."""
+    overrides = {
+        "neighborhood": args.neighborhood,
+        "kernel_radius": args.radius,
+        "wind": tuple(args.wind) if args.wind is not None else None,
+    }
+    return replace(
+        config, **{key: value for key, value in overrides.items() if value is not None}
+    )
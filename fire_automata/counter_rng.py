@@ -0,0 +1,80 @@
+"""Gerador por contador: cada sorteio depende da chave, não da ordem de sorteio.
+
+O valor sorteado para um par (árvore, vizinho queimando) é um hash de
+`(seed, passo, linha, coluna, direção)`, feito com rodadas do finalizador do
+SplitMix64 sobre arrays `uint64`. Ele não depende de quantos sorteios vieram
+antes, da ordem em que as células são visitadas nem de como a grade foi
+dividida em faixas, blocos ou processos. Com o mesmo `CounterRNG`, os motores
+denso, de frente de fogo, em lote, em faixas (`ParallelEngine`) e em blocos
+(`TiledEngine`) queimam exatamente as mesmas células.
+"""
+
+import numpy as np
+
+GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+MIX_1 = 0xBF58476D1CE4E5B9
+MIX_2 = 0x94D049BB133111EB
+MASK_64 = (1 << 64) - 1
+
+
+def _mix(z):
+    """Finalizador do SplitMix64 sobre um array `uint64` (a multiplicação dá a volta)."""
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(MIX_1)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(MIX_2)
+    return z ^ (z >> np.uint64(31))
+
+
+def _mix_int(z):
+    """O mesmo finalizador para um inteiro do Python."""
+    z = ((z ^ (z >> 30)) * MIX_1) & MASK_64
+    z = ((z ^ (z >> 27)) * MIX_2) & MASK_64
+    return z ^ (z >> 31)
+
+
+class CounterRNG:
+    """Fluxo aleatório sem estado, endereçado por `(passo, linha, coluna, direção)`.
+
+    `seed` pode ser um inteiro, `None` (entropia do sistema) ou uma
+    `numpy.random.SeedSequence`, como as geradas por `spawn` para réplicas.
+    Linha e coluna são as coordenadas na grade inteira, e a direção é o índice
+    do deslocamento da árvore até o vizinho queimando.
+    """
+
+    def __init__(self, seed=None):
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        self.key = int(seed.generate_state(1, dtype=np.uint64)[0])
+
+    @classmethod
+    def from_key(cls, key):
+        rng = cls.__new__(cls)
+        rng.key = int(key)
+        return rng
+
+    @property
+    def state(self):
+        """Estado serializável, no formato dos `bit_generator.state` do NumPy."""
+        return {"bit_generator": type(self).__name__, "key": self.key}
+
+    def uniform(self, step, ys, xs, directions=0):
+        """Um valor em [0, 1) por célula `(ys, xs)`, com 53 bits como `random()`."""
+        step_key = _mix_int((self.key + (step + 1) * GOLDEN_GAMMA) & MASK_64)
+        ys = np.asarray(ys).astype(np.uint64)
+        xs = np.asarray(xs).astype(np.uint64)
+        directions = np.asarray(directions).astype(np.uint64)
+        # Estouro em uint64 é a aritmética módulo 2^64 desejada
+        with np.errstate(over="ignore"):
+            h = _mix(((ys << np.uint64(32)) | xs) ^ np.uint64(step_key))
+            h = _mix(h + (directions + np.uint64(1)) * np.uint64(GOLDEN_GAMMA))
+        return (h >> np.uint64(11)) * (1.0 / (1 << 53))
+
+
+def uniform_draws(rng, step, ys, xs, directions=0):
+    """Sorteios em [0, 1) para os pares das células `(ys, xs)`.
+
+    Com um `CounterRNG`, cada valor sai da chave `(step, y, x, direção)`; com
+    um `numpy.random.Generator`, são os próximos `len(ys)` valores do gerador.
+    """
+    if isinstance(rng, CounterRNG):
+        return rng.uniform(step, ys, xs, directions)
+    return rng.random(len(ys))
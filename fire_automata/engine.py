@@ -0,0 +1,681 @@
+"""Motores de passo do autômato celular de incêndio florestal."""
+
+import heapq
+import math
+
+import numpy as np
+
+from .counter_rng import CounterRNG, uniform_draws
+from .rules import (
+    BURNED,
+    BURNING,
+    CELL_ELEVATION_LAYER,
+    CELL_MOISTURE_LAYER,
+    CELL_STATUS_LAYER,
+    DOWNHILL_MULTIPLIER,
+    IGNITION_PROB,
+    SLOPE_COEFFICIENT,
+    SPOTTING_DECAY,
+    TREE,
+    UPHILL_MULTIPLIER,
+    VON_NEUMANN_OFFSETS,
+    ignition_probability,
+    ignition_table,
+    neighborhood_offsets,
+    shift_into,
+)
+
+
+def run_step_vectorized(
+    grid,
+    ignition_prob=IGNITION_PROB,
+    uphill_multiplier=UPHILL_MULTIPLIER,
+    downhill_multiplier=DOWNHILL_MULTIPLIER,
+    rng=None,
+):
+    """Passo sobre a grade inteira com máscaras deslocadas.
+
+    Cada par (árvore, vizinho queimando) é um sorteio independente, como no
+    laço original, então a chance de ignição de uma árvore é
+    `1 - prod(1 - p_k)` sobre seus vizinhos queimando. Os sorteios são feitos
+    apenas para as células candidatas.
+    """
+    engine = DenseEngine(
+        grid, ignition_prob, uphill_multiplier, downhill_multiplier, rng
+    )
+    return engine.step(grid)
+
+
+class DenseEngine:
+    """Motor que recalcula a grade inteira a cada passo.
+
+    As máscaras intermediárias são alocadas uma vez em `reset`, e `step_into`
+    escreve o próximo estado em uma grade já existente. Depois de cada passo,
+    `changes` guarda as coordenadas `((ys, xs) queimadas, (ys, xs) que pegaram
+    fogo)`, usadas pelas estatísticas incrementais.
+
+    `rng` pode ser um `numpy.random.Generator` ou um `CounterRNG`; com este,
+    cada sorteio é endereçado por `(step_count, y, x, direção)`, em que `y` e
+    `x` somam `origin` (o canto da janela na grade inteira, quando o motor
+    avança só um pedaço dela) e a direção é o índice em `VON_NEUMANN_OFFSETS`
+    do deslocamento da árvore até o vizinho queimando.
+    """
+
+    in_place = False
+
+    def __init__(
+        self,
+        grid,
+        ignition_prob=IGNITION_PROB,
+        uphill_multiplier=UPHILL_MULTIPLIER,
+        downhill_multiplier=DOWNHILL_MULTIPLIER,
+        rng=None,
+    ):
+        self.ignition_prob = ignition_prob
+        self.uphill_multiplier = uphill_multiplier
+        self.downhill_multiplier = downhill_multiplier
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.origin = (0, 0)
+        self.reset(grid)
+
+    def reset(self, grid, step=0):
+        """Sincroniza o motor com uma grade nova ou recarregada, no passo `step`."""
+        self.step_count = step
+        shape = grid.shape[:2]
+        self._burning = np.empty(shape, dtype=bool)
+        self._tree = np.empty(shape, dtype=bool)
+        self._ignited = np.empty(shape, dtype=bool)
+        self._candidates = np.empty(shape, dtype=bool)
+        self.changes = None
+
+    def add_ignition(self, grid_x, grid_y):
+        """Avisa o motor de células incendiadas fora de `step` (escalares ou arrays)."""
+
+    def terrain_changed(self, grid, region):
+        """Avisa o motor de elevação ou umidade editadas na região `(linhas, colunas)`."""
+
+    def burning_cells(self, grid):
+        """Coordenadas `(ys, xs)` das células QUEIMANDO em `grid`."""
+        return np.nonzero(grid[:, :, CELL_STATUS_LAYER] == BURNING)
+
+    def step(self, grid):
+        next_grid = grid.copy()
+        self.step_into(grid, next_grid)
+        return next_grid
+
+    def step_into(self, grid, out):
+        """Escreve em `out` o estado do passo seguinte ao de `grid`."""
+        status = grid[:, :, CELL_STATUS_LAYER]
+        elevation = grid[:, :, CELL_ELEVATION_LAYER]
+        moisture = grid[:, :, CELL_MOISTURE_LAYER]
+
+        burning = np.equal(status, BURNING, out=self._burning)
+        tree = np.equal(status, TREE, out=self._tree)
+        ignited = self._ignited
+        ignited[...] = False
+        ignited_y, ignited_x = [], []
+
+        origin_y, origin_x = self.origin
+        for direction, (dy, dx) in enumerate(VON_NEUMANN_OFFSETS):
+            candidates = shift_into(self._candidates, burning, dy, dx, False)
+            candidates &= tree
+            ys, xs = np.nonzero(candidates)
+            if ys.size == 0:
+                continue
+            prob = ignition_probability(
+                moisture[ys, xs],
+                elevation[ys, xs],
+                elevation[ys + dy, xs + dx],
+                self.ignition_prob,
+                self.uphill_multiplier,
+                self.downhill_multiplier,
+            )
+            draws = uniform_draws(
+                self.rng, self.step_count, ys + origin_y, xs + origin_x, direction
+            )
+            hits = draws < prob
+            ignited[ys[hits], xs[hits]] = True
+            # Uma árvore que já pegou fogo não sorteia de novo
+            tree[ys[hits], xs[hits]] = False
+            ignited_y.append(ys[hits])
+            ignited_x.append(xs[hits])
+
+        out_status = out[:, :, CELL_STATUS_LAYER]
+        out_status[...] = status
+        np.copyto(out_status, BURNED, where=burning)
+        np.copyto(out_status, BURNING, where=ignited)
+        self.changes = (
+            np.nonzero(burning),
+            (
+                np.concatenate(ignited_y or [np.empty(0, dtype=np.intp)]),
+                np.concatenate(ignited_x or [np.empty(0, dtype=np.intp)]),
+            ),
+        )
+        self.step_count += 1
+        return out
+
+
+class FrontierEngine(DenseEngine):
+    """Motor que visita apenas as células QUEIMANDO e seus vizinhos ÁRVORE.
+
+    O custo de um passo é proporcional ao tamanho da frente de fogo, e não à
+    área da grade. A grade é atualizada no lugar.
+    """
+
+    in_place = True
+
+    def reset(self, grid, step=0):
+        self.step_count = step
+        self.front_y, self.front_x = np.nonzero(
+            grid[:, :, CELL_STATUS_LAYER] == BURNING
+        )
+        self.changes = None
+
+    def add_ignition(self, grid_x, grid_y):
+        self.front_y = np.append(self.front_y, grid_y)
+        self.front_x = np.append(self.front_x, grid_x)
+
+    def burning_cells(self, grid):
+        return self.front_y, self.front_x
+
+    def step(self, grid):
+        status = grid[:, :, CELL_STATUS_LAYER]
+        elevation = grid[:, :, CELL_ELEVATION_LAYER]
+        moisture = grid[:, :, CELL_MOISTURE_LAYER]
+        rows, cols = status.shape
+
+        # Descarta entradas repetidas ou que já não estão queimando
+        front = np.unique(self.front_y * cols + self.front_x)
+        fy, fx = np.divmod(front, cols)
+        keep = status[fy, fx] == BURNING
+        fy, fx = fy[keep], fx[keep]
+
+        origin_y, origin_x = self.origin
+        new_y, new_x = [], []
+        for dy, dx in VON_NEUMANN_OFFSETS:
+            # Direção da árvore até o fogo, a mesma chave usada pelo DenseEngine
+            direction = VON_NEUMANN_OFFSETS.index((-dy, -dx))
+            ny, nx = fy + dy, fx + dx
+            inside = (ny >= 0) & (ny < rows) & (nx >= 0) & (nx < cols)
+            ny, nx, sy, sx = ny[inside], nx[inside], fy[inside], fx[inside]
+            is_tree = status[ny, nx] == TREE
+            ny, nx, sy, sx = ny[is_tree], nx[is_tree], sy[is_tree], sx[is_tree]
+            prob = ignition_probability(
+                moisture[ny, nx],
+                elevation[ny, nx],
+                elevation[sy, sx],
+                self.ignition_prob,
+                self.uphill_multiplier,
+                self.downhill_multiplier,
+            )
+            draws = uniform_draws(
+                self.rng, self.step_count, ny + origin_y, nx + origin_x, direction
+            )
+            hits = draws < prob
+            new_y.append(ny[hits])
+            new_x.append(nx[hits])
+
+        ignited = np.unique(np.concatenate(new_y) * cols + np.concatenate(new_x))
+        status[fy, fx] = BURNED
+        self.front_y, self.front_x = np.divmod(ignited, cols)
+        status[self.front_y, self.front_x] = BURNING
+        self.changes = ((fy, fx), (self.front_y, self.front_x))
+        self.step_count += 1
+        return grid
+
+
+def _same_array(a, b):
+    return (
+        a.shape == b.shape
+        and a.strides == b.strides
+        and a.__array_interface__["data"][0] == b.__array_interface__["data"][0]
+    )
+
+
+class KernelEngine(FrontierEngine):
+    """Motor de frente de fogo com vizinhança configurável, vento e declive contínuo.
+
+    A vizinhança é a de `neighborhood_offsets(neighborhood, radius)`: Moore
+    por padrão, ou um raio maior para focos secundários. Toda a física (umidade,
+    inclinação, vento e distância) fica em uma tabela `(direções, rows, cols)`
+    de `ignition_table`, calculada em `reset` só quando o terreno é outro e
+    refeita por região em `terrain_changed`. Um passo é só consultas à tabela
+    e um sorteio por par (árvore, vizinho queimando).
+
+    `uphill_multiplier` e `downhill_multiplier` são aceitos para manter a
+    interface dos outros motores, mas o declive vem de `slope_coefficient`.
+    """
+
+    def __init__(
+        self,
+        grid,
+        ignition_prob=IGNITION_PROB,
+        uphill_multiplier=UPHILL_MULTIPLIER,
+        downhill_multiplier=DOWNHILL_MULTIPLIER,
+        rng=None,
+        neighborhood="moore",
+        radius=1,
+        wind=(0.0, 0.0),
+        slope_coefficient=SLOPE_COEFFICIENT,
+        spotting_decay=SPOTTING_DECAY,
+    ):
+        self.offsets = np.array(neighborhood_offsets(neighborhood, radius))
+        self.radius = radius
+        self.wind = tuple(wind)
+        self.slope_coefficient = slope_coefficient
+        self.spotting_decay = spotting_decay
+        self.table = None
+        self._terrain = None
+        super().__init__(
+            grid, ignition_prob, uphill_multiplier, downhill_multiplier, rng
+        )
+
+    def reset(self, grid, step=0):
+        super().reset(grid, step)
+        terrain = (grid[:, :, CELL_ELEVATION_LAYER], grid[:, :, CELL_MOISTURE_LAYER])
+        # Guardar as camadas impede que outra grade reaproveite a mesma memória
+        if self._terrain is None or not all(map(_same_array, terrain, self._terrain)):
+            self._terrain = terrain
+            self.table = self._table(grid)
+
+    def _table(self, grid, region=None):
+        return ignition_table(
+            grid[:, :, CELL_ELEVATION_LAYER],
+            grid[:, :, CELL_MOISTURE_LAYER],
+            [tuple(offset) for offset in self.offsets.tolist()],
+            self.ignition_prob,
+            self.wind,
+            self.slope_coefficient,
+            self.spotting_decay,
+            region,
+        )
+
+    def terrain_changed(self, grid, region):
+        # Células até `radius` fora da região têm vizinhos dentro dela
+        rows, cols = grid.shape[:2]
+        y0, y1, _ = region[0].indices(rows)
+        x0, x1, _ = region[1].indices(cols)
+        grown = (
+            slice(max(y0 - self.radius, 0), min(y1 + self.radius, rows)),
+            slice(max(x0 - self.radius, 0), min(x1 + self.radius, cols)),
+        )
+        self.table[:, grown[0], grown[1]] = self._table(grid, grown)
+
+    def step(self, grid):
+        status = grid[:, :, CELL_STATUS_LAYER]
+        rows, cols = status.shape
+
+        front = np.unique(self.front_y * cols + self.front_x)
+        fy, fx = np.divmod(front, cols)
+        keep = status[fy, fx] == BURNING
+        fy, fx = fy[keep], fx[keep]
+
+        # Todos os pares (direção, célula queimando) de uma vez; a árvore fica
+        # em `fonte - (dy, dx)`
+        direction = np.repeat(np.arange(len(self.offsets)), fy.size)
+        ty = (fy[np.newaxis] - self.offsets[:, :1]).ravel()
+        tx = (fx[np.newaxis] - self.offsets[:, 1:]).ravel()
+        inside = (ty >= 0) & (ty < rows) & (tx >= 0) & (tx < cols)
+        direction, ty, tx = direction[inside], ty[inside], tx[inside]
+        is_tree = status[ty, tx] == TREE
+        direction, ty, tx = direction[is_tree], ty[is_tree], tx[is_tree]
+        origin_y, origin_x = self.origin
+        draws = uniform_draws(
+            self.rng, self.step_count, ty + origin_y, tx + origin_x, direction
+        )
+        hits = draws < self.table[direction, ty, tx]
+
+        ignited = np.unique(ty[hits] * cols + tx[hits])
+        status[fy, fx] = BURNED
+        self.front_y, self.front_x = np.divmod(ignited, cols)
+        status[self.front_y, self.front_x] = BURNING
+        self.changes = ((fy, fx), (self.front_y, self.front_x))
+        self.step_count += 1
+        return grid
+
+
+# Limite de `p` no motor de eventos: com `p = 1` a taxa seria infinita e a
+# ignição, instantânea
+MAX_EVENT_PROBABILITY = 1 - 1e-6
+# Sorteios exponenciais gerados de uma vez pelo `numpy.random.Generator`
+EXPONENTIAL_BUFFER = 4096
+# Tipos de evento; no mesmo instante, a extinção vem antes da ignição
+_BURN_OUT = 0
+_IGNITE = 1
+
+
+class EventEngine(DenseEngine):
+    """Motor de eventos em tempo contínuo, no estilo de Gillespie.
+
+    Cada par (árvore, vizinho queimando) tem a taxa `-log(1 - p)`, com `p` de
+    `ignition_probability` e os mesmos parâmetros dos outros motores. Uma
+    célula acesa no instante `t` se apaga em `t + burn_time` e sorteia, para
+    cada vizinho ÁRVORE, um atraso exponencial com essa taxa; se o atraso
+    cair antes do fim da queima, a ignição do vizinho entra numa fila de
+    prioridade. Com `burn_time=1`, a chance de o vizinho pegar fogo é `p`,
+    como em um passo dos motores síncronos. O custo é proporcional ao número
+    de eventos, e não à área da grade nem ao número de passos.
+
+    `step` processa os eventos do intervalo `(t, t + 1]` e preenche `changes`,
+    então o motor também serve ao `FireSimulation`, ao visualizador e às
+    estatísticas; `run` pula direto de um evento para o próximo até a
+    extinção. `arrival` guarda o instante contínuo em que cada célula pegou
+    fogo (NaN se nunca queimou).
+
+    `reset` reconstrói a fila a partir da grade: as células QUEIMANDO contam
+    como acesas no instante `step`. Terreno editado com `terrain_changed` vale
+    para os atrasos sorteados depois da edição. Com um `CounterRNG`, o atraso
+    de cada par vem da chave `(0, y, x, direção)` da árvore, que é sorteada uma
+    única vez por execução.
+    """
+
+    in_place = True
+
+    def __init__(
+        self,
+        grid,
+        ignition_prob=IGNITION_PROB,
+        uphill_multiplier=UPHILL_MULTIPLIER,
+        downhill_multiplier=DOWNHILL_MULTIPLIER,
+        rng=None,
+        burn_time=1.0,
+    ):
+        self.burn_time = burn_time
+        self.rates = None
+        self._terrain = None
+        super().__init__(
+            grid, ignition_prob, uphill_multiplier, downhill_multiplier, rng
+        )
+
+    @property
+    def rng(self):
+        return self._rng
+
+    @rng.setter
+    def rng(self, rng):
+        # Um gerador novo (ex.: ao restaurar um snapshot) descarta os sorteios
+        # já gerados pelo anterior
+        self._rng = rng
+        self._exponentials = []
+
+    def reset(self, grid, step=0):
+        self.step_count = step
+        self.time = float(step)
+        self.event_count = 0
+        terrain = (grid[:, :, CELL_ELEVATION_LAYER], grid[:, :, CELL_MOISTURE_LAYER])
+        if self._terrain is None or not all(map(_same_array, terrain, self._terrain)):
+            self._terrain = terrain
+            self.rates = self._rates(*terrain)
+        self.arrival = np.full(grid.shape[:2], np.nan)
+        self._queue = []
+        self._scheduled = {}
+        self._burning = set()
+        self._pending = []
+        self.changes = None
+
+        status = grid[:, :, CELL_STATUS_LAYER]
+        ys, xs = np.nonzero(status == BURNING)
+        for y, x in zip(ys.tolist(), xs.tolist()):
+            self._ignite(status, self.time, y, x)
+
+    def _rates(self, elevation, moisture):
+        """Taxas `(direções, rows, cols)` de ignição de cada árvore por cada vizinho."""
+        rates = np.zeros((len(VON_NEUMANN_OFFSETS),) + elevation.shape)
+        fire = np.empty(elevation.shape)
+        for direction, (dy, dx) in enumerate(VON_NEUMANN_OFFSETS):
+            shift_into(fire, elevation, dy, dx, np.nan)
+            prob = ignition_probability(
+                moisture,
+                elevation,
+                fire,
+                self.ignition_prob,
+                self.uphill_multiplier,
+                self.downhill_multiplier,
+            )
+            prob = np.minimum(prob, MAX_EVENT_PROBABILITY)
+            # Fora da grade não há vizinho
+            rates[direction] = np.where(np.isnan(fire), 0.0, -np.log1p(-prob))
+        return rates
+
+    def terrain_changed(self, grid, region):
+        # Mudam as árvores da região e as vizinhas dela; as taxas destas
+        # dependem de mais uma célula para fora
+        rows, cols = grid.shape[:2]
+        y0, y1, _ = region[0].indices(rows)
+        x0, x1, _ = region[1].indices(cols)
+        wy0, wx0 = max(y0 - 2, 0), max(x0 - 2, 0)
+        wy1, wx1 = min(y1 + 2, rows), min(x1 + 2, cols)
+        uy0, ux0 = max(y0 - 1, 0), max(x0 - 1, 0)
+        uy1, ux1 = min(y1 + 1, rows), min(x1 + 1, cols)
+        window = self._rates(
+            grid[wy0:wy1, wx0:wx1, CELL_ELEVATION_LAYER],
+            grid[wy0:wy1, wx0:wx1, CELL_MOISTURE_LAYER],
+        )
+        self.rates[:, uy0:uy1, ux0:ux1] = window[
+            :, uy0 - wy0 : uy1 - wy0, ux0 - wx0 : ux1 - wx0
+        ]
+
+    def add_ignition(self, grid_x, grid_y):
+        # Acesas no instante atual, no próximo `step` ou `run`
+        self._pending.extend(zip(np.ravel(grid_y).tolist(), np.ravel(grid_x).tolist()))
+
+    def burning_cells(self, grid):
+        cells = np.array(list(self._burning) + self._pending, dtype=np.intp)
+        ys, xs = cells.reshape(-1, 2).T
+        return ys, xs
+
+    def _exponential(self, y, x, direction):
+        """Um sorteio exponencial de taxa 1 para o par da árvore `(y, x)`."""
+        if isinstance(self._rng, CounterRNG):
+            origin_y, origin_x = self.origin
+            draw = self._rng.uniform(0, y + origin_y, x + origin_x, direction)
+            return -math.log1p(-float(draw))
+        if not self._exponentials:
+            self._exponentials = self._rng.standard_exponential(
+                EXPONENTIAL_BUFFER
+            ).tolist()
+        return self._exponentials.pop()
+
+    def _ignite(self, status, time, y, x):
+        """Acende `(y, x)` em `time` e agenda sua extinção e as ignições vizinhas."""
+        status[y, x] = BURNING
+        self.arrival[y, x] = time
+        self._burning.add((y, x))
+        self._scheduled.pop((y, x), None)
+        queue = self._queue
+        heapq.heappush(queue, (time + self.burn_time, _BURN_OUT, y, x))
+        rows, cols = status.shape
+        scheduled = self._scheduled
+        # `item` devolve escalares do Python, bem mais rápidos de indexar aqui
+        for direction, (dy, dx) in enumerate(VON_NEUMANN_OFFSETS):
+            # A árvore fica em `fonte - (dy, dx)`
+            ty, tx = y - dy, x - dx
+            if not (0 <= ty < rows and 0 <= tx < cols) or status.item(ty, tx) != TREE:
+                continue
+            rate = self.rates.item(direction, ty, tx)
+            if rate <= 0:
+                continue
+            delay = self._exponential(ty, tx, direction) / rate
+            if delay >= self.burn_time:
+                continue
+            # Só a ignição mais cedo de cada árvore fica na fila
+            ignition = time + delay
+            if ignition < scheduled.get((ty, tx), math.inf):
+                scheduled[(ty, tx)] = ignition
+                heapq.heappush(queue, (ignition, _IGNITE, ty, tx))
+
+    def _advance(self, grid, until):
+        """Processa os eventos até o instante `until` e preenche `changes`."""
+        status = grid[:, :, CELL_STATUS_LAYER]
+        cols = status.shape[1]
+        for y, x in self._pending:
+            if status.item(y, x) in (TREE, BURNING) and (y, x) not in self._burning:
+                self._ignite(status, self.time, y, x)
+        self._pending = []
+
+        queue = self._queue
+        burned, ignited = [], []
+        while queue and queue[0][0] <= until:
+            time, kind, y, x = heapq.heappop(queue)
+            self.time = time
+            self.event_count += 1
+            if kind == _BURN_OUT:
+                if (y, x) in self._burning:
+                    self._burning.remove((y, x))
+                    status[y, x] = BURNED
+                    burned.append(y * cols + x)
+            # Ignições já ultrapassadas por outra mais cedo são descartadas
+            elif status.item(y, x) == TREE:
+                self._ignite(status, time, y, x)
+                ignited.append(y * cols + x)
+        self.changes = (
+            np.divmod(np.array(burned, dtype=np.intp), cols),
+            np.divmod(np.array(ignited, dtype=np.intp), cols),
+        )
+
+    def step(self, grid):
+        end = self.time + 1
+        self._advance(grid, end)
+        self.time = end
+        self.step_count += 1
+        return grid
+
+    def run(self, grid, until=math.inf):
+        """Processa os eventos até a extinção (ou até `until`) e retorna `arrival`.
+
+        O tempo salta de um evento para o seguinte; `step_count` não muda.
+        """
+        self._advance(grid, until)
+        if self.time < until < math.inf:
+            self.time = until
+        return self.arrival
+
+
+ENGINES = {
+    "dense": DenseEngine,
+    "frontier": FrontierEngine,
+    "kernel": KernelEngine,
+    "event": EventEngine,
+}
+
+
+def make_engine(name, grid, **rules):
+    """Cria o motor de passo `name` ("dense", "frontier", "kernel" ou "event")."""
+    return ENGINES[name](grid, **rules)
+
+
+class BatchedEngine:
+    """K simulações independentes sobre o mesmo terreno, num tensor `(K, rows, cols)`.
+
+    Todas as réplicas avançam em uma única passada vetorizada. Cada réplica
+    tem seu próprio gerador, consumido sempre na mesma ordem (direção, depois
+    célula), então o resultado de uma réplica não depende de quais outras
+    estão no lote. Réplicas cujo fogo se extinguiu saem do tensor ativo. Com
+    geradores `CounterRNG`, cada réplica queima as mesmas células que os
+    motores denso, de frente, em faixas e em blocos com o mesmo gerador.
+    """
+
+    def __init__(
+        self,
+        grid,
+        rngs,
+        ignition_prob=IGNITION_PROB,
+        uphill_multiplier=UPHILL_MULTIPLIER,
+        downhill_multiplier=DOWNHILL_MULTIPLIER,
+        track_arrival=True,
+    ):
+        self.ignition_prob = ignition_prob
+        self.uphill_multiplier = uphill_multiplier
+        self.downhill_multiplier = downhill_multiplier
+        self.rngs = list(rngs)
+        self.elevation = np.asarray(grid[:, :, CELL_ELEVATION_LAYER])
+        self.moisture = np.asarray(grid[:, :, CELL_MOISTURE_LAYER])
+
+        status = np.asarray(grid[:, :, CELL_STATUS_LAYER], dtype=np.int8)
+        replicates = len(self.rngs)
+        self.status = np.repeat(status[np.newaxis], replicates, axis=0)
+        self.arrival = None
+        if track_arrival:
+            self.arrival = np.where(status == BURNING, 0, -1).astype(np.int32)
+            self.arrival = np.repeat(self.arrival[np.newaxis], replicates, axis=0)
+        self.step_count = 0
+
+        burning = (self.status == BURNING).any(axis=(1, 2))
+        self._ids = np.flatnonzero(burning)
+        self._live = self.status[self._ids]
+
+    @property
+    def active(self):
+        """Índices das réplicas que ainda têm fogo."""
+        return self._ids
+
+    def states(self):
+        """Tensor `(K, rows, cols)` de estados, incluindo as réplicas ativas."""
+        self.status[self._ids] = self._live
+        return self.status
+
+    def step(self):
+        live = self._live
+        if live.shape[0] == 0:
+            return
+        burning = live == BURNING
+        tree = live == TREE
+        shifted = np.empty_like(burning)
+
+        ks, ys, xs, directions, probs = [], [], [], [], []
+        for direction, (dy, dx) in enumerate(VON_NEUMANN_OFFSETS):
+            candidates = shift_into(shifted, burning, dy, dx, False)
+            candidates &= tree
+            k, y, x = np.nonzero(candidates)
+            ks.append(k)
+            ys.append(y)
+            xs.append(x)
+            directions.append(np.full(k.size, direction))
+            probs.append(
+                ignition_probability(
+                    self.moisture[y, x],
+                    self.elevation[y, x],
+                    self.elevation[y + dy, x + dx],
+                    self.ignition_prob,
+                    self.uphill_multiplier,
+                    self.downhill_multiplier,
+                )
+            )
+        k = np.concatenate(ks)
+        y = np.concatenate(ys)
+        x = np.concatenate(xs)
+        direction = np.concatenate(directions)
+        prob = np.concatenate(probs)
+
+        # Um único sorteio por réplica, com os pares agrupados por réplica
+        order = np.argsort(k, kind="stable")
+        counts = np.bincount(k, minlength=live.shape[0])
+        groups = np.split(order, np.cumsum(counts)[:-1])
+        draws = np.empty(k.size)
+        draws[order] = np.concatenate(
+            [
+                uniform_draws(self.rngs[i], self.step_count, y[g], x[g], direction[g])
+                for i, g in zip(self._ids, groups)
+            ]
+            + [[]]
+        )
+        hits = draws < prob
+        k, y, x = k[hits], y[hits], x[hits]
+
+        live[burning] = BURNED
+        live[k, y, x] = BURNING
+        self.step_count += 1
+        if self.arrival is not None:
+            self.arrival[self._ids[k], y, x] = self.step_count
+
+        alive = np.bincount(k, minlength=live.shape[0]) > 0
+        if not alive.all():
+            self.status[self._ids[~alive]] = live[~alive]
+            self._ids = self._ids[alive]
+            self._live = live[alive]
+
+    def run(self, max_steps=None):
+        """Avança até todas as réplicas se extinguirem e retorna `states()`."""
+        while self._ids.size and (max_steps is None or self.step_count < max_steps):
+            self.step()
+        return self.states()
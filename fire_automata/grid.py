@@ -0,0 +1,74 @@
+"""Grade do autômato em estrutura de arrays (um plano por camada)."""
+
+import numpy as np
+
+from .rules import CELL_ELEVATION_LAYER, CELL_MOISTURE_LAYER, CELL_STATUS_LAYER
+
+LAYER_COUNT = 3
+
+
+class FireGrid:
+    """Grade com um plano int8 de estado e planos compactos de elevação e umidade.
+
+    Substitui o array `(rows, cols, 3)` de float64: `grid[y, x, CAMADA]` e
+    `grid[:, :, CAMADA]` continuam funcionando com as constantes
+    `CELL_*_LAYER`, mas cada camada é um array contíguo. `copy()` duplica apenas
+    o plano de estado, pois elevação e umidade não mudam durante um passo.
+
+    `terrain_dtype` pode ser `np.float16` para reduzir ainda mais a memória
+    (5 bytes por célula em vez de 24).
+    """
+
+    def __init__(self, rows, cols, terrain_dtype=np.float32, status=None, terrain=None):
+        if status is None:
+            status = np.zeros((rows, cols), dtype=np.int8)
+        if terrain is None:
+            terrain = (
+                np.zeros((rows, cols), dtype=terrain_dtype),
+                np.zeros((rows, cols), dtype=terrain_dtype),
+            )
+        self.status = status
+        self.elevation, self.moisture = terrain
+        self.layers = [None] * LAYER_COUNT
+        self.layers[CELL_STATUS_LAYER] = self.status
+        self.layers[CELL_ELEVATION_LAYER] = self.elevation
+        self.layers[CELL_MOISTURE_LAYER] = self.moisture
+
+    @classmethod
+    def from_array(cls, array, terrain_dtype=np.float32):
+        """Converte uma grade `(rows, cols, 3)` no formato antigo."""
+        rows, cols = array.shape[:2]
+        grid = cls(rows, cols, terrain_dtype)
+        for layer, plane in enumerate(grid.layers):
+            plane[...] = array[:, :, layer]
+        return grid
+
+    def to_array(self):
+        """Retorna a grade no formato antigo `(rows, cols, 3)` de float64."""
+        return np.stack(self.layers, axis=-1).astype(float)
+
+    @property
+    def shape(self):
+        return self.status.shape + (LAYER_COUNT,)
+
+    @property
+    def nbytes(self):
+        return sum(plane.nbytes for plane in self.layers)
+
+    def __getitem__(self, key):
+        *index, layer = key
+        return self.layers[layer][tuple(index)]
+
+    def __setitem__(self, key, value):
+        *index, layer = key
+        self.layers[layer][tuple(index)] = value
+
+    def copy(self):
+        """Nova grade com o estado copiado e o terreno compartilhado."""
+        rows, cols = self.status.shape
+        return FireGrid(
+            rows,
+            cols,
+            status=self.status.copy(),
+            terrain=(self.elevation, self.moisture),
+        )
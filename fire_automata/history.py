@@ -0,0 +1,350 @@
+"""Snapshots binários e histórico de passos para replay.
+
+Um arquivo de snapshot guarda as camadas da grade, a seed, o estado do
+gerador aleatório e o passo atual, e opcionalmente o histórico gravado por um
+`HistoryRecorder`: a cada passo, só as células que mudaram, codificadas em
+sequências (run-length) de posições consecutivas na grade achatada, mais um
+quadro-chave completo a cada `keyframe_interval` passos. Elevação e umidade
+editadas durante a gravação também entram no histórico, como deltas a partir
+do terreno do primeiro passo, desde que as regiões editadas sejam informadas
+com `HistoryRecorder.terrain_changed`; como edições são raras, o terreno não
+tem outros quadros-chave e os passos sem edições só comparam o estado.
+
+Formato: `MAGIC`, versão (uint32), tamanho do cabeçalho (uint64), cabeçalho
+JSON e os arrays, alinhados em `ALIGNMENT` bytes. O cabeçalho traz o dtype, a
+forma e a posição de cada array, então a leitura é feita com `numpy.memmap`
+e ir para qualquer passo custa no máximo `keyframe_interval` deltas.
+"""
+
+import json
+import struct
+
+import numpy as np
+
+from .counter_rng import CounterRNG
+from .grid import FireGrid
+from .rules import CELL_ELEVATION_LAYER, CELL_MOISTURE_LAYER, CELL_STATUS_LAYER
+
+MAGIC = b"FIRESNAP"
+VERSION = 1
+ALIGNMENT = 64
+DEFAULT_KEYFRAME_INTERVAL = 256
+
+_PREFIX = struct.Struct("<8sIQ")
+_STATE_LAYERS = ("status", "elevation", "moisture")
+_TERRAIN_LAYERS = (
+    ("elevation", CELL_ELEVATION_LAYER),
+    ("moisture", CELL_MOISTURE_LAYER),
+)
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def encode_runs(previous, current):
+    """Células de `current` que diferem de `previous`, em sequências.
+
+    Retorna `(starts, lengths, values)`: o início e o tamanho de cada sequência
+    de posições consecutivas na grade achatada, e os novos valores.
+    """
+    return _runs(np.flatnonzero(previous.ravel() != current.ravel()), current)
+
+
+def _runs(changed, current):
+    """Sequências das posições `changed` (crescentes) na grade achatada."""
+    if changed.size == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty.astype(np.int32), np.empty(0, dtype=current.dtype)
+    breaks = np.flatnonzero(np.diff(changed) != 1) + 1
+    starts = changed[np.concatenate(([0], breaks))]
+    lengths = np.diff(np.concatenate(([0], breaks, [changed.size])))
+    return starts.astype(np.int64), lengths.astype(np.int32), current.ravel()[changed]
+
+
+def apply_runs(status, starts, lengths, values):
+    """Aplica em `status` (no lugar) as sequências de `encode_runs`."""
+    if values.size == 0:
+        return status
+    run_offsets = np.cumsum(lengths) - lengths
+    cells = np.arange(values.size) + np.repeat(starts - run_offsets, lengths)
+    status.reshape(-1)[cells] = values
+    return status
+
+
+class _DeltaLog:
+    """Deltas de uma camada, um por passo, no formato de `encode_runs`."""
+
+    def __init__(self, dtype):
+        self.dtype = dtype
+        self.starts, self.lengths, self.values = [], [], []
+
+    def append(self, previous, current):
+        self.append_runs(*encode_runs(previous, current))
+
+    def append_runs(self, starts, lengths, values):
+        self.starts.append(starts)
+        self.lengths.append(lengths)
+        self.values.append(values)
+
+    def arrays(self, prefix=""):
+        return {
+            f"{prefix}run_offsets": np.cumsum([0] + [s.size for s in self.starts]),
+            f"{prefix}value_offsets": np.cumsum([0] + [v.size for v in self.values]),
+            f"{prefix}run_starts": np.concatenate(
+                [np.empty(0, np.int64)] + self.starts
+            ),
+            f"{prefix}run_lengths": np.concatenate(
+                [np.empty(0, np.int32)] + self.lengths
+            ),
+            f"{prefix}values": np.concatenate([np.empty(0, self.dtype)] + self.values),
+        }
+
+
+class HistoryRecorder:
+    """Grava a sequência de estados de uma simulação como deltas.
+
+    `record` é chamado depois de cada passo; qualquer mudança de estado feita
+    entre dois passos (pincéis, novas ignições) entra no delta seguinte.
+    Edições de elevação ou umidade só são comparadas nas regiões informadas
+    com `terrain_changed`, como as devolvidas pelo `BrushEditor`, então um
+    passo sem edições custa o mesmo que comparar o estado.
+    """
+
+    def __init__(self, grid, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL, step=0):
+        self.keyframe_interval = keyframe_interval
+        self.reset(grid, step)
+
+    def reset(self, grid, step=0):
+        status = np.asarray(grid[:, :, CELL_STATUS_LAYER], dtype=np.int8)
+        self.first_step = step
+        self._last = status.copy()
+        self._keyframes = [status.copy()]
+        self._status = _DeltaLog(np.int8)
+        self._terrain_keyframe = {}
+        self._last_terrain = {}
+        self._terrain = {}
+        for name, layer in _TERRAIN_LAYERS:
+            plane = np.array(grid[:, :, layer])
+            self._terrain_keyframe[name] = plane
+            self._last_terrain[name] = plane.copy()
+            self._terrain[name] = _DeltaLog(plane.dtype)
+        self._terrain_regions = []
+
+    def terrain_changed(self, region):
+        """Marca a região `(linhas, colunas)` (fatias) para o próximo `record`."""
+        self._terrain_regions.append(region)
+
+    @property
+    def steps(self):
+        """Quantos passos foram gravados depois do estado inicial."""
+        return len(self._status.values)
+
+    def record(self, grid):
+        status = np.asarray(grid[:, :, CELL_STATUS_LAYER], dtype=np.int8)
+        self._status.append(self._last, status)
+        self._last[...] = status
+        for name, layer in _TERRAIN_LAYERS:
+            self._record_terrain(name, np.asarray(grid[:, :, layer]))
+        self._terrain_regions = []
+        if self.steps % self.keyframe_interval == 0:
+            self._keyframes.append(self._last.copy())
+
+    def _record_terrain(self, name, plane):
+        """Delta da camada `name` só nas regiões marcadas com `terrain_changed`."""
+        last = self._last_terrain[name]
+        rows, cols = plane.shape
+        changed = []
+        for region in self._terrain_regions:
+            region_rows, region_cols = region
+            ys, xs = np.nonzero(last[region] != plane[region])
+            changed.append(
+                (ys + region_rows.indices(rows)[0]) * cols
+                + xs
+                + region_cols.indices(cols)[0]
+            )
+            last[region] = plane[region]
+        cells = np.unique(np.concatenate([np.empty(0, np.intp)] + changed))
+        self._terrain[name].append_runs(*_runs(cells, plane))
+
+    def arrays(self):
+        """Arrays do histórico no formato gravado por `save_snapshot`."""
+        arrays = {"keyframes": np.stack(self._keyframes)}
+        arrays.update(self._status.arrays())
+        for name, _ in _TERRAIN_LAYERS:
+            arrays[f"{name}_keyframe"] = self._terrain_keyframe[name]
+            arrays.update(self._terrain[name].arrays(f"{name}_"))
+        return arrays
+
+
+def save_snapshot(path, grid, step=0, seed=None, rng=None, recorder=None):
+    """Grava a grade, a seed, o estado de `rng`, o passo e o histórico."""
+    arrays = {
+        "status": np.asarray(grid[:, :, CELL_STATUS_LAYER], dtype=np.int8),
+        "elevation": np.asarray(grid[:, :, CELL_ELEVATION_LAYER]),
+        "moisture": np.asarray(grid[:, :, CELL_MOISTURE_LAYER]),
+    }
+    header = {
+        "version": VERSION,
+        "step": int(step),
+        "seed": seed,
+        "rng_state": _rng_state(rng),
+        "arrays": {},
+    }
+    if recorder is not None:
+        arrays.update(recorder.arrays())
+        header["history"] = {
+            "first_step": recorder.first_step,
+            "steps": recorder.steps,
+            "keyframe_interval": recorder.keyframe_interval,
+        }
+
+    offset = 0
+    for name, array in arrays.items():
+        header["arrays"][name] = {
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "offset": offset,
+        }
+        offset = _align(offset + array.nbytes)
+
+    encoded = json.dumps(header).encode("utf-8")
+    data_start = _align(_PREFIX.size + len(encoded))
+    with open(path, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, VERSION, len(encoded)))
+        f.write(encoded)
+        for name, array in arrays.items():
+            f.seek(data_start + header["arrays"][name]["offset"])
+            f.write(np.ascontiguousarray(array).tobytes())
+
+
+def _read_header(path):
+    with open(path, "rb") as f:
+        magic, version, length = _PREFIX.unpack(f.read(_PREFIX.size))
+        if magic != MAGIC:
+            raise ValueError(f"'{path}' não é um snapshot do simulador")
+        if version > VERSION:
+            raise ValueError(f"versão de snapshot não suportada: {version}")
+        header = json.loads(f.read(length).decode("utf-8"))
+    return header, _align(_PREFIX.size + length)
+
+
+def _rng_state(rng):
+    if rng is None:
+        return None
+    if isinstance(rng, CounterRNG):
+        return rng.state
+    return rng.bit_generator.state
+
+
+def _restore_rng(state):
+    if state is None:
+        return None
+    if state["bit_generator"] == "CounterRNG":
+        return CounterRNG.from_key(state["key"])
+    bit_generator = getattr(np.random, state["bit_generator"])()
+    bit_generator.state = state
+    return np.random.Generator(bit_generator)
+
+
+class Snapshot:
+    """Snapshot aberto com `numpy.memmap`; nada é lido antes de ser usado.
+
+    `grid()` devolve a grade gravada (em cópia-na-escrita, para que a
+    simulação e os pincéis possam continuar sem alterar o arquivo) e `status_at`
+    reconstrói o estado de qualquer passo do histórico.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        header, data_start = _read_header(path)
+        self.step = header["step"]
+        self.seed = header["seed"]
+        self.rng_state = header["rng_state"]
+        self.history = header.get("history")
+        self._arrays = {
+            name: (
+                np.memmap(
+                    path,
+                    dtype=np.dtype(spec["dtype"]),
+                    mode="c" if name in _STATE_LAYERS else "r",
+                    offset=data_start + spec["offset"],
+                    shape=tuple(spec["shape"]),
+                )
+                if np.prod(spec["shape"]) > 0
+                else np.empty(spec["shape"], dtype=np.dtype(spec["dtype"]))
+            )
+            for name, spec in header["arrays"].items()
+        }
+
+    def rng(self):
+        """Novo gerador no estado gravado (ou `None`)."""
+        return _restore_rng(self.rng_state)
+
+    def grid(self):
+        status = self._arrays["status"]
+        return FireGrid(
+            *status.shape,
+            status=status,
+            terrain=(self._arrays["elevation"], self._arrays["moisture"]),
+        )
+
+    @property
+    def first_step(self):
+        return self.history["first_step"] if self.history else self.step
+
+    @property
+    def last_step(self):
+        return self.first_step + self.history["steps"] if self.history else self.step
+
+    def _check_step(self, step):
+        if self.history is None:
+            raise ValueError("snapshot gravado sem histórico")
+        if not self.first_step <= step <= self.last_step:
+            raise IndexError(
+                f"passo {step} fora do histórico "
+                f"({self.first_step}..{self.last_step})"
+            )
+        return step - self.first_step
+
+    def _apply_deltas(self, plane, prefix, deltas):
+        """Aplica em `plane` (no lugar) os deltas `deltas` da camada `prefix`."""
+        arrays = self._arrays
+        for delta in deltas:
+            runs = slice(*arrays[f"{prefix}run_offsets"][delta : delta + 2])
+            values = slice(*arrays[f"{prefix}value_offsets"][delta : delta + 2])
+            apply_runs(
+                plane,
+                arrays[f"{prefix}run_starts"][runs],
+                arrays[f"{prefix}run_lengths"][runs],
+                arrays[f"{prefix}values"][values],
+            )
+        return plane
+
+    def status_at(self, step):
+        """Estado no passo `step`: o quadro-chave anterior mais os deltas."""
+        index = self._check_step(step)
+        interval = self.history["keyframe_interval"]
+        keyframe = index // interval
+        status = np.array(self._arrays["keyframes"][keyframe])
+        return self._apply_deltas(status, "", range(keyframe * interval, index))
+
+    def terrain_at(self, step):
+        """Elevação e umidade no passo `step`."""
+        index = self._check_step(step)
+        terrain = []
+        for name, _ in _TERRAIN_LAYERS:
+            # Só os passos com edições têm deltas não vazios
+            offsets = self._arrays[f"{name}_value_offsets"][: index + 1]
+            deltas = np.flatnonzero(np.diff(offsets))
+            plane = np.array(self._arrays[f"{name}_keyframe"])
+            terrain.append(self._apply_deltas(plane, f"{name}_", deltas.tolist()))
+        return tuple(terrain)
+
+    def grid_at(self, step):
+        status = self.status_at(step)
+        return FireGrid(*status.shape, status=status, terrain=self.terrain_at(step))
+
+
+def load_snapshot(path):
+    return Snapshot(path)
@@ -0,0 +1,110 @@
+"""Pirâmide de níveis de detalhe da camada de estado, para visualizar grades enormes.
+
+Cada nível reduz blocos de 2×2 do nível abaixo a três valores: o mínimo, o
+máximo e a moda. Como QUEIMANDO é o menor estado, `min == BURNING` indica que
+há fogo no bloco, o que mantém a frente visível mesmo com o zoom bem afastado.
+Nas bordas ímpares a última linha ou coluna é repetida.
+"""
+
+import numpy as np
+
+from .rules import BURNED, BURNING, EMPTY, TREE
+
+# Ordem de desempate da moda: em caso de empate vence o estado que vem antes
+MODE_PRIORITY = np.array([BURNING, BURNED, TREE, EMPTY], dtype=np.int8)
+
+
+def _combine(children):
+    """Mínimo, máximo e moda de blocos a partir dos quatro filhos de cada um.
+
+    `children` é uma sequência de quatro triplas `(min, max, moda)` de arrays
+    com a mesma forma. A moda do nível é a moda das modas dos filhos.
+    """
+    low = np.minimum.reduce([child[0] for child in children])
+    high = np.maximum.reduce([child[1] for child in children])
+    modes = [child[2] for child in children]
+    counts = np.stack(
+        [
+            sum((mode == state).view(np.uint8) for mode in modes)
+            for state in MODE_PRIORITY
+        ]
+    )
+    return low, high, MODE_PRIORITY[counts.argmax(axis=0)]
+
+
+def _children_of_all(level):
+    """Os quatro filhos de todos os blocos do nível seguinte, por fatias."""
+    rows, cols = level[0].shape
+    padding = ((0, rows % 2), (0, cols % 2))
+    padded = [np.pad(plane, padding, mode="edge") for plane in level]
+    return [
+        tuple(plane[dy::2, dx::2] for plane in padded) for dy in (0, 1) for dx in (0, 1)
+    ]
+
+
+def _children_of(level, block_ys, block_xs):
+    """Os quatro filhos dos blocos `(block_ys, block_xs)`, por índices."""
+    rows, cols = level[0].shape
+    children = []
+    for dy in (0, 1):
+        ys = np.minimum(2 * block_ys + dy, rows - 1)
+        for dx in (0, 1):
+            xs = np.minimum(2 * block_xs + dx, cols - 1)
+            children.append(tuple(plane[ys, xs] for plane in level))
+    return children
+
+
+class StatusPyramid:
+    """Níveis `1..depth` de mínimo, máximo e moda da camada de estado.
+
+    O nível 0 é a própria camada de estado, passada a cada atualização (os
+    buffers da simulação se alternam). `update` refaz só os blocos acima das
+    células alteradas, em todos os níveis.
+    """
+
+    def __init__(self, status):
+        self.rebuild(status)
+
+    def rebuild(self, status):
+        self.shape = status.shape
+        self.levels = []
+        level = (status, status, status)
+        while max(level[0].shape) > 1:
+            level = _combine(_children_of_all(level))
+            self.levels.append(level)
+
+    @property
+    def depth(self):
+        return len(self.levels)
+
+    def level_shape(self, level):
+        if level == 0:
+            return self.shape
+        return self.levels[level - 1][0].shape
+
+    def display(self, status, level, region):
+        """Estado a desenhar em `region` do nível: QUEIMANDO se houver fogo, senão a moda."""
+        if level == 0:
+            return status[region]
+        low, _, mode = self.levels[level - 1]
+        return np.where(low[region] == BURNING, np.int8(BURNING), mode[region])
+
+    def update(self, status, ys, xs):
+        """Refaz os blocos que contêm as células `(ys, xs)` alteradas em `status`."""
+        below = (status, status, status)
+        ys = np.asarray(ys, dtype=np.intp)
+        xs = np.asarray(xs, dtype=np.intp)
+        for level in self.levels:
+            if ys.size == 0:
+                return
+            cols = level[0].shape[1]
+            blocks = np.unique((ys // 2) * cols + xs // 2)
+            ys, xs = np.divmod(blocks, cols)
+            for plane, values in zip(level, _combine(_children_of(below, ys, xs))):
+                plane[ys, xs] = values
+            below = level
+
+    def update_region(self, status, region):
+        rows, cols = region
+        ys, xs = np.mgrid[rows, cols]
+        self.update(status, ys.ravel(), xs.ravel())
@@ -0,0 +1,254 @@
+"""Passo paralelo de uma única simulação, dividida em faixas horizontais.
+
+O estado fica em dois buffers de `multiprocessing.shared_memory` (o atual e o
+próximo) e o terreno em outros dois, compartilhados por todos os processos.
+Cada processo trabalhador é dono de um conjunto de faixas de linhas: lê a
+faixa com uma linha de halo acima e abaixo no buffer atual, escreve só as
+suas linhas no próximo e espera os demais numa barreira antes da troca.
+
+Cada faixa tem seu próprio gerador, derivado da seed, e as faixas não mudam
+com o número de processos; o resultado de uma seed é o mesmo para qualquer
+`workers`. Com `counter_rng=True`, todas as faixas usam o mesmo `CounterRNG`,
+e o resultado passa a ser também o mesmo para qualquer número de `strips` e
+igual ao dos motores de uma só grade com `CounterRNG(seed)`.
+"""
+
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .counter_rng import CounterRNG
+from .engine import DenseEngine
+from .grid import FireGrid
+from .rules import (
+    BURNING,
+    CELL_ELEVATION_LAYER,
+    CELL_MOISTURE_LAYER,
+    CELL_STATUS_LAYER,
+    DOWNHILL_MULTIPLIER,
+    IGNITION_PROB,
+    UPHILL_MULTIPLIER,
+    start_fire,
+)
+
+DEFAULT_STRIPS = 64
+
+_COMMAND_STEP = 0
+_COMMAND_STOP = 1
+
+
+def _shared_array(shape, dtype):
+    dtype = np.dtype(dtype)
+    size = max(1, int(np.prod(shape)) * dtype.itemsize)
+    memory = shared_memory.SharedMemory(create=True, size=size)
+    return memory, np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+
+
+def strip_bounds(rows, strips):
+    """Linhas `(y0, y1)` de cada faixa, com tamanhos o mais iguais possível."""
+    edges = np.linspace(0, rows, strips + 1).astype(int)
+    return list(zip(edges[:-1], edges[1:]))
+
+
+class _Strip:
+    """Uma faixa `[y0, y1)` e o `DenseEngine` que avança sua janela com halo.
+
+    As janelas são vistas dos buffers compartilhados, criadas uma vez; a faixa
+    só aloca o plano de estado em que o motor escreve o próximo passo.
+    """
+
+    def __init__(self, bounds, buffers, elevation, moisture, rng, rules):
+        rows, cols = elevation.shape
+        self.y0, self.y1 = bounds
+        self.top = max(self.y0 - 1, 0)
+        self.bottom = min(self.y1 + 1, rows)
+        window = slice(self.top, self.bottom)
+        terrain = (elevation[window], moisture[window])
+        height = self.bottom - self.top
+        self.windows = [
+            FireGrid(height, cols, status=buffer[window], terrain=terrain)
+            for buffer in buffers
+        ]
+        self.out = FireGrid(height, cols, terrain=terrain)
+        self.engine = DenseEngine(self.windows[0], rng=rng, **rules)
+        self.engine.origin = (self.top, 0)
+
+    def step(self, parity, next_status):
+        """Escreve as linhas da faixa em `next_status`; retorna quantas queimam."""
+        self.engine.step_into(self.windows[parity], self.out)
+        own = self.out.status[self.y0 - self.top : self.y1 - self.top]
+        next_status[self.y0 : self.y1] = own
+        return int(np.count_nonzero(own == BURNING))
+
+
+def _strip_worker(memories, shape, strips, rngs, rules, barrier, command, parity):
+    buffers = [
+        np.ndarray(shape, dtype=np.int8, buffer=memory.buf)
+        for memory in memories["status"]
+    ]
+    elevation = np.ndarray(shape, dtype=np.float32, buffer=memories["elevation"].buf)
+    moisture = np.ndarray(shape, dtype=np.float32, buffer=memories["moisture"].buf)
+    counts = np.ndarray(
+        len(rngs), dtype=np.int64, buffer=memories["burning_counts"].buf
+    )
+    own = {
+        index: _Strip(bounds, buffers, elevation, moisture, rngs[index], rules)
+        for index, bounds in strips
+    }
+    while True:
+        barrier.wait()
+        if command.value == _COMMAND_STOP:
+            break
+        current = parity.value
+        next_status = buffers[1 - current]
+        for index, strip in own.items():
+            counts[index] = strip.step(current, next_status)
+        barrier.wait()
+
+
+class ParallelEngine:
+    """Simulação única avançada em paralelo por `workers` processos.
+
+    A grade passada é copiada para a memória compartilhada; `grid` devolve um
+    `FireGrid` sobre o buffer atual, válido até `close`, e `snapshot` uma
+    cópia independente. Use como gerenciador de contexto (ou chame `close`)
+    para encerrar os processos e liberar a memória.
+    """
+
+    def __init__(
+        self,
+        grid,
+        workers=None,
+        strips=DEFAULT_STRIPS,
+        seed=None,
+        ignition_prob=IGNITION_PROB,
+        uphill_multiplier=UPHILL_MULTIPLIER,
+        downhill_multiplier=DOWNHILL_MULTIPLIER,
+        counter_rng=False,
+    ):
+        rows, cols = grid.shape[:2]
+        self.shape = (rows, cols)
+        strips = min(strips, rows)
+        workers = min(workers or os.cpu_count() or 1, strips)
+        rules = {
+            "ignition_prob": ignition_prob,
+            "uphill_multiplier": uphill_multiplier,
+            "downhill_multiplier": downhill_multiplier,
+        }
+
+        self._memories = {}
+        self._buffers = []
+        for _ in range(2):
+            memory, buffer = _shared_array(self.shape, np.int8)
+            self._memories.setdefault("status", []).append(memory)
+            self._buffers.append(buffer)
+        self._buffers[0][...] = grid[:, :, CELL_STATUS_LAYER]
+        self._memories["elevation"], self.elevation = _shared_array(
+            self.shape, np.float32
+        )
+        self._memories["moisture"], self.moisture = _shared_array(
+            self.shape, np.float32
+        )
+        self.elevation[...] = grid[:, :, CELL_ELEVATION_LAYER]
+        self.moisture[...] = grid[:, :, CELL_MOISTURE_LAYER]
+        self._memories["burning_counts"], self._burning_counts = _shared_array(
+            strips, np.int64
+        )
+
+        context = multiprocessing.get_context()
+        self._barrier = context.Barrier(workers + 1)
+        self._command = context.Value("i", _COMMAND_STEP, lock=False)
+        self._parity = context.Value("i", 0, lock=False)
+        if counter_rng:
+            rngs = [CounterRNG(seed)] * strips
+        else:
+            rngs = [
+                np.random.default_rng(s)
+                for s in np.random.SeedSequence(seed).spawn(strips)
+            ]
+        bounds = list(enumerate(strip_bounds(rows, strips)))
+        self._processes = [
+            context.Process(
+                target=_strip_worker,
+                args=(
+                    self._memories,
+                    self.shape,
+                    [bounds[i] for i in chunk],
+                    rngs,
+                    rules,
+                    self._barrier,
+                    self._command,
+                    self._parity,
+                ),
+                daemon=True,
+            )
+            for chunk in np.array_split(np.arange(strips), workers)
+        ]
+        for process in self._processes:
+            process.start()
+        self.step_count = 0
+
+    @property
+    def status(self):
+        return self._buffers[self._parity.value]
+
+    @property
+    def grid(self):
+        return FireGrid(
+            *self.shape, status=self.status, terrain=(self.elevation, self.moisture)
+        )
+
+    def snapshot(self):
+        return FireGrid(
+            *self.shape,
+            status=self.status.copy(),
+            terrain=(self.elevation.copy(), self.moisture.copy()),
+        )
+
+    @property
+    def burning(self):
+        """Há alguma célula QUEIMANDO?"""
+        return bool((self.status == BURNING).any())
+
+    def start_fire(self, grid_x, grid_y):
+        return start_fire(self.grid, grid_x, grid_y)
+
+    def step(self):
+        self._barrier.wait()  # Libera os trabalhadores para o passo
+        self._barrier.wait()  # Espera todas as faixas terminarem
+        self._parity.value = 1 - self._parity.value
+        self.step_count += 1
+        return int(self._burning_counts.sum())
+
+    def run(self, max_steps=None):
+        """Avança até o fogo se extinguir e devolve uma cópia da grade final."""
+        burning = self.burning
+        while burning and (max_steps is None or self.step_count < max_steps):
+            burning = self.step() > 0
+        return self.snapshot()
+
+    def close(self):
+        if self._processes:
+            self._command.value = _COMMAND_STOP
+            self._barrier.wait()
+            for process in self._processes:
+                process.join()
+            self._processes = []
+        # Os arrays precisam ser soltos antes de fechar a memória
+        self._buffers = []
+        self.elevation = self.moisture = self._burning_counts = None
+        for memory in self._memories.pop("status", []):
+            memory.close()
+            memory.unlink()
+        for memory in self._memories.values():
+            memory.close()
+            memory.unlink()
+        self._memories = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,455 @@
+"""Renderizadores em lote para as visualizações do autômato de incêndio."""
+
+import math
+
+import numpy as np
+import pygame
+
+from .camera import Camera
+from .lod import StatusPyramid
+from .rules import (
+    BURNED,
+    BURNING,
+    CELL_ELEVATION_LAYER,
+    CELL_MOISTURE_LAYER,
+    CELL_STATUS_LAYER,
+    TREE,
+)
+
+COLOR_GROUND = (160, 82, 45)
+COLOR_TREE = (0, 128, 0)
+COLOR_BURNING = (255, 69, 0)
+COLOR_BURNED = (40, 40, 40)
+COLOR_WET_TREE = (20, 90, 40)
+
+SIDE_SHADE = 0.6
+
+# Lado, em células, dos blocos usados para marcar regiões a redesenhar
+DIRTY_TILE = 4
+# Acima desta fração de blocos sujos, redesenha tudo de uma vez
+FULL_REDRAW_FRACTION = 0.25
+
+
+def project_iso(x, y, z, cell_size):
+    """Converte coordenadas da grade (x, y, z) para coordenadas de tela isométricas."""
+    iso_x = (x - y) * (cell_size * 0.866)  # 0.866 é cos(30)
+    iso_y = (x + y) * (cell_size * 0.5) - z
+    return iso_x, iso_y
+
+
+def cell_colors(
+    status,
+    moisture,
+    max_moisture=1.0,
+    ground=COLOR_GROUND,
+    tree=COLOR_TREE,
+    wet_tree=COLOR_WET_TREE,
+    burning=COLOR_BURNING,
+    burned=COLOR_BURNED,
+):
+    """Cor do topo de cada célula, `(rows, cols, 3)` em uint8.
+
+    Árvores vão de `tree` a `wet_tree` conforme a umidade.
+    """
+    moisture_factor = (np.asarray(moisture, dtype=float) / max_moisture)[..., None]
+    tree_colors = (
+        np.array(tree) * (1 - moisture_factor) + np.array(wet_tree) * moisture_factor
+    ).astype(np.uint8)
+    colors = np.empty(status.shape + (3,), dtype=np.uint8)
+    colors[...] = ground
+    np.copyto(colors, tree_colors, where=(status == TREE)[..., None])
+    colors[status == BURNING] = burning
+    colors[status == BURNED] = burned
+    return colors
+
+
+class IsometricRenderer:
+    """Desenha a grade isométrica a partir de geometria pré-calculada.
+
+    Os vértices projetados de todas as células são calculados de uma vez com
+    NumPy e só são refeitos quando a elevação muda. A imagem fica em uma
+    superfície própria; a cada quadro apenas os blocos com células cujo
+    estado mudou, ou marcadas com `mark_dirty`, são repintados (com recorte,
+    em ordem de pintor), e o resultado é copiado para a tela com um único
+    `blit`. Mudanças de elevação ou umidade feitas fora dos pincéis precisam
+    de `mark_dirty` ou `invalidate`.
+
+    A `camera` é aplicada aos vértices projetados; quando ela muda, a geometria
+    é refeita e só as células que aparecem na tela são desenhadas. Não há
+    níveis de detalhe: para grades enormes, use o `RasterRenderer`.
+    """
+
+    def __init__(
+        self, size, cell_size, origin, max_moisture=1.0, camera=None, **colors
+    ):
+        self.canvas = pygame.Surface(size)
+        self.cell_size = cell_size
+        self.origin = origin
+        self.camera = camera if camera is not None else Camera()
+        self.max_moisture = max_moisture
+        self.colors = colors
+        self.ground = colors.get("ground", COLOR_GROUND)
+        self._status = None
+        self._camera_state = None
+        self._pending = []
+
+    def invalidate(self):
+        """Força um redesenho completo no próximo quadro."""
+        self._status = None
+
+    def mark_dirty(self, region):
+        """Marca a região `(linhas, colunas)` (fatias) para o próximo quadro."""
+        self._pending.append(region)
+
+    def cells_changed(self, ys, xs):
+        """Nada a fazer: o estado já é comparado com o do quadro anterior."""
+
+    def screen_to_grid(self, pixel_x, pixel_y):
+        """Converte coordenadas de tela para coordenadas da grade na projeção isométrica."""
+        pixel_x, pixel_y = self.camera.to_world(pixel_x, pixel_y)
+        origin_x, origin_y = self.origin
+        px_transformed = float(pixel_x - origin_x)
+        py_transformed = float(pixel_y - origin_y)
+        grid_x_float = (px_transformed / (self.cell_size * 0.866 * 2)) + (
+            py_transformed / (self.cell_size * 0.5 * 2)
+        )
+        grid_y_float = (py_transformed / (self.cell_size * 0.5 * 2)) - (
+            px_transformed / (self.cell_size * 0.866 * 2)
+        )
+        return int(round(grid_x_float)), int(round(grid_y_float))
+
+    def _build_geometry(self, elevation):
+        self.top, self.right, self.left, self.bbox = self._geometry(elevation, 0, 0)
+
+    def _update_geometry(self, elevation, region):
+        rows, cols = region
+        parts = self._geometry(elevation[region], rows.start, cols.start)
+        for array, part in zip((self.top, self.right, self.left, self.bbox), parts):
+            array[region] = part
+
+    def _geometry(self, elevation, y0, x0):
+        """Faces e caixas envolventes de um bloco de células a partir de `(y0, x0)`."""
+        rows, cols = elevation.shape
+        y, x = np.mgrid[y0 : y0 + rows, x0 : x0 + cols].astype(float)
+        z = np.asarray(elevation, dtype=float)
+        ox, oy = self.origin
+
+        def vertex(vx, vy, vz):
+            px, py = project_iso(vx, vy, vz, self.cell_size)
+            return np.stack(self.camera.to_screen(ox + px, oy + py), axis=-1)
+
+        p1 = vertex(x, y, z)
+        p2 = vertex(x + 1, y, z)
+        p3 = vertex(x + 1, y + 1, z)
+        p4 = vertex(x, y + 1, z)
+        bottom_right = vertex(x + 1, y, 0)
+        bottom_front = vertex(x + 1, y + 1, 0)
+        bottom_left = vertex(x, y + 1, 0)
+
+        top = np.stack([p1, p2, p3, p4], axis=2)
+        right = np.stack([p2, bottom_right, bottom_front, p3], axis=2)
+        left = np.stack([p4, bottom_left, bottom_front, p3], axis=2)
+        corners = np.concatenate([top, right, left], axis=2)
+        # Caixa envolvente inteira de cada célula, com folga de um pixel
+        bbox = np.concatenate(
+            [
+                np.floor(corners.min(axis=2)) - 1,
+                np.ceil(corners.max(axis=2)) + 1,
+            ],
+            axis=-1,
+        ).astype(int)
+        return top, right, left, bbox
+
+    def _tile_rect(self, bbox, ty, tx):
+        tile = bbox[
+            ty * DIRTY_TILE : (ty + 1) * DIRTY_TILE,
+            tx * DIRTY_TILE : (tx + 1) * DIRTY_TILE,
+        ].reshape(-1, 4)
+        return (
+            tile[:, 0].min(),
+            tile[:, 1].min(),
+            tile[:, 2].max(),
+            tile[:, 3].max(),
+        )
+
+    def _draw_cells(self, ys, xs):
+        top = self.top
+        right = self.right
+        left = self.left
+        colors = self._top_colors
+        canvas = self.canvas
+        for y, x in zip(ys.tolist(), xs.tolist()):
+            top_color = colors[y, x].tolist()
+            side_color = [c * SIDE_SHADE for c in top_color]
+            pygame.draw.polygon(canvas, top_color, top[y, x].tolist())
+            pygame.draw.polygon(canvas, side_color, right[y, x].tolist())
+            pygame.draw.polygon(canvas, side_color, left[y, x].tolist())
+
+    def _redraw_all(self):
+        width, height = self.canvas.get_size()
+        self._redraw_rect((0, 0, width, height))
+
+    def _redraw_rect(self, rect):
+        x0, y0, x1, y1 = rect
+        bbox = self.bbox
+        hit = (
+            (bbox[..., 0] < x1)
+            & (bbox[..., 2] > x0)
+            & (bbox[..., 1] < y1)
+            & (bbox[..., 3] > y0)
+        )
+        clip = pygame.Rect(x0, y0, x1 - x0, y1 - y0)
+        self.canvas.set_clip(clip)
+        self.canvas.fill(self.ground)
+        # np.nonzero percorre linha a linha: a mesma ordem de pintor do laço
+        self._draw_cells(*np.nonzero(hit))
+        self.canvas.set_clip(None)
+
+    def draw(self, surface, grid):
+        status = np.asarray(grid[:, :, CELL_STATUS_LAYER])
+        elevation = np.asarray(grid[:, :, CELL_ELEVATION_LAYER])
+        moisture = np.asarray(grid[:, :, CELL_MOISTURE_LAYER])
+        self._top_colors = cell_colors(
+            status, moisture, self.max_moisture, **self.colors
+        )
+
+        if (
+            self._status is None
+            or self._status.shape != status.shape
+            or self._camera_state != self.camera.state
+        ):
+            self._camera_state = self.camera.state
+            self._build_geometry(elevation)
+            self._redraw_all()
+        else:
+            old_bbox = self.bbox
+            dirty = status != self._status
+            if self._pending:
+                old_bbox = self.bbox.copy()
+                for region in self._pending:
+                    self._update_geometry(elevation, region)
+                    dirty[region] = True
+            rows, cols = status.shape
+            tiles_y = -(-rows // DIRTY_TILE)
+            tiles_x = -(-cols // DIRTY_TILE)
+            padded = np.zeros((tiles_y * DIRTY_TILE, tiles_x * DIRTY_TILE), dtype=bool)
+            padded[:rows, :cols] = dirty
+            dirty_tiles = padded.reshape(tiles_y, DIRTY_TILE, tiles_x, DIRTY_TILE).any(
+                axis=(1, 3)
+            )
+            if dirty_tiles.mean() > FULL_REDRAW_FRACTION:
+                dirty_tiles[...] = False
+                self._redraw_all()
+            for ty, tx in zip(*np.nonzero(dirty_tiles)):
+                old = self._tile_rect(old_bbox, ty, tx)
+                new = self._tile_rect(self.bbox, ty, tx)
+                self._redraw_rect(
+                    (
+                        min(old[0], new[0]),
+                        min(old[1], new[1]),
+                        max(old[2], new[2]),
+                        max(old[3], new[3]),
+                    )
+                )
+
+        self._pending = []
+        self._status = status.copy()
+        surface.blit(self.canvas, (0, 0))
+
+
+class RasterRenderer:
+    """Desenha a grade 2D como uma imagem de uma célula por pixel, com câmera.
+
+    Só as células visíveis pela `camera` são coloridas, em uma única operação
+    vetorizada, escritas em uma superfície com `surfarray` e ampliadas para a
+    janela em um único `blit`. Quando o zoom deixa cada célula com menos de um
+    pixel, o estado vem de um nível da `StatusPyramid` (blocos de 2^n células,
+    mostrando fogo se houver fogo no bloco) e o terreno é amostrado no canto de
+    cada bloco, então o custo por quadro acompanha o tamanho da janela e não o
+    da grade. A pirâmide é montada na primeira vez em que é necessária e
+    depois atualizada só com as células informadas por `cells_changed` e
+    `mark_dirty`; outras mudanças de estado precisam de `invalidate`.
+
+    O sombreamento, que depende só de elevação e umidade, fica em cache para
+    cada bloco da janela visível e cada estado possível; um quadro é então uma
+    única seleção pelo estado. O cache é refeito quando o zoom ou o
+    deslocamento da câmera mudam a janela ou o nível, e recalculado só nas
+    regiões de `mark_dirty`; outras mudanças de terreno precisam de
+    `invalidate`.
+    """
+
+    def __init__(
+        self,
+        cell_size,
+        max_elevation,
+        max_moisture_shade=0.4,
+        ground=COLOR_GROUND,
+        tree=COLOR_TREE,
+        burning=COLOR_BURNING,
+        burned=COLOR_BURNED,
+        camera=None,
+    ):
+        self.cell_size = cell_size
+        self.max_elevation = max_elevation
+        self.max_moisture_shade = max_moisture_shade
+        self.camera = camera if camera is not None else Camera()
+        # Cor base por estado, indexada por `status - BURNING`
+        self.base_colors = np.zeros((BURNED - BURNING + 1, 3))
+        self.base_colors[:] = ground
+        self.base_colors[TREE - BURNING] = tree
+        self.base_colors[BURNING - BURNING] = burning
+        self.base_colors[BURNED - BURNING] = burned
+        self._cells = None
+        self._pyramid = None
+        self._shading = None
+        self._shading_key = None
+        self._offsets = None
+        self._changed = []
+        self._dirty = []
+
+    def invalidate(self):
+        """Descarta a pirâmide e o sombreamento; são refeitos quando necessários."""
+        self._pyramid = None
+        self._shading_key = None
+        self._changed = []
+        self._dirty = []
+
+    def mark_dirty(self, region):
+        """Atualiza a região `(linhas, colunas)` (fatias) no próximo quadro."""
+        self._dirty.append(region)
+
+    def cells_changed(self, ys, xs):
+        """Informa células cujo estado mudou, como em `engine.changes`."""
+        self._changed.append((ys, xs))
+
+    def screen_to_grid(self, pixel_x, pixel_y):
+        world_x, world_y = self.camera.to_world(pixel_x, pixel_y)
+        return int(world_x // self.cell_size), int(world_y // self.cell_size)
+
+    def level(self, shape):
+        """Nível da pirâmide em que cada bloco ocupa pelo menos um pixel."""
+        scale = self.cell_size * self.camera.zoom
+        if scale >= 1:
+            return 0
+        depth = (max(shape) - 1).bit_length()
+        return min(math.ceil(math.log2(1 / scale)), depth)
+
+    def _update_pyramid(self, status):
+        if self._pyramid is None or self._pyramid.shape != status.shape:
+            self._pyramid = StatusPyramid(status)
+        else:
+            for ys, xs in self._changed:
+                self._pyramid.update(status, ys, xs)
+            for region in self._dirty:
+                self._pyramid.update_region(status, region)
+        self._changed = []
+        self._dirty = []
+
+    def _visible(self, surface, shape, block):
+        """Fatias `(linhas, colunas)` dos blocos de `block` células na janela."""
+        width, height = surface.get_size()
+        size = self.cell_size * block
+        world_x0, world_y0 = self.camera.to_world(0, 0)
+        world_x1, world_y1 = self.camera.to_world(width, height)
+        rows, cols = shape
+        y0 = max(math.floor(world_y0 / size), 0)
+        y1 = min(math.ceil(world_y1 / size), rows)
+        x0 = max(math.floor(world_x0 / size), 0)
+        x1 = min(math.ceil(world_x1 / size), cols)
+        if y0 >= y1 or x0 >= x1:
+            return None
+        return slice(y0, y1), slice(x0, x1)
+
+    def _shade(self, elevation, moisture):
+        """Cor final de cada bloco em cada estado, `(rows, cols, estados, 3)`."""
+        brightness = np.asarray(elevation, dtype=float) / self.max_elevation * 0.6
+        brightness += np.asarray(moisture, dtype=float) / self.max_moisture_shade * 0.4
+        brightness += 0.7
+        shaded = self.base_colors * brightness[..., None, None]
+        np.floor(shaded, out=shaded)
+        np.minimum(shaded, 255, out=shaded)
+        return shaded.astype(np.uint8)
+
+    def _update_shading(self, grid, level, window, dirty):
+        """Refaz o cache para uma nova janela ou só nas regiões sujas."""
+        block = 1 << level
+        rows, cols = window
+        key = (grid.shape, level, rows.start, rows.stop, cols.start, cols.stop)
+        if self._shading_key != key:
+            self._shading_key = key
+            # Terreno amostrado no canto de cada bloco do nível
+            cells = (
+                slice(rows.start * block, rows.stop * block, block),
+                slice(cols.start * block, cols.stop * block, block),
+            )
+            shaded = self._shade(
+                grid[:, :, CELL_ELEVATION_LAYER][cells],
+                grid[:, :, CELL_MOISTURE_LAYER][cells],
+            )
+            # Um canal a mais, para ler as quatro cores de cada bloco como
+            # uint32 e escolher a do estado com uma única indexação
+            height, width, states = shaded.shape[:3]
+            self._shading = np.zeros((height, width, states, 4), dtype=np.uint8)
+            self._shading[..., :3] = shaded
+            self._offsets = (
+                np.arange(height * width, dtype=np.intp).reshape(height, width) * states
+                - BURNING
+            )
+            return
+        grid_rows, grid_cols = grid.shape[:2]
+        for region_rows, region_cols in dirty:
+            # Blocos da janela cujo canto amostrado cai dentro da região
+            y0, y1, _ = region_rows.indices(grid_rows)
+            x0, x1, _ = region_cols.indices(grid_cols)
+            by0, by1 = max(-(-y0 // block), rows.start), min(-(-y1 // block), rows.stop)
+            bx0, bx1 = max(-(-x0 // block), cols.start), min(-(-x1 // block), cols.stop)
+            if by0 >= by1 or bx0 >= bx1:
+                continue
+            cells = (
+                slice(by0 * block, by1 * block, block),
+                slice(bx0 * block, bx1 * block, block),
+            )
+            self._shading[
+                by0 - rows.start : by1 - rows.start,
+                bx0 - cols.start : bx1 - cols.start,
+                :,
+                :3,
+            ] = self._shade(
+                grid[:, :, CELL_ELEVATION_LAYER][cells],
+                grid[:, :, CELL_MOISTURE_LAYER][cells],
+            )
+
+    def draw(self, surface, grid):
+        status = np.asarray(grid[:, :, CELL_STATUS_LAYER])
+        level = self.level(status.shape)
+        dirty = self._dirty
+        if level or self._pyramid is not None:
+            self._update_pyramid(status)
+        else:
+            self._changed = []
+            self._dirty = []
+        block = 1 << level
+        shape = self._pyramid.level_shape(level) if level else status.shape
+        window = self._visible(surface, shape, block)
+        if window is None:
+            # As regiões sujas deste quadro não entraram no cache
+            self._shading_key = None
+            return
+        rows, cols = window
+        if level:
+            state = self._pyramid.display(status, level, window)
+        else:
+            state = status[window]
+        self._update_shading(grid, level, window, dirty)
+        packed = self._shading.view(np.uint32).reshape(-1)[self._offsets + state]
+        height, width = packed.shape
+        colors = packed.view(np.uint8).reshape(height, width, 4)[..., :3]
+        if self._cells is None or self._cells.get_size() != (width, height):
+            self._cells = pygame.Surface((width, height))
+        pygame.surfarray.blit_array(self._cells, colors.transpose(1, 0, 2))
+        size = self.cell_size * block
+        left, top = self.camera.to_screen(cols.start * size, rows.start * size)
+        right, bottom = self.camera.to_screen(cols.stop * size, rows.stop * size)
+        left, top, right, bottom = (round(v) for v in (left, top, right, bottom))
+        scaled = pygame.transform.scale(self._cells, (right - left, bottom - top))
+        surface.blit(scaled, (left, top))
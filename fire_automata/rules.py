@@ -0,0 +1,202 @@
+"""Estados, camadas e regras de transição do autômato de incêndio florestal."""
+
+import random
+
+import numpy as np
+
+# CELL possible Status
+TREE = 1
+BURNING = -1
+BURNED = 2
+EMPTY = 0
+
+# CELL caracterisctics layer
+CELL_STATUS_LAYER = 0
+CELL_ELEVATION_LAYER = 1
+CELL_MOISTURE_LAYER = 2
+
+IGNITION_PROB = 0.7
+UPHILL_MULTIPLIER = 1.6
+DOWNHILL_MULTIPLIER = 1.0
+
+# Vizinhança de von Neumann, na mesma ordem visitada pelo laço original
+VON_NEUMANN_OFFSETS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+# Motor por núcleo (`KernelEngine`): formatos de vizinhança e parâmetros do
+# modelo contínuo de declive e vento (Alexandridis et al., 2008)
+NEIGHBORHOODS = ("von_neumann", "moore", "disk")
+# Expoente por radiano de inclinação: a 45° de subida o fator é ~1.27 e, no
+# limite vertical, 1.6 (o mesmo que UPHILL_MULTIPLIER)
+SLOPE_COEFFICIENT = 0.3
+# Fator de vento `exp(V * (c1 + c2 * (cos(θ) - 1)))`, com V em m/s
+WIND_C1 = 0.045
+WIND_C2 = 0.131
+# Queda por célula de distância além da primeira, para focos secundários
+SPOTTING_DECAY = 1.0
+
+
+def ignition_probability(
+    moisture,
+    elevation_tree,
+    elevation_fire,
+    ignition_prob=IGNITION_PROB,
+    uphill_multiplier=UPHILL_MULTIPLIER,
+    downhill_multiplier=DOWNHILL_MULTIPLIER,
+):
+    """Probabilidade de uma árvore pegar fogo a partir de um vizinho queimando."""
+    prob = ignition_prob * (1 - moisture)
+    prob = np.where(elevation_tree > elevation_fire, prob * uphill_multiplier, prob)
+    prob = np.where(elevation_tree < elevation_fire, prob * downhill_multiplier, prob)
+    return prob
+
+
+def neighborhood_offsets(neighborhood="moore", radius=1):
+    """Deslocamentos `(dy, dx)` da árvore até cada vizinho, em ordem de linha.
+
+    `"von_neumann"` é o losango `|dy| + |dx| <= r`, `"moore"` o quadrado
+    `max(|dy|, |dx|) <= r` e `"disk"` o círculo de raio `r + 0.5`.
+    """
+    offsets = []
+    for dy in range(-radius, radius + 1):
+        for dx in range(-radius, radius + 1):
+            if neighborhood == "von_neumann":
+                inside = abs(dy) + abs(dx) <= radius
+            elif neighborhood == "moore":
+                inside = True
+            elif neighborhood == "disk":
+                inside = dy * dy + dx * dx <= (radius + 0.5) ** 2
+            else:
+                raise ValueError(f"vizinhança desconhecida: {neighborhood!r}")
+            if inside and (dy, dx) != (0, 0):
+                offsets.append((dy, dx))
+    return tuple(offsets)
+
+
+def ignition_table(
+    elevation,
+    moisture,
+    offsets,
+    ignition_prob=IGNITION_PROB,
+    wind=(0.0, 0.0),
+    slope_coefficient=SLOPE_COEFFICIENT,
+    spotting_decay=SPOTTING_DECAY,
+    region=None,
+):
+    """Probabilidades de ignição por direção, `(len(offsets), rows, cols)` em float32.
+
+    `table[d, y, x]` é a chance de a árvore em `(y, x)` pegar fogo a partir de
+    um vizinho queimando em `(y + dy, x + dx)`, com `(dy, dx) = offsets[d]`:
+    `ignition_prob * (1 - umidade)`, vezes `exp(slope_coefficient * θ)`, em que
+    `θ = atan(subida / distância)` é a inclinação da célula queimando até a
+    árvore (elevação medida em larguras de célula), vezes o fator de vento e
+    `exp(-spotting_decay * (distância - 1))`. `wind` é o vetor `(vx, vy)` para
+    onde o vento sopra, em m/s e no sentido das colunas e linhas.
+
+    Com `region = (linhas, colunas)` (fatias), calcula só esse recorte. Onde o
+    vizinho fica fora da grade a probabilidade é 0.
+    """
+    rows, cols = elevation.shape
+    if region is None:
+        region = (slice(0, rows), slice(0, cols))
+    y0, y1, _ = region[0].indices(rows)
+    x0, x1, _ = region[1].indices(cols)
+    radius = max((max(abs(dy), abs(dx)) for dy, dx in offsets), default=0)
+    # Elevação do recorte com uma borda de `radius`; fora da grade é nan
+    padded = np.full((y1 - y0 + 2 * radius, x1 - x0 + 2 * radius), np.nan)
+    sy0, sy1 = max(y0 - radius, 0), min(y1 + radius, rows)
+    sx0, sx1 = max(x0 - radius, 0), min(x1 + radius, cols)
+    padded[
+        sy0 - y0 + radius : sy1 - y0 + radius, sx0 - x0 + radius : sx1 - x0 + radius
+    ] = elevation[sy0:sy1, sx0:sx1]
+    target = padded[radius : radius + y1 - y0, radius : radius + x1 - x0]
+    base = ignition_prob * (1 - np.asarray(moisture[y0:y1, x0:x1], dtype=float))
+
+    wind_x, wind_y = wind
+    wind_speed = np.hypot(wind_x, wind_y)
+    table = np.empty((len(offsets), y1 - y0, x1 - x0), dtype=np.float32)
+    for d, (dy, dx) in enumerate(offsets):
+        distance = np.hypot(dy, dx)
+        source = padded[
+            radius + dy : radius + dy + y1 - y0, radius + dx : radius + dx + x1 - x0
+        ]
+        slope = np.arctan((target - source) / distance)
+        # O fogo se propaga da célula queimando para a árvore, isto é, (-dx, -dy)
+        cos_angle = 0.0
+        if wind_speed:
+            cos_angle = -(wind_x * dx + wind_y * dy) / (wind_speed * distance)
+        factor = np.exp(
+            wind_speed * (WIND_C1 + WIND_C2 * (cos_angle - 1))
+            - spotting_decay * (distance - 1)
+        )
+        prob = base * np.exp(slope_coefficient * slope) * factor
+        table[d] = np.where(np.isnan(prob), 0.0, np.clip(prob, 0.0, 1.0))
+    return table
+
+
+def shift_into(out, array, dy, dx, fill):
+    """Escreve `out[..., i, j] = array[..., i + dy, j + dx]`, preenchendo a borda.
+
+    O deslocamento é feito nos dois últimos eixos, então também serve para
+    pilhas `(K, rows, cols)` de grades.
+    """
+    rows, cols = array.shape[-2:]
+    out[..., max(0, -dy) : rows - max(0, dy), max(0, -dx) : cols - max(0, dx)] = array[
+        ..., max(0, dy) : rows - max(0, -dy), max(0, dx) : cols - max(0, -dx)
+    ]
+    if dy > 0:
+        out[..., rows - dy :, :] = fill
+    elif dy < 0:
+        out[..., :-dy, :] = fill
+    if dx > 0:
+        out[..., cols - dx :] = fill
+    elif dx < 0:
+        out[..., :-dx] = fill
+    return out
+
+
+def shift(array, dy, dx, fill):
+    """Versão de `shift_into` que aloca o resultado."""
+    return shift_into(np.empty_like(array), array, dy, dx, fill)
+
+
+def start_fire(grid, grid_x, grid_y):
+    if 0 <= grid_y < grid.shape[0] and 0 <= grid_x < grid.shape[1]:
+        if grid[grid_y, grid_x, CELL_STATUS_LAYER] == TREE:
+            grid[grid_y, grid_x, CELL_STATUS_LAYER] = BURNING
+            return True
+    return False
+
+
+def run_step_loop(
+    grid,
+    ignition_prob=IGNITION_PROB,
+    uphill_multiplier=UPHILL_MULTIPLIER,
+    downhill_multiplier=DOWNHILL_MULTIPLIER,
+):
+    """Passo de referência, célula a célula, usando o `random` global."""
+    next_grid = grid.copy()
+    rows, cols = grid.shape[:2]
+    for i in range(rows):
+        for j in range(cols):
+            if grid[i, j, CELL_STATUS_LAYER] == BURNING:
+                next_grid[i, j, CELL_STATUS_LAYER] = BURNED
+            elif grid[i, j, CELL_STATUS_LAYER] == TREE:
+                neighbors = [
+                    (ny, nx)
+                    for ny, nx in [(i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)]
+                    if 0 <= ny < rows and 0 <= nx < cols
+                ]
+                for ny, nx in neighbors:
+                    if grid[ny, nx, CELL_STATUS_LAYER] == BURNING:
+                        moisture = grid[i, j, CELL_MOISTURE_LAYER]
+                        prob = ignition_prob * (1 - moisture)
+                        elevation_tree = grid[i, j, CELL_ELEVATION_LAYER]
+                        elevation_fire = grid[ny, nx, CELL_ELEVATION_LAYER]
+                        if elevation_tree > elevation_fire:
+                            prob *= uphill_multiplier
+                        elif elevation_tree < elevation_fire:
+                            prob *= downhill_multiplier
+                        if random.random() < prob:
+                            next_grid[i, j, CELL_STATUS_LAYER] = BURNING
+                            break
+    return next_grid
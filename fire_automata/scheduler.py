@@ -0,0 +1,96 @@
+"""Agendamento de passos da simulação independente da taxa de quadros."""
+
+import time
+
+# Intervalo, em segundos, entre atualizações das taxas medidas
+RATE_WINDOW = 0.5
+
+
+class StepScheduler:
+    """Roda a simulação a `steps_per_second`, qualquer que seja o FPS.
+
+    A cada quadro o tempo decorrido é acumulado e convertido em um número
+    inteiro de passos (passo fixo), limitado a `max_steps_per_frame` para que
+    um quadro lento não dispare uma avalanche de passos. No modo turbo a
+    simulação roda `turbo_steps` passos por quadro, sem limite de FPS, ou
+    seja, só um a cada `turbo_steps` passos é desenhado.
+    """
+
+    def __init__(
+        self, step, steps_per_second=60, max_steps_per_frame=50, turbo_steps=20
+    ):
+        self.step = step
+        self.steps_per_second = steps_per_second
+        self.max_steps_per_frame = max_steps_per_frame
+        self.turbo_steps = turbo_steps
+        self.turbo = False
+        self._accumulator = 0.0
+
+        self.measured_steps_per_second = 0.0
+        self.measured_fps = 0.0
+        self._window_start = time.perf_counter()
+        self._window_steps = 0
+        self._window_frames = 0
+
+    def frame_rate(self, fps):
+        """Limite de FPS para `clock.tick`: sem limite no modo turbo."""
+        return 0 if self.turbo else fps
+
+    def faster(self):
+        if self.turbo:
+            self.turbo_steps *= 2
+        else:
+            self.steps_per_second *= 2
+
+    def slower(self):
+        if self.turbo:
+            self.turbo_steps = max(1, self.turbo_steps // 2)
+        else:
+            self.steps_per_second = max(1, self.steps_per_second // 2)
+
+    def reset(self):
+        """Descarta o tempo acumulado (ex.: ao pausar ou reiniciar)."""
+        self._accumulator = 0.0
+
+    def update(self, dt, running=True):
+        """Avança a simulação pelo tempo `dt` do quadro e retorna os passos dados."""
+        steps = 0
+        if running:
+            if self.turbo:
+                steps = self.turbo_steps
+            else:
+                self._accumulator += dt * self.steps_per_second
+                steps = min(int(self._accumulator), self.max_steps_per_frame)
+                self._accumulator -= int(self._accumulator)
+            for _ in range(steps):
+                self.step()
+        else:
+            self.reset()
+        self._measure(steps)
+        return steps
+
+    def _measure(self, steps):
+        self._window_steps += steps
+        self._window_frames += 1
+        now = time.perf_counter()
+        elapsed = now - self._window_start
+        if elapsed >= RATE_WINDOW:
+            self.measured_steps_per_second = self._window_steps / elapsed
+            self.measured_fps = self._window_frames / elapsed
+            self._window_start = now
+            self._window_steps = 0
+            self._window_frames = 0
+
+    def status_text(self):
+        mode = (
+            f"Turbo x{self.turbo_steps}"
+            if self.turbo
+            else f"{self.steps_per_second} passos/s"
+        )
+        return (
+            f"Passos/s: {self.measured_steps_per_second:.0f} | "
+            f"FPS: {self.measured_fps:.0f} | Alvo: {mode}"
+        )
+
+    def draw_hud(self, surface, font, position, color):
+        surface.blit(font.render(self.status_text(), True, color), position)
@@ -0,0 +1,121 @@
+"""Simulação com buffers de estado pré-alocados, alternados a cada passo."""
+
+import numpy as np
+
+from .engine import make_engine
+from .grid import FireGrid
+from .rules import (
+    BURNING,
+    CELL_ELEVATION_LAYER,
+    CELL_MOISTURE_LAYER,
+    CELL_STATUS_LAYER,
+    TREE,
+    start_fire,
+)
+from .stats import FireStats
+
+
+class FireSimulation:
+    """Dono da grade atual e de um segundo buffer de estado (ping-pong).
+
+    Com o motor denso, cada passo escreve o próximo estado no buffer de trás
+    e troca os dois, sem `grid.copy()`. O terreno é compartilhado entre os
+    buffers quando a grade é um `FireGrid`. O motor de frente de fogo já
+    atualiza a grade no lugar e dispensa a troca.
+
+    Com `stats=True`, `self.stats` (um `FireStats`) é atualizado a cada passo
+    a partir das células que o motor alterou.
+    """
+
+    def __init__(self, grid, engine="dense", stats=False, **rules):
+        self._back = None
+        self.engine = make_engine(engine, grid, **rules)
+        self.stats = FireStats(grid) if stats else None
+        self.reset(grid)
+
+    def reset(self, grid, step=0):
+        """Passa a simular `grid`, reaproveitando o buffer de trás se couber.
+
+        Com um `FireGrid`, o buffer de trás só troca o terreno pelo de `grid`;
+        com um array `(rows, cols, 3)`, o terreno é copiado para ele.
+        """
+        self._back = self._back_for(grid)
+        self.grid = grid
+        self.step_count = step
+        self.engine.reset(grid, step)
+        if self.stats is not None:
+            self.stats.reset(grid, step)
+
+    def _back_for(self, grid):
+        back = self._back
+        if back is None or back is grid or back.shape != grid.shape:
+            return grid.copy()
+        if isinstance(grid, FireGrid):
+            if (
+                not isinstance(back, FireGrid)
+                or back.status is grid.status
+                or back.status.dtype != grid.status.dtype
+            ):
+                return grid.copy()
+            rows, cols = grid.status.shape
+            return FireGrid(
+                rows, cols, status=back.status, terrain=(grid.elevation, grid.moisture)
+            )
+        if isinstance(back, FireGrid) or back.dtype != grid.dtype:
+            return grid.copy()
+        back[...] = grid
+        return back
+
+    def terrain_changed(self, region):
+        """Avisa o motor de elevação ou umidade editadas na região `(linhas, colunas)`."""
+        if not isinstance(self.grid, FireGrid):
+            # Sem terreno compartilhado, o buffer de trás recebe a edição
+            rows, cols = region
+            self._back[rows, cols, CELL_ELEVATION_LAYER] = self.grid[
+                rows, cols, CELL_ELEVATION_LAYER
+            ]
+            self._back[rows, cols, CELL_MOISTURE_LAYER] = self.grid[
+                rows, cols, CELL_MOISTURE_LAYER
+            ]
+        self.engine.terrain_changed(self.grid, region)
+
+    def start_fire(self, grid_x, grid_y):
+        if start_fire(self.grid, grid_x, grid_y):
+            self.engine.add_ignition(grid_x, grid_y)
+            if self.stats is not None:
+                self.stats.add_ignition(self.grid, grid_x, grid_y)
+            return True
+        return False
+
+    def start_fires(self, grid_xs, grid_ys):
+        """Incendeia de uma vez as ÁRVORES entre as células dadas.
+
+        Retorna `(xs, ys)` das células que pegaram fogo.
+        """
+        xs = np.asarray(grid_xs, dtype=np.intp).ravel()
+        ys = np.asarray(grid_ys, dtype=np.intp).ravel()
+        status = self.grid[:, :, CELL_STATUS_LAYER]
+        rows, cols = status.shape
+        inside = (ys >= 0) & (ys < rows) & (xs >= 0) & (xs < cols)
+        xs, ys = xs[inside], ys[inside]
+        trees = status[ys, xs] == TREE
+        # Pontos repetidos contam uma vez só
+        cells = np.unique(ys[trees] * cols + xs[trees])
+        ys, xs = np.divmod(cells, cols)
+        status[ys, xs] = BURNING
+        if cells.size:
+            self.engine.add_ignition(xs, ys)
+            if self.stats is not None:
+                self.stats.add_ignition(self.grid, xs, ys)
+        return xs, ys
+
+    def step(self):
+        if self.engine.in_place:
+            self.engine.step(self.grid)
+        else:
+            self.engine.step_into(self.grid, self._back)
+            self.grid, self._back = self._back, self.grid
+        self.step_count += 1
+        if self.stats is not None:
+            self.stats.record_step(self.grid, self.engine.changes)
+        return self.grid
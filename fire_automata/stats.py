@@ -0,0 +1,264 @@
+"""Estatísticas do incêndio atualizadas a partir das células que mudam.
+
+`FireStats` faz uma única varredura da grade em `reset`; depois, cada passo
+usa só as coordenadas que o motor alterou (`engine.changes`) e os vizinhos da
+frente de fogo, então o custo acompanha a frente e não a área da grade. As
+células QUEIMANDO são mantidas a partir das ignições e das que se apagaram, e
+não só das ignições do passo, então uma célula pode queimar por vários passos
+(como no `EventEngine` com `burn_time > 1`).
+"""
+
+import csv
+
+import numpy as np
+
+from .rules import (
+    BURNED,
+    BURNING,
+    CELL_ELEVATION_LAYER,
+    CELL_MOISTURE_LAYER,
+    CELL_STATUS_LAYER,
+    EMPTY,
+    TREE,
+    VON_NEUMANN_OFFSETS,
+)
+
+STATS_FIELDS = (
+    "step",
+    "tree",
+    "burning",
+    "burned",
+    "empty",
+    "ignited",
+    "front_perimeter",
+    "fire_min_y",
+    "fire_max_y",
+    "fire_min_x",
+    "fire_max_x",
+    "burned_mean_elevation",
+    "burned_mean_moisture",
+    "extinct",
+)
+# Tipo de cada coluna no Parquet (o padrão é int64); os limites do fogo são
+# nulos antes da primeira ignição, então o tipo não pode vir das linhas
+_PARQUET_TYPES = {
+    "burned_mean_elevation": "float64",
+    "burned_mean_moisture": "float64",
+    "extinct": "bool_",
+}
+
+
+class FireStats:
+    """Contagens por estado, frente de fogo, área atingida e extinção.
+
+    - `front_perimeter`: arestas entre células QUEIMANDO e ÁRVORE, isto é, por
+      onde o fogo ainda pode avançar;
+    - `fire_bounds`: `(min_y, max_y, min_x, max_x)` das células que já
+      queimaram ou estão queimando;
+    - `burned_mean_elevation` e `burned_mean_moisture`: médias sobre as
+      células QUEIMADAS, com os valores do passo em que elas queimaram;
+    - `extinction_step`: passo em que o fogo se apagou (ou `None`).
+
+    Com `sink`, cada passo é enviado como uma linha para `sink.write`.
+    """
+
+    def __init__(self, grid, sink=None, step=0):
+        self.sink = sink
+        self.reset(grid, step)
+
+    def reset(self, grid, step=0):
+        """Recalcula tudo com uma varredura completa de `grid`."""
+        status = grid[:, :, CELL_STATUS_LAYER]
+        self.step = step
+        self.counts = {
+            state: int(np.count_nonzero(status == state))
+            for state in (TREE, BURNING, BURNED, EMPTY)
+        }
+        burned = status == BURNED
+        self._elevation_sum = float(grid[:, :, CELL_ELEVATION_LAYER][burned].sum())
+        self._moisture_sum = float(grid[:, :, CELL_MOISTURE_LAYER][burned].sum())
+        self._burning = np.nonzero(status == BURNING)
+        self.fire_bounds = None
+        self._extend_bounds(np.nonzero(burned | (status == BURNING)))
+        self.ignited = 0
+        self.extinction_step = None
+        self.front_perimeter = self._perimeter(grid)
+
+    def _extend_bounds(self, cells):
+        ys, xs = cells
+        if ys.size == 0:
+            return
+        bounds = (int(ys.min()), int(ys.max()), int(xs.min()), int(xs.max()))
+        if self.fire_bounds is not None:
+            bounds = (
+                min(bounds[0], self.fire_bounds[0]),
+                max(bounds[1], self.fire_bounds[1]),
+                min(bounds[2], self.fire_bounds[2]),
+                max(bounds[3], self.fire_bounds[3]),
+            )
+        self.fire_bounds = bounds
+
+    def _perimeter(self, grid):
+        status = grid[:, :, CELL_STATUS_LAYER]
+        rows, cols = status.shape
+        ys, xs = self._burning
+        perimeter = 0
+        for dy, dx in VON_NEUMANN_OFFSETS:
+            ny, nx = ys + dy, xs + dx
+            inside = (ny >= 0) & (ny < rows) & (nx >= 0) & (nx < cols)
+            perimeter += int(np.count_nonzero(status[ny[inside], nx[inside]] == TREE))
+        return perimeter
+
+    def add_ignition(self, grid, grid_x, grid_y):
+        """Registra células incendiadas fora de um passo (escalares ou arrays)."""
+        cell = (np.atleast_1d(grid_y), np.atleast_1d(grid_x))
+        self.counts[TREE] -= cell[0].size
+        self.counts[BURNING] += cell[0].size
+        self._burning = tuple(np.concatenate(pair) for pair in zip(self._burning, cell))
+        self._extend_bounds(cell)
+        self.extinction_step = None
+        self.front_perimeter = self._perimeter(grid)
+
+    def _update_burning(self, grid, burned, ignited):
+        """QUEIMANDO = (anteriores + novas) - apagadas, em índices achatados."""
+        cols = grid[:, :, CELL_STATUS_LAYER].shape[1]
+        cells = np.concatenate(
+            (
+                self._burning[0] * cols + self._burning[1],
+                ignited[0] * cols + ignited[1],
+            )
+        )
+        # Com queimas curtas, uma célula pode acender e apagar no mesmo passo
+        cells = cells[~np.isin(cells, burned[0] * cols + burned[1])]
+        self._burning = np.divmod(cells, cols)
+
+    def record_step(self, grid, changes):
+        """Atualiza a partir de `changes = ((ys, xs) queimadas, (ys, xs) novas)`."""
+        burned, ignited = changes
+        self.ignited = int(ignited[0].size)
+        self.counts[BURNED] += burned[0].size
+        self.counts[BURNING] += self.ignited - burned[0].size
+        self.counts[TREE] -= self.ignited
+        self._elevation_sum += float(grid[:, :, CELL_ELEVATION_LAYER][burned].sum())
+        self._moisture_sum += float(grid[:, :, CELL_MOISTURE_LAYER][burned].sum())
+        self._extend_bounds(ignited)
+        self._update_burning(grid, burned, ignited)
+        self.front_perimeter = self._perimeter(grid)
+        self.step += 1
+        if self.counts[BURNING] == 0 and self.extinction_step is None:
+            self.extinction_step = self.step
+        if self.sink is not None:
+            self.sink.write(self.row())
+
+    @property
+    def extinct(self):
+        return self.counts[BURNING] == 0
+
+    def _burned_mean(self, total):
+        burned = self.counts[BURNED]
+        return total / burned if burned else float("nan")
+
+    def row(self):
+        bounds = self.fire_bounds or (None,) * 4
+        return {
+            "step": self.step,
+            "tree": self.counts[TREE],
+            "burning": self.counts[BURNING],
+            "burned": self.counts[BURNED],
+            "empty": self.counts[EMPTY],
+            "ignited": self.ignited,
+            "front_perimeter": self.front_perimeter,
+            "fire_min_y": bounds[0],
+            "fire_max_y": bounds[1],
+            "fire_min_x": bounds[2],
+            "fire_max_x": bounds[3],
+            "burned_mean_elevation": self._burned_mean(self._elevation_sum),
+            "burned_mean_moisture": self._burned_mean(self._moisture_sum),
+            "extinct": self.extinct,
+        }
+
+    def hud_lines(self):
+        burnable = self.counts[TREE] + self.counts[BURNING] + self.counts[BURNED]
+        share = 100 * self.counts[BURNED] / burnable if burnable else 0.0
+        status = (
+            f"extinto no passo {self.extinction_step}"
+            if self.extinction_step is not None
+            else f"{self.ignited} novas células/passo"
+        )
+        return [
+            f"Queimadas: {self.counts[BURNED]} ({share:.1f}%)",
+            f"Queimando: {self.counts[BURNING]} | Frente: {self.front_perimeter}",
+            f"Passo {self.step}: {status}",
+        ]
+
+    def draw_hud(self, surface, font, position, color):
+        x, y = position
+        for line in self.hud_lines():
+            surface.blit(font.render(line, True, color), (x, y))
+            y += 20
+
+
+class CsvStatsWriter:
+    """Escreve cada linha de `FireStats` em um CSV assim que ela é gerada."""
+
+    def __init__(self, path):
+        self._file = open(path, "w", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=STATS_FIELDS)
+        self._writer.writeheader()
+
+    def write(self, row):
+        self._writer.writerow(row)
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetStatsWriter:
+    """Grava as linhas em um Parquet, em grupos de `row_group_size` linhas.
+
+    Requer o `pyarrow`, importado só aqui. O esquema vem de `STATS_FIELDS`,
+    e não do primeiro grupo de linhas.
+    """
+
+    def __init__(self, path, row_group_size=1000):
+        import pyarrow
+        import pyarrow.parquet
+
+        self._pyarrow = pyarrow
+        self._schema = pyarrow.schema(
+            [
+                (name, getattr(pyarrow, _PARQUET_TYPES.get(name, "int64"))())
+                for name in STATS_FIELDS
+            ]
+        )
+        self._writer = None
+        self._parquet = pyarrow.parquet
+        self._path = path
+        self._rows = []
+        self.row_group_size = row_group_size
+
+    def write(self, row):
+        self._rows.append(row)
+        if len(self._rows) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._rows:
+            return
+        table = self._pyarrow.Table.from_pylist(self._rows, schema=self._schema)
+        if self._writer is None:
+            self._writer = self._parquet.ParquetWriter(self._path, self._schema)
+        self._writer.write_table(table)
+        self._rows = []
+
+    def close(self):
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+
+
+def open_stats_writer(path):
+    """Escolhe o formato pela extensão: `.parquet` ou CSV."""
+    if path.endswith(".parquet"):
+        return ParquetStatsWriter(path)
+    return CsvStatsWriter(path)
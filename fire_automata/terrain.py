@@ -0,0 +1,202 @@
+"""Geração do terreno inicial do autômato de incêndio florestal."""
+
+import random
+
+import numpy as np
+
+from .rules import (
+    CELL_ELEVATION_LAYER,
+    CELL_MOISTURE_LAYER,
+    CELL_STATUS_LAYER,
+    EMPTY,
+    TREE,
+)
+from .grid import FireGrid
+
+TREE_DENSITY = 0.80
+MAX_ELEVATION = 25.0
+MIN_INITIAL_MOISTURE = 0.1
+MAX_INITIAL_MOISTURE = 0.4
+
+# Expoente do espectro de potência 1/f^beta dos campos fractais
+FRACTAL_BETA = 3.0
+
+TERRAIN_MODES = ("legacy", "fast", "fractal")
+
+
+def _legacy_bit_generator(seed):
+    """`MT19937` no mesmo ponto em que `random.seed(seed)` deixaria o `random`."""
+    _, mt_state, _ = random.Random(seed).getstate()
+    bit_generator = np.random.MT19937()
+    bit_generator.state = {
+        "bit_generator": "MT19937",
+        "state": {"key": np.array(mt_state[:-1], dtype=np.uint32), "pos": mt_state[-1]},
+    }
+    return bit_generator
+
+
+def _legacy_random_state(seed):
+    """`RandomState` no mesmo ponto em que `random.seed(seed)` deixaria o `random`.
+
+    Os dois usam o MT19937 e geram floats de 53 bits do mesmo jeito, então os
+    sorteios de `random_sample` coincidem com chamadas a `random.random()`.
+    """
+    return np.random.RandomState(_legacy_bit_generator(seed))
+
+
+def _words_to_random(high, low):
+    """`random.random()` a partir de duas palavras de 32 bits do MT19937."""
+    return ((high >> 5) * 67108864.0 + (low >> 6)) / 9007199254740992.0
+
+
+def _orbit(jump, start, count):
+    """As primeiras `count` posições de `start, jump[start], jump[jump[start]], ...`.
+
+    Dobra os saltos a cada rodada (`jump = jump[jump]`), então a cadeia inteira
+    sai em O(log count) operações vetorizadas em vez de um laço por elemento.
+    """
+    visited = np.zeros(jump.size, dtype=bool)
+    visited[start] = True
+    reached = 1
+    while reached < count:
+        visited[jump[visited]] = True
+        jump = jump[jump]
+        reached *= 2
+    return np.flatnonzero(visited)[:count]
+
+
+def _legacy_integer_draws(seed, cells, high):
+    """Os sorteios de `random()`, `randint(0, high)` e `uniform()` de cada célula.
+
+    `randint` usa `getrandbits(k)` com rejeição (`k = (high + 1).bit_length()`),
+    e cada tentativa consome uma palavra de 32 bits do MT19937; `random()` e
+    `uniform()` consomem duas. Como o número de tentativas varia, o início de
+    cada célula depende das anteriores: `jump[p]` leva do início de uma célula
+    que começa na palavra `p` ao início da seguinte, e a cadeia a partir da
+    palavra 0 é percorrida por `_orbit`.
+    """
+    n = high + 1
+    k = n.bit_length()
+    # Média de 4 + 2**k / n palavras por célula; com folga, raramente falta
+    size = int(cells * (4 + 2**k / n) * 1.05) + 64
+    while True:
+        words = _legacy_bit_generator(seed).random_raw(size)
+        accepted = (words >> np.uint64(32 - k)) < n
+        # Primeira tentativa aceita a partir de cada palavra (`size` se nenhuma)
+        positions = np.where(accepted, np.arange(size), size)
+        first_accepted = np.minimum.accumulate(positions[::-1])[::-1]
+        first_accepted = np.append(first_accepted, [size] * 3)
+        jump = np.minimum(
+            first_accepted[np.minimum(np.arange(size) + 2, size)] + 3, size
+        )
+        jump = np.append(jump, size)
+        starts = _orbit(jump, 0, cells)
+        if starts.size == cells and starts[-1] < size:
+            randint_at = first_accepted[starts + 2]
+            if randint_at[-1] + 2 < size:
+                break
+        size *= 2
+    status = _words_to_random(words[starts], words[starts + 1])
+    elevation = words[randint_at] >> np.uint64(32 - k)
+    moisture = _words_to_random(words[randint_at + 1], words[randint_at + 2])
+    return status, elevation, moisture
+
+
+def fractal_field(shape, rng, beta=FRACTAL_BETA):
+    """Campo suave, espacialmente correlacionado, normalizado para [0, 1].
+
+    Síntese espectral: ruído branco filtrado no domínio da frequência por
+    `1 / |k|^(beta / 2)`, em O(N log N) com FFT.
+    """
+    rows, cols = shape
+    ky = np.fft.fftfreq(rows)[:, np.newaxis]
+    kx = np.fft.rfftfreq(cols)[np.newaxis, :]
+    k = np.hypot(ky, kx)
+    k[0, 0] = np.inf  # remove a componente média
+    spectrum = np.fft.rfft2(rng.standard_normal(shape)) * k ** (-beta / 2)
+    field = np.fft.irfft2(spectrum, s=shape)
+    field -= field.min()
+    peak = field.max()
+    return field / peak if peak > 0 else field
+
+
+def initialize_grid(
+    cols,
+    rows,
+    tree_density=TREE_DENSITY,
+    seed=None,
+    max_elevation=MAX_ELEVATION,
+    integer_elevation=False,
+    mode="legacy",
+):
+    """Cria a grade com base em uma seed para reprodutibilidade.
+
+    `integer_elevation` sorteia elevações inteiras, como na versão do artigo;
+    caso contrário elas são contínuas, como na versão 3D. Os modos são:
+
+    - `"legacy"`: mesma grade que `random.seed(seed)` seguido de três
+      sorteios por célula gerava, sem tocar no `random` global;
+    - `"fast"`: mesmas distribuições, sorteadas de uma vez por um
+      `numpy.random.Generator`;
+    - `"fractal"`: elevação e umidade suaves e espacialmente correlacionadas.
+    """
+    if mode == "legacy":
+        return _initialize_legacy(
+            cols, rows, tree_density, seed, max_elevation, integer_elevation
+        )
+    if mode not in TERRAIN_MODES:
+        raise ValueError(f"modo de terreno desconhecido: {mode!r}")
+
+    rng = np.random.default_rng(seed)
+    shape = (rows, cols)
+    grid = FireGrid(rows, cols)
+    grid[:, :, CELL_STATUS_LAYER] = np.where(
+        rng.random(shape) < tree_density, TREE, EMPTY
+    )
+    if mode == "fast":
+        if integer_elevation:
+            elevation = rng.integers(0, max_elevation, shape, endpoint=True)
+        else:
+            elevation = rng.random(shape) * max_elevation
+        moisture = rng.random(shape)
+    else:
+        elevation = fractal_field(shape, rng) * max_elevation
+        if integer_elevation:
+            elevation = np.rint(elevation)
+        moisture = fractal_field(shape, rng)
+    grid[:, :, CELL_ELEVATION_LAYER] = elevation
+    grid[:, :, CELL_MOISTURE_LAYER] = MIN_INITIAL_MOISTURE + moisture * (
+        MAX_INITIAL_MOISTURE - MIN_INITIAL_MOISTURE
+    )
+    return grid
+
+
+def _initialize_legacy(
+    cols, rows, tree_density, seed, max_elevation, integer_elevation
+):
+    grid = FireGrid(rows, cols)
+    if not integer_elevation:
+        # random(), uniform(0, max) e uniform(0.1, 0.4) por célula, nessa ordem
+        draws = _legacy_random_state(seed).random_sample((rows, cols, 3))
+        grid[:, :, CELL_STATUS_LAYER] = np.where(
+            draws[:, :, 0] < tree_density, TREE, EMPTY
+        )
+        grid[:, :, CELL_ELEVATION_LAYER] = draws[:, :, 1] * max_elevation
+        grid[:, :, CELL_MOISTURE_LAYER] = MIN_INITIAL_MOISTURE + draws[:, :, 2] * (
+            MAX_INITIAL_MOISTURE - MIN_INITIAL_MOISTURE
+        )
+        return grid
+
+    # random(), randint(0, max) e uniform(0.1, 0.4) por célula, nessa ordem
+    high = int(max_elevation)
+    if high != max_elevation:
+        raise ValueError("non-integer stop for randrange()")
+    status, elevation, moisture = _legacy_integer_draws(seed, rows * cols, high)
+    grid[:, :, CELL_STATUS_LAYER] = np.where(
+        status.reshape(rows, cols) < tree_density, TREE, EMPTY
+    )
+    grid[:, :, CELL_ELEVATION_LAYER] = elevation.reshape(rows, cols)
+    grid[:, :, CELL_MOISTURE_LAYER] = MIN_INITIAL_MOISTURE + moisture.reshape(
+        rows, cols
+    ) * (MAX_INITIAL_MOISTURE - MIN_INITIAL_MOISTURE)
+    return grid
@@ -0,0 +1,349 @@
+"""Simulação em blocos (tiles) guardados em disco, para terrenos muito grandes.
+
+A grade é dividida em blocos de `tile_size x tile_size` células, cada um em
+arquivos `.npy` próprios: o estado (`int8`) e o terreno (`float32`, elevação e
+umidade). Só ficam em memória os blocos com fogo e os vizinhos que a frente
+pode alcançar; os demais continuam no disco. A cada passo, cada bloco
+processado recebe uma borda (halo) de uma célula com as células QUEIMANDO dos
+blocos vizinhos e sua elevação, e o passo em si é o do `DenseEngine`.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from .engine import DenseEngine
+from .grid import FireGrid
+from .rules import (
+    BURNING,
+    DOWNHILL_MULTIPLIER,
+    EMPTY,
+    IGNITION_PROB,
+    TREE,
+    UPHILL_MULTIPLIER,
+)
+from .terrain import (
+    MAX_ELEVATION,
+    MAX_INITIAL_MOISTURE,
+    MIN_INITIAL_MOISTURE,
+    TREE_DENSITY,
+)
+
+DEFAULT_TILE_SIZE = 512
+METADATA_FILE = "tiles.json"
+
+# Vizinhos de um bloco que a vizinhança de von Neumann alcança
+TILE_NEIGHBORS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+class TiledGrid:
+    """Grade guardada em disco como blocos `.npy`, um diretório por grade."""
+
+    def __init__(self, directory, rows, cols, tile_size=DEFAULT_TILE_SIZE):
+        self.directory = directory
+        self.rows = rows
+        self.cols = cols
+        self.tile_size = tile_size
+        self.tiles = (-(-rows // tile_size), -(-cols // tile_size))
+
+    @classmethod
+    def create(cls, directory, rows, cols, tile_size=DEFAULT_TILE_SIZE):
+        os.makedirs(directory, exist_ok=True)
+        metadata = {"rows": rows, "cols": cols, "tile_size": tile_size}
+        with open(os.path.join(directory, METADATA_FILE), "w") as f:
+            json.dump(metadata, f)
+        return cls(directory, rows, cols, tile_size)
+
+    @classmethod
+    def open(cls, directory):
+        with open(os.path.join(directory, METADATA_FILE)) as f:
+            metadata = json.load(f)
+        return cls(directory, **metadata)
+
+    @classmethod
+    def from_grid(cls, directory, grid, tile_size=DEFAULT_TILE_SIZE):
+        """Divide em blocos uma grade que cabe na memória."""
+        rows, cols = grid.shape[:2]
+        tiled = cls.create(directory, rows, cols, tile_size)
+        for tile in tiled.tile_indices():
+            y0, y1, x0, x1 = tiled.bounds(tile)
+            tiled.write_status(tile, np.asarray(grid.status[y0:y1, x0:x1]))
+            tiled.write_terrain(
+                tile,
+                grid.elevation[y0:y1, x0:x1],
+                grid.moisture[y0:y1, x0:x1],
+            )
+        return tiled
+
+    @classmethod
+    def generate(
+        cls,
+        directory,
+        cols,
+        rows,
+        tile_size=DEFAULT_TILE_SIZE,
+        tree_density=TREE_DENSITY,
+        seed=None,
+        max_elevation=MAX_ELEVATION,
+    ):
+        """Gera o terreno bloco a bloco, sem montar a grade inteira.
+
+        Usa as distribuições do modo "fast" de `initialize_grid`, com um
+        gerador por bloco derivado de `seed`.
+        """
+        tiled = cls.create(directory, rows, cols, tile_size)
+        seeds = np.random.SeedSequence(seed).spawn(tiled.tiles[0] * tiled.tiles[1])
+        for tile, tile_seed in zip(tiled.tile_indices(), seeds):
+            rng = np.random.default_rng(tile_seed)
+            shape = tiled.tile_shape(tile)
+            trees = rng.random(shape) < tree_density
+            tiled.write_status(tile, np.where(trees, TREE, EMPTY).astype(np.int8))
+            tiled.write_terrain(
+                tile,
+                rng.uniform(0, max_elevation, shape),
+                rng.uniform(MIN_INITIAL_MOISTURE, MAX_INITIAL_MOISTURE, shape),
+            )
+        return tiled
+
+    def tile_indices(self):
+        tile_rows, tile_cols = self.tiles
+        return [(ty, tx) for ty in range(tile_rows) for tx in range(tile_cols)]
+
+    def contains(self, tile):
+        return 0 <= tile[0] < self.tiles[0] and 0 <= tile[1] < self.tiles[1]
+
+    def tile_of(self, grid_y, grid_x):
+        return grid_y // self.tile_size, grid_x // self.tile_size
+
+    def bounds(self, tile):
+        """Intervalo `(y0, y1, x0, x1)` de células da grade cobertas pelo bloco."""
+        y0, x0 = tile[0] * self.tile_size, tile[1] * self.tile_size
+        return (
+            y0,
+            min(y0 + self.tile_size, self.rows),
+            x0,
+            min(x0 + self.tile_size, self.cols),
+        )
+
+    def tile_shape(self, tile):
+        y0, y1, x0, x1 = self.bounds(tile)
+        return y1 - y0, x1 - x0
+
+    def _path(self, layer, tile):
+        return os.path.join(self.directory, f"{layer}_{tile[0]}_{tile[1]}.npy")
+
+    def read_status(self, tile):
+        return np.load(self._path("status", tile))
+
+    def write_status(self, tile, status):
+        np.save(self._path("status", tile), status.astype(np.int8, copy=False))
+
+    def read_terrain(self, tile):
+        """Elevação e umidade do bloco, mapeadas do disco só para leitura."""
+        terrain = np.load(self._path("terrain", tile), mmap_mode="r")
+        return terrain[0], terrain[1]
+
+    def write_terrain(self, tile, elevation, moisture):
+        np.save(
+            self._path("terrain", tile),
+            np.stack([elevation, moisture]).astype(np.float32),
+        )
+
+    def to_grid(self):
+        """Monta a grade inteira em memória (para visualizar domínios menores)."""
+        grid = FireGrid(self.rows, self.cols)
+        for tile in self.tile_indices():
+            y0, y1, x0, x1 = self.bounds(tile)
+            grid.status[y0:y1, x0:x1] = self.read_status(tile)
+            elevation, moisture = self.read_terrain(tile)
+            grid.elevation[y0:y1, x0:x1] = elevation
+            grid.moisture[y0:y1, x0:x1] = moisture
+        return grid
+
+
+class _LoadedTile:
+    def __init__(self, status, elevation, moisture):
+        self.status = status
+        self.elevation = elevation
+        self.moisture = moisture
+        self.dirty = False
+        # Grades com halo do bloco e do próximo estado, criadas ao processá-lo
+        self.padded = None
+        self.back = None
+
+
+class TiledEngine:
+    """Avança uma `TiledGrid` carregando só os blocos perto da frente de fogo.
+
+    Em cada passo são processados os blocos com células QUEIMANDO e os
+    vizinhos cuja borda voltada para eles tem fogo. Todos os blocos calculam o
+    próximo estado a partir do estado anterior dos vizinhos, e só depois os
+    resultados são gravados. Blocos que deixam de estar ao alcance do fogo
+    são salvos e descarregados, então a memória usada depende da frente, e
+    não do tamanho do mapa.
+
+    Com `rng=CounterRNG(seed)` o resultado é, célula a célula, o mesmo de um
+    `DenseEngine` sobre a grade inteira com esse gerador, para qualquer
+    `tile_size`.
+    """
+
+    def __init__(
+        self,
+        tiled,
+        ignition_prob=IGNITION_PROB,
+        uphill_multiplier=UPHILL_MULTIPLIER,
+        downhill_multiplier=DOWNHILL_MULTIPLIER,
+        rng=None,
+    ):
+        self.tiled = tiled
+        self.rules = {
+            "ignition_prob": ignition_prob,
+            "uphill_multiplier": uphill_multiplier,
+            "downhill_multiplier": downhill_multiplier,
+        }
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.step_count = 0
+        self._loaded = {}
+        self._engines = {}
+        # Uma passada pelos blocos, um de cada vez, para achar o fogo inicial
+        self.active = {
+            tile
+            for tile in tiled.tile_indices()
+            if (tiled.read_status(tile) == BURNING).any()
+        }
+
+    @property
+    def loaded_tiles(self):
+        return set(self._loaded)
+
+    def _load(self, tile):
+        loaded = self._loaded.get(tile)
+        if loaded is None:
+            loaded = _LoadedTile(
+                self.tiled.read_status(tile), *self.tiled.read_terrain(tile)
+            )
+            self._loaded[tile] = loaded
+        return loaded
+
+    def _engine_for(self, shape):
+        """`DenseEngine` para blocos (com halo) de um formato, todos com o mesmo rng."""
+        engine = self._engines.get(shape)
+        if engine is None:
+            grid = FireGrid(*shape)
+            engine = DenseEngine(grid, rng=self.rng, **self.rules)
+            self._engines[shape] = engine
+        return engine
+
+    def start_fire(self, grid_x, grid_y):
+        if not (0 <= grid_y < self.tiled.rows and 0 <= grid_x < self.tiled.cols):
+            return False
+        tile = self.tiled.tile_of(grid_y, grid_x)
+        loaded = self._load(tile)
+        y0, _, x0, _ = self.tiled.bounds(tile)
+        if loaded.status[grid_y - y0, grid_x - x0] != TREE:
+            return False
+        loaded.status[grid_y - y0, grid_x - x0] = BURNING
+        loaded.dirty = True
+        self.active.add(tile)
+        return True
+
+    def _padded(self, tile):
+        """Bloco com uma célula de halo, preenchida a partir dos vizinhos ativos.
+
+        O halo só recebe as células QUEIMANDO vizinhas (e sua elevação); o
+        resto fica VAZIO, então nenhuma árvore do halo vira candidata e gasta
+        sorteios do gerador. A grade com halo é criada uma vez por bloco
+        carregado, com o terreno copiado uma única vez, e reaproveitada.
+        """
+        loaded = self._load(tile)
+        padded = loaded.padded
+        if padded is None:
+            rows, cols = loaded.status.shape
+            padded = FireGrid(rows + 2, cols + 2)
+            padded.elevation[1:-1, 1:-1] = loaded.elevation
+            padded.moisture[1:-1, 1:-1] = loaded.moisture
+            loaded.padded = padded
+            loaded.back = padded.copy()
+        padded.status[1:-1, 1:-1] = loaded.status
+
+        halo = {
+            (-1, 0): (np.s_[0, 1:-1], np.s_[-1, :]),
+            (1, 0): (np.s_[-1, 1:-1], np.s_[0, :]),
+            (0, -1): (np.s_[1:-1, 0], np.s_[:, -1]),
+            (0, 1): (np.s_[1:-1, -1], np.s_[:, 0]),
+        }
+        for (dty, dtx), (target, source) in halo.items():
+            neighbor = (tile[0] + dty, tile[1] + dtx)
+            padded.status[target] = EMPTY
+            if neighbor in self.active:
+                other = self._loaded[neighbor]
+                burning = other.status[source] == BURNING
+                np.copyto(padded.status[target], BURNING, where=burning)
+                padded.elevation[target] = other.elevation[source]
+        return padded
+
+    def _tiles_to_process(self):
+        edges = {
+            (-1, 0): np.s_[0, :],
+            (1, 0): np.s_[-1, :],
+            (0, -1): np.s_[:, 0],
+            (0, 1): np.s_[:, -1],
+        }
+        process = set(self.active)
+        for tile in self.active:
+            status = self._load(tile).status
+            for (dty, dtx), edge in edges.items():
+                neighbor = (tile[0] + dty, tile[1] + dtx)
+                if self.tiled.contains(neighbor) and (status[edge] == BURNING).any():
+                    process.add(neighbor)
+        return process
+
+    def step(self):
+        process = self._tiles_to_process()
+        results = {}
+        for tile in sorted(process):
+            padded = self._padded(tile)
+            out = self._loaded[tile].back
+            engine = self._engine_for(padded.status.shape)
+            # Coordenadas e passo globais, para as chaves de um `CounterRNG`
+            y0, _, x0, _ = self.tiled.bounds(tile)
+            engine.origin = (y0 - 1, x0 - 1)
+            engine.step_count = self.step_count
+            engine.step_into(padded, out)
+            results[tile] = out.status[1:-1, 1:-1]
+
+        for tile, status in results.items():
+            loaded = self._loaded[tile]
+            loaded.status[...] = status
+            loaded.dirty = True
+        self.active = {
+            tile for tile, status in results.items() if (status == BURNING).any()
+        }
+        self._evict()
+        self.step_count += 1
+
+    def _evict(self):
+        """Salva e descarrega os blocos fora do alcance da frente atual."""
+        keep = set(self.active)
+        for tile in self.active:
+            keep.update((tile[0] + dty, tile[1] + dtx) for dty, dtx in TILE_NEIGHBORS)
+        for tile in list(self._loaded):
+            if tile not in keep:
+                self._unload(tile)
+
+    def _unload(self, tile):
+        loaded = self._loaded.pop(tile)
+        if loaded.dirty:
+            self.tiled.write_status(tile, loaded.status)
+
+    def flush(self):
+        """Grava no disco todos os blocos carregados."""
+        for tile in list(self._loaded):
+            self._unload(tile)
+
+    def run(self, max_steps=None):
+        """Avança até o fogo se extinguir e grava o resultado no disco."""
+        while self.active and (max_steps is None or self.step_count < max_steps):
+            self.step()
+        self.flush()
@@ -0,0 +1,341 @@
+"""Visualizador interativo em pygame, comum às duas variantes.
+
+    python -m fire_automata.viewer 3d
+    python -m fire_automata.viewer article
+    python -m fire_automata.viewer article --size 10000 10000 --terrain fast
+
+O pygame só é importado aqui, dentro de `run`, para que o restante do
+pacote possa ser usado sem display.
+"""
+
+import argparse
+import dataclasses
+import time
+
+from .brush import BrushEditor
+from .camera import Camera
+from .config import CONFIGS, add_kernel_arguments, with_kernel_arguments
+from .engine import ENGINES
+from .history import HistoryRecorder, load_snapshot, save_snapshot
+from .rules import CELL_ELEVATION_LAYER, CELL_MOISTURE_LAYER
+from .simulation import FireSimulation
+from .terrain import TERRAIN_MODES
+
+MAX_MOISTURE = 1.0
+MIN_ELEVATION = 0.0
+MIN_MOISTURE = 0.0
+
+COLOR_UI_TEXT = (255, 255, 255)
+
+BRUSH_FIRE = 0
+BRUSH_ELEVATION = 1
+BRUSH_MOISTURE = 2
+ELEVATION_STEP = 2.5
+MOISTURE_STEP = 0.02
+
+MIN_BRUSH_RADIUS = 0
+MAX_BRUSH_RADIUS = 10
+
+SCENARIO_FILE = "fire_scenario.txt"
+SNAPSHOT_FILE = "fire_snapshot.fsnap"
+REPLAY_FAST_STEPS = 10  # Passos por tecla no replay com SHIFT
+ZOOM_STEP = 1.25  # Fator de zoom por clique da roda com CTRL
+
+BRUSH_SHAPE_NAMES = {"square": "Quadrado", "circle": "Círculo"}
+BRUSH_FALLOFF_NAMES = {"constant": "Uniforme", "linear": "Linear", "smooth": "Suave"}
+
+
+def make_renderer(config, camera=None):
+    from . import render
+
+    if config.view == "isometric":
+        screen_width, screen_height = config.screen_size
+        return render.IsometricRenderer(
+            config.screen_size,
+            config.cell_size,
+            (screen_width // 2, screen_height // 4),
+            MAX_MOISTURE,
+            camera=camera,
+        )
+    return render.RasterRenderer(config.cell_size, config.max_elevation, camera=camera)
+
+
+def draw_ui(surface, font, brush_mode, current_seed, brushes):
+    y_offset = 10
+    if brush_mode == BRUSH_FIRE:
+        text_brush = "Pincel: Fogo (F1)"
+    elif brush_mode == BRUSH_ELEVATION:
+        text_brush = "Pincel: Elevação (F2)"
+    else:
+        text_brush = "Pincel: Umidade (F3)"
+    text_brush += (
+        f" | Raio: {brushes.radius} | [B] {BRUSH_SHAPE_NAMES[brushes.shape]}"
+        f" | [G] {BRUSH_FALLOFF_NAMES[brushes.falloff]} | [CTRL+Z] Desfazer"
+    )
+
+    text_controls = "Controles: [ESPAÇO] Play/Pause | [R] Reset | [N] Nova Seed | [S] Salvar | [L] Carregar"
+    text_seed = f"Seed Atual: {current_seed}"
+
+    text_surface_brush = font.render(text_brush, True, COLOR_UI_TEXT)
+    surface.blit(text_surface_brush, (10, y_offset))
+    y_offset += 20
+    text_surface_controls = font.render(text_controls, True, COLOR_UI_TEXT)
+    surface.blit(text_surface_controls, (10, y_offset))
+    y_offset += 20
+    text_surface_seed = font.render(text_seed, True, COLOR_UI_TEXT)
+    surface.blit(text_surface_seed, (10, y_offset))
+
+
+def run(config):
+    import pygame
+
+    from .render import COLOR_GROUND
+    from .scheduler import StepScheduler
+
+    pygame.init()
+    screen = pygame.display.set_mode(config.screen_size)
+    pygame.display.set_caption(config.title)
+    clock = pygame.time.Clock()
+    font = pygame.font.Font(None, 24)
+    camera = Camera()
+    renderer = make_renderer(config, camera)
+
+    current_seed = int(time.time())
+    terrain_grid = config.initialize_grid(seed=current_seed)
+    simulation = FireSimulation(
+        terrain_grid, config.step_engine, stats=True, **config.engine_rules()
+    )
+    brushes = BrushEditor(simulation, MIN_BRUSH_RADIUS)
+    show_stats = True
+    recorder = HistoryRecorder(terrain_grid)
+    replay = None
+    replay_step = 0
+
+    def advance():
+        simulation.step()
+        recorder.record(simulation.grid)
+        for ys, xs in simulation.engine.changes:
+            renderer.cells_changed(ys, xs)
+
+    def show_step(grid, step):
+        simulation.reset(grid, step)
+        recorder.reset(grid, step)
+        brushes.clear()
+        renderer.invalidate()
+
+    scheduler = StepScheduler(advance, config.sim_steps_per_second)
+
+    running = True
+    simulation_running = False
+    current_brush = BRUSH_FIRE
+
+    while running:
+        dt = clock.tick(scheduler.frame_rate(config.fps)) / 1000
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+
+            if event.type == pygame.MOUSEWHEEL and pygame.key.get_mods() & (
+                pygame.KMOD_CTRL
+            ):
+                camera.zoom_at(ZOOM_STEP**event.y, *pygame.mouse.get_pos())
+            elif event.type == pygame.MOUSEWHEEL:
+                if event.y < 0:
+                    brushes.radius = max(brushes.radius - 1, MIN_BRUSH_RADIUS)
+                elif event.y > 0:
+                    brushes.radius = min(brushes.radius + 1, MAX_BRUSH_RADIUS)
+
+            if event.type == pygame.MOUSEMOTION and event.buttons[1]:
+                camera.move(*event.rel)
+
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    running = False
+                if event.key == pygame.K_SPACE:
+                    simulation_running = not simulation_running
+                if event.key in (pygame.K_r, pygame.K_n):
+                    if event.key == pygame.K_n:
+                        current_seed = int(time.time())
+                    terrain_grid = config.initialize_grid(seed=current_seed)
+                    show_step(terrain_grid, 0)
+                    replay = None
+                if event.key == pygame.K_s:
+                    with open(SCENARIO_FILE, "w") as f:
+                        for point in sorted(brushes.ignition_points):
+                            f.write(f"{point[0]},{point[1]}\n")
+                    print(
+                        f"Cenário de fogo salvo com {len(brushes.ignition_points)} pontos."
+                    )
+                if event.key == pygame.K_l:
+                    try:
+                        with open(SCENARIO_FILE, "r") as f:
+                            points = []
+                            for line in f:
+                                x_str, y_str = line.strip().split(",")
+                                points.append((int(x_str), int(y_str)))
+                        brushes.ignition_points.clear()
+                        xs, ys = brushes.ignite_points(points)
+                        renderer.cells_changed(ys, xs)
+                        print(
+                            f"Cenário de fogo carregado com {len(brushes.ignition_points)} pontos."
+                        )
+                    except FileNotFoundError:
+                        print(f"Arquivo '{SCENARIO_FILE}' não encontrado.")
+                if event.key == pygame.K_F5:
+                    save_snapshot(
+                        SNAPSHOT_FILE,
+                        simulation.grid,
+                        simulation.step_count,
+                        current_seed,
+                        simulation.engine.rng,
+                        recorder,
+                    )
+                    print(
+                        f"Snapshot salvo no passo {simulation.step_count} "
+                        f"com {recorder.steps} passos de histórico."
+                    )
+                if event.key == pygame.K_F9:
+                    try:
+                        replay = load_snapshot(SNAPSHOT_FILE)
+                    except FileNotFoundError:
+                        print(f"Arquivo '{SNAPSHOT_FILE}' não encontrado.")
+                    else:
+                        if replay.seed is not None:
+                            current_seed = replay.seed
+                        terrain_grid = replay.grid()
+                        show_step(terrain_grid, replay.step)
+                        if replay.rng_state is not None:
+                            simulation.engine.rng = replay.rng()
+                        replay_step = replay.step
+                if (
+                    event.key in (pygame.K_LEFT, pygame.K_RIGHT)
+                    and replay is not None
+                    and replay.history is not None
+                ):
+                    delta = -1 if event.key == pygame.K_LEFT else 1
+                    if event.mod & pygame.KMOD_SHIFT:
+                        delta *= REPLAY_FAST_STEPS
+                    replay_step = min(
+                        max(replay_step + delta, replay.first_step), replay.last_step
+                    )
+                    terrain_grid = replay.grid_at(replay_step)
+                    show_step(terrain_grid, replay_step)
+                if event.key == pygame.K_z and event.mod & pygame.KMOD_CTRL:
+                    for region in brushes.undo():
+                        renderer.mark_dirty(region)
+                        recorder.terrain_changed(region)
+                if event.key == pygame.K_b:
+                    brushes.cycle_shape()
+                if event.key == pygame.K_g:
+                    brushes.cycle_falloff()
+                if event.key == pygame.K_h:
+                    show_stats = not show_stats
+                if event.key == pygame.K_HOME:
+                    camera.reset()
+                if event.key == pygame.K_t:
+                    scheduler.turbo = not scheduler.turbo
+                if event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                    scheduler.faster()
+                if event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                    scheduler.slower()
+                if event.key == pygame.K_F1:
+                    current_brush = BRUSH_FIRE
+                if event.key == pygame.K_F2:
+                    current_brush = BRUSH_ELEVATION
+                if event.key == pygame.K_F3:
+                    current_brush = BRUSH_MOISTURE
+
+        mouse_pressed = pygame.mouse.get_pressed()
+        # O botão do meio arrasta a vista e não aplica pincel
+        if any(mouse_pressed) and not mouse_pressed[1]:
+            pixel_x, pixel_y = pygame.mouse.get_pos()
+            grid_x, grid_y = renderer.screen_to_grid(pixel_x, pixel_y)
+            region = None
+            sign = 1 if mouse_pressed[0] else -1 if mouse_pressed[2] else 0
+            if current_brush == BRUSH_FIRE and mouse_pressed[0]:
+                region = brushes.paint_fire(grid_x, grid_y)
+            elif current_brush == BRUSH_ELEVATION and sign:
+                region = brushes.paint_layer(
+                    CELL_ELEVATION_LAYER,
+                    grid_x,
+                    grid_y,
+                    sign * ELEVATION_STEP,
+                    MIN_ELEVATION,
+                    config.max_elevation,
+                )
+            elif current_brush == BRUSH_MOISTURE and sign:
+                region = brushes.paint_layer(
+                    CELL_MOISTURE_LAYER,
+                    grid_x,
+                    grid_y,
+                    sign * MOISTURE_STEP,
+                    MIN_MOISTURE,
+                    MAX_MOISTURE,
+                )
+            if region is not None:
+                renderer.mark_dirty(region)
+                recorder.terrain_changed(region)
+        else:
+            brushes.end_stroke()
+
+        scheduler.update(dt, simulation_running)
+        terrain_grid = simulation.grid
+
+        screen.fill(COLOR_GROUND)
+        renderer.draw(screen, terrain_grid)
+        draw_ui(screen, font, current_brush, current_seed, brushes)
+        scheduler.draw_hud(screen, font, (10, 70), COLOR_UI_TEXT)
+        if replay is not None and replay.history is not None:
+            text_replay = (
+                f"Replay: passo {replay_step} de {replay.first_step}.."
+                f"{replay.last_step} | [←/→] navegar, SHIFT x{REPLAY_FAST_STEPS}"
+            )
+            screen.blit(font.render(text_replay, True, COLOR_UI_TEXT), (10, 90))
+        if show_stats:
+            simulation.stats.draw_hud(screen, font, (10, 115), COLOR_UI_TEXT)
+
+        pygame.display.flip()
+
+    pygame.quit()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m fire_automata.viewer",
+        description="Visualizador interativo do autômato de incêndio.",
+    )
+    parser.add_argument("name", nargs="?", default="3d", choices=list(CONFIGS))
+    parser.add_argument(
+        "--size",
+        nargs=2,
+        type=int,
+        metavar=("COLS", "ROWS"),
+        help="tamanho da grade (padrão: o que cabe na janela)",
+    )
+    parser.add_argument(
+        "--terrain",
+        choices=TERRAIN_MODES,
+        help="modo de geração do terreno (padrão: o da variante)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=sorted(ENGINES),
+        help="motor de passo (padrão: o da variante)",
+    )
+    add_kernel_arguments(parser)
+    args = parser.parse_args(argv)
+
+    config = with_kernel_arguments(CONFIGS[args.name], args)
+    if args.size is not None:
+        cols, rows = args.size
+        config = dataclasses.replace(config, grid_cols=cols, grid_rows=rows)
+    if args.terrain is not None:
+        config = dataclasses.replace(config, terrain_mode=args.terrain)
+    if args.engine is not None:
+        config = dataclasses.replace(config, step_engine=args.engine)
+    run(config)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Campos macroscópicos (densidade e momento) do gás de rede FHP.
+
+Cada passo é reduzido a somas por bloco de k×k hexágonos, e uma janela
+circular com os últimos passos mantém as somas acumuladas. Amostrar os campos
+custa uma divisão por bloco, sem voltar à rede. Com `MotorFHPCompactado`, as
+somas saem direto dos planos de bits (`acumular_planos`), sem desempacotar.
+"""
+
+import numpy as np
+
+from motor_fhp import PALAVRA, VETORES_DIRECAO, Particula
+
+BLOCO_PADRAO = 4
+JANELA_PADRAO = 20
+
+
+# As componentes de `VETORES_DIRECAO` são múltiplos de 1/2 em x e de
+# sqrt(3)/2 em y; as somas são feitas em inteiros nessas unidades, o que
+# deixa a janela exata (somar e subtrair floats acumularia erro).
+UNIDADES_MOMENTO = np.array([1.0, 0.5, np.sqrt(3) / 2])
+
+
+def _tabelas_por_estado():
+    """Densidade e momento (x, y) de cada um dos 64 estados de uma célula."""
+    estados = np.arange(64)
+    tabelas = np.zeros((3, 64), dtype=np.int8)
+    for particula in Particula:
+        presente = (estados & particula) != 0
+        vetor = VETORES_DIRECAO[particula]
+        tabelas[0] += presente
+        tabelas[1] += presente * round(vetor[0] / UNIDADES_MOMENTO[1])
+        tabelas[2] += presente * round(vetor[1] / UNIDADES_MOMENTO[2])
+    return tabelas
+
+
+TABELAS_POR_ESTADO = _tabelas_por_estado()
+# Densidade e momento (x, y) de uma partícula de cada direção, na ordem dos bits
+TABELAS_POR_DIRECAO = TABELAS_POR_ESTADO[:, [int(p) for p in Particula]]
+
+
+def _contar_bits_tabela(palavras):
+    """Bits ligados em cada palavra uint64, por uma tabela de 256 bytes."""
+    bytes_ = np.ascontiguousarray(palavras, dtype="<u8").view(np.uint8)
+    return _BITS_POR_BYTE[bytes_].reshape(*palavras.shape, 8).sum(axis=-1)
+
+
+_BITS_POR_BYTE = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(
+    axis=1, dtype=np.uint8
+)
+# `bitwise_count` (popcount) só existe a partir do NumPy 2.0
+_contar_bits = getattr(np, "bitwise_count", _contar_bits_tabela)
+
+
+class CamposMacroscopicos:
+    """Médias de densidade e momento por bloco e por janela de tempo.
+
+    Os blocos cobrem a rede a partir do canto (0, 0); linhas e colunas que
+    sobram quando o tamanho não é múltiplo de `bloco` ficam de fora. O eixo y
+    do momento segue `VETORES_DIRECAO` (positivo para cima).
+    """
+
+    def __init__(self, linhas, colunas, bloco=BLOCO_PADRAO, janela=JANELA_PADRAO):
+        self.bloco = bloco
+        self.janela = janela
+        self.forma = (linhas // bloco, colunas // bloco)
+        self._inicios_linhas = np.arange(0, self.forma[0] * bloco, bloco)
+        self._inicios_colunas = np.arange(0, self.forma[1] * bloco, bloco)
+        self._preparar_trechos()
+        self.limpar()
+
+    def _preparar_trechos(self):
+        """Trechos (palavra, máscara) de cada bloco de colunas nos planos de bits.
+
+        Um bloco que cruza a fronteira entre palavras vira mais de um trecho;
+        os blocos com menos trechos são completados com máscaras vazias.
+        """
+        trechos = []
+        for inicio in self._inicios_colunas.tolist():
+            fim = inicio + self.bloco
+            trechos.append([])
+            for palavra in range(inicio // PALAVRA, (fim - 1) // PALAVRA + 1):
+                primeiro = max(inicio, palavra * PALAVRA) - palavra * PALAVRA
+                ultimo = min(fim, (palavra + 1) * PALAVRA) - palavra * PALAVRA
+                mascara = ((1 << ultimo) - 1) ^ ((1 << primeiro) - 1)
+                trechos[-1].append((palavra, mascara))
+        largura = max(map(len, trechos), default=1)
+        for lista in trechos:
+            lista += [(0, 0)] * (largura - len(lista))
+        trechos = np.array(trechos, dtype=object).reshape(len(trechos), largura, 2)
+        self._palavras_trechos = trechos[..., 0].astype(np.intp)
+        self._mascaras_trechos = trechos[..., 1].astype(np.uint64)
+
+    def limpar(self):
+        # Somas por bloco de cada passo da janela: (janela, grandeza, *forma)
+        self._historico = np.zeros((self.janela, 3, *self.forma), dtype=np.int64)
+        self._soma = np.zeros((3, *self.forma), dtype=np.int64)
+        self._posicao = 0
+        self.passos = 0
+
+    def _somas_por_bloco(self, estados):
+        k = self.bloco
+        linhas, colunas = self.forma
+        recorte = estados[: linhas * k, : colunas * k]
+        somas = np.empty((3, linhas, colunas), dtype=np.int64)
+        for grandeza, tabela in enumerate(TABELAS_POR_ESTADO):
+            valores = np.take(tabela, recorte)
+            parcial = np.add.reduceat(
+                valores, self._inicios_colunas, axis=1, dtype=np.int32
+            )
+            somas[grandeza] = np.add.reduceat(parcial, self._inicios_linhas, axis=0)
+        return somas
+
+    def _somas_por_bloco_planos(self, planos):
+        k = self.bloco
+        linhas, colunas = self.forma
+        trechos = planos[:, : linhas * k, self._palavras_trechos]
+        trechos &= self._mascaras_trechos
+        # Partículas de cada direção por bloco: trechos, depois linhas do bloco
+        contagens = _contar_bits(trechos).sum(axis=-1, dtype=np.int32)
+        contagens = contagens.reshape(len(Particula), linhas, k, colunas).sum(axis=2)
+        return np.tensordot(TABELAS_POR_DIRECAO, contagens, axes=1).astype(np.int64)
+
+    def acumular(self, estados):
+        """Inclui o estado atual da rede na janela, descartando o mais antigo."""
+        self._incluir(self._somas_por_bloco(estados))
+
+    def acumular_planos(self, planos):
+        """Como `acumular`, a partir dos planos de bits de `MotorFHPCompactado`.
+
+        Cada bloco é contado com popcount nas palavras uint64, direção por
+        direção, sem desempacotar a rede em um array de estados.
+        """
+        if not all(self.forma):
+            self._incluir(np.zeros((3, *self.forma), dtype=np.int64))
+            return
+        self._incluir(self._somas_por_bloco_planos(planos))
+
+    def _incluir(self, somas):
+        self._soma -= self._historico[self._posicao]
+        self._soma += somas
+        self._historico[self._posicao] = somas
+        self._posicao = (self._posicao + 1) % self.janela
+        self.passos += 1
+
+    @property
+    def passos_na_janela(self):
+        return min(self.passos, self.janela)
+
+    def amostrar(self):
+        """Campos médios por célula na janela atual.
+
+        Devolve `densidade` (partículas por célula), `momento_x`,
+        `momento_y` e a velocidade `velocidade_x`, `velocidade_y`
+        (momento / densidade, zero onde não há partículas).
+        """
+        amostras = max(self.passos_na_janela, 1) * self.bloco * self.bloco
+        densidade, momento_x, momento_y = (
+            self._soma * UNIDADES_MOMENTO[:, None, None] / amostras
+        )
+        ocupado = densidade > 0
+        velocidade_x = np.divide(
+            momento_x, densidade, out=np.zeros_like(momento_x), where=ocupado
+        )
+        velocidade_y = np.divide(
+            momento_y, densidade, out=np.zeros_like(momento_y), where=ocupado
+        )
+        return {
+            "densidade": densidade,
+            "momento_x": momento_x,
+            "momento_y": momento_y,
+            "velocidade_x": velocidade_x,
+            "velocidade_y": velocidade_y,
+        }
+
+    def exportar(self, caminho):
+        """Salva a amostra atual e os parâmetros da média em um `.npz`."""
+        np.savez_compressed(
+            caminho,
+            bloco=self.bloco,
+            janela=self.janela,
+            passos_na_janela=self.passos_na_janela,
+            **self.amostrar(),
+        )
@@ -0,0 +1,366 @@
+"""Motor vetorizado do gás de rede FHP da simulação hexagonal.
+
+O estado da rede é um array `uint8` (linhas, colunas) com um bit por
+`Particula`. Cada passo injeta as fontes, aplica a colisão com uma tabela de
+64 entradas e propaga as seis direções com fatias deslocadas, separadas por
+colunas pares e ímpares. Nenhuma etapa percorre as células em Python.
+
+`MotorFHPCompactado` faz o mesmo passo com um plano de bits por direção.
+"""
+
+from enum import IntEnum
+
+import numpy as np
+
+
+class Particula(IntEnum):
+    E = 1 << 0  # Leste
+    SE = 1 << 1  # Sudeste
+    SW = 1 << 2  # Sudoeste
+    W = 1 << 3  # Oeste
+    NW = 1 << 4  # Noroeste
+    NE = 1 << 5  # Nordeste
+
+
+VETORES_DIRECAO = {
+    Particula.E: (1, 0),
+    Particula.SE: (0.5, -np.sqrt(3) / 2),
+    Particula.SW: (-0.5, -np.sqrt(3) / 2),
+    Particula.W: (-1, 0),
+    Particula.NW: (-0.5, np.sqrt(3) / 2),
+    Particula.NE: (0.5, np.sqrt(3) / 2),
+}
+
+# Vizinho (dlinha, dcoluna) de cada direção, na ordem dos bits de `Particula`
+DESLOCAMENTOS_COLUNA_PAR = ((0, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0))
+DESLOCAMENTOS_COLUNA_IMPAR = ((0, 1), (1, 1), (1, 0), (0, -1), (-1, 0), (-1, 1))
+
+PARES_REVERSIVEIS = (
+    (52, 25),
+    (50, 41),
+    (38, 11),
+    (22, 13),
+    (37, 19),
+    (26, 44),
+    (21, 42),
+    (27, 45),
+    (45, 54),
+    (54, 27),
+    (36, 18),
+    (18, 9),
+    (9, 36),
+)
+
+# Partículas criadas por passo em cada fonte
+INJECAO_FONTE = Particula.SE | Particula.SW
+
+TODAS_AS_DIRECOES = 0x3F
+
+
+def criar_tabela_colisao(pares=PARES_REVERSIVEIS):
+    """Tabela com o estado de cada célula após a colisão.
+
+    Os pares são aplicados na mesma ordem do dicionário da versão original,
+    então quando um estado aparece em dois pares vale o último.
+    """
+    tabela = np.arange(64, dtype=np.uint8)
+    for a, b in pares:
+        tabela[a] = b
+        tabela[b] = a
+    return tabela
+
+
+def _fatias_deslocadas(linhas, colunas, paridade, dlinha, dcoluna):
+    """Fatias (origem, destino) das colunas de uma paridade deslocadas.
+
+    Só entram as células cujo vizinho cai dentro da rede.
+    """
+    linha_inicio, linha_fim = max(0, -dlinha), linhas - max(0, dlinha)
+    coluna_inicio = paridade if paridade + dcoluna >= 0 else paridade + 2
+    coluna_fim = colunas - max(0, dcoluna)
+    origem = (
+        slice(linha_inicio, linha_fim),
+        slice(coluna_inicio, coluna_fim, 2),
+    )
+    destino = (
+        slice(linha_inicio + dlinha, linha_fim + dlinha),
+        slice(coluna_inicio + dcoluna, coluna_fim + dcoluna, 2),
+    )
+    return origem, destino
+
+
+class MotorFHP:
+    """Rede FHP com estados, obstáculos e fontes em arrays NumPy.
+
+    `obstaculos` e `fontes` podem ser editados diretamente, desde que
+    `atualizar_mascaras` seja chamado em seguida; os métodos `alternar_*`
+    já fazem isso.
+    """
+
+    def __init__(self, linhas, colunas, pares=PARES_REVERSIVEIS):
+        self.linhas = linhas
+        self.colunas = colunas
+        self.tabela_colisao = criar_tabela_colisao(pares)
+        self._propagacao = [
+            (np.uint8(particula), *_fatias_deslocadas(linhas, colunas, paridade, *d))
+            for paridade, deslocamentos in enumerate(
+                (DESLOCAMENTOS_COLUNA_PAR, DESLOCAMENTOS_COLUNA_IMPAR)
+            )
+            for particula, d in zip(Particula, deslocamentos)
+        ]
+        forma = (linhas, colunas)
+        self._colididos = np.empty(forma, dtype=np.uint8)
+        self._livres = np.empty(forma, dtype=np.uint8)
+        self._auxiliar = np.empty(forma, dtype=np.uint8)
+        self._proximo = np.empty(forma, dtype=np.uint8)
+        self.limpar()
+
+    def limpar(self):
+        forma = (self.linhas, self.colunas)
+        self.estados = np.zeros(forma, dtype=np.uint8)
+        self.obstaculos = np.zeros(forma, dtype=bool)
+        self.fontes = np.zeros(forma, dtype=bool)
+        self.atualizar_mascaras()
+
+    def alternar_obstaculo(self, r, c):
+        self.obstaculos[r, c] = not self.obstaculos[r, c]
+        self.atualizar_mascaras()
+
+    def alternar_fonte(self, r, c):
+        self.fontes[r, c] = not self.fontes[r, c]
+        self.atualizar_mascaras()
+
+    def atualizar_mascaras(self):
+        """Recalcula as máscaras derivadas de `obstaculos` e `fontes`.
+
+        `_bloqueio` tem, em cada célula, o bit das direções cujo vizinho está
+        fora da rede ou é obstáculo; essas partículas voltam na direção oposta.
+        """
+        self._injecao = np.where(self.fontes, np.uint8(INJECAO_FONTE), np.uint8(0))
+        self._bloqueio = np.full(
+            (self.linhas, self.colunas), TODAS_AS_DIRECOES, dtype=np.uint8
+        )
+        for bit, origem, destino in self._propagacao:
+            livre = ~self.obstaculos[destino]
+            self._bloqueio[origem] ^= livre.astype(np.uint8) * bit
+        self._nao_bloqueio = self._bloqueio ^ np.uint8(TODAS_AS_DIRECOES)
+
+    def passo(self):
+        """Avança a rede um passo: injeção, colisão e propagação."""
+        estados = self.estados
+        colididos = self._colididos
+        livres = self._livres
+        proximo = self._proximo
+
+        np.bitwise_or(estados, self._injecao, out=estados)
+        np.take(self.tabela_colisao, estados, out=colididos, mode="clip")
+
+        # Rebote: as partículas bloqueadas invertem a direção (bit i -> i + 3)
+        np.bitwise_and(colididos, self._bloqueio, out=livres)
+        np.left_shift(livres, 3, out=proximo)
+        np.right_shift(livres, 3, out=self._auxiliar)
+        np.bitwise_or(proximo, self._auxiliar, out=proximo)
+        np.bitwise_and(proximo, TODAS_AS_DIRECOES, out=proximo)
+
+        # Propagação das partículas livres para o vizinho de cada direção
+        np.bitwise_and(colididos, self._nao_bloqueio, out=livres)
+        for bit, origem, destino in self._propagacao:
+            proximo[destino] |= livres[origem] & bit
+
+        self._proximo = estados
+        self.estados = proximo
+        return proximo
+
+
+PALAVRA = 64  # Colunas por palavra uint64 nos planos de bits
+_UM = np.uint64(1)
+_ULTIMO_BIT = np.uint64(PALAVRA - 1)
+_COLUNAS_PARES = np.uint64(0x5555555555555555)
+_COLUNAS_IMPARES = np.uint64(0xAAAAAAAAAAAAAAAA)
+
+
+def empacotar(mascara):
+    """Converte um array booleano (linhas, colunas) em palavras uint64.
+
+    O bit j da palavra w guarda a coluna `PALAVRA * w + j`; as colunas de
+    preenchimento da última palavra ficam em zero.
+    """
+    linhas, colunas = mascara.shape
+    palavras = -(-colunas // PALAVRA)
+    preenchida = np.zeros((linhas, palavras * PALAVRA), dtype=bool)
+    preenchida[:, :colunas] = mascara
+    bytes_ = np.packbits(preenchida, axis=1, bitorder="little")
+    return bytes_.view("<u8").astype(np.uint64)
+
+
+def desempacotar(plano, colunas):
+    """Inverso de `empacotar`."""
+    bytes_ = np.ascontiguousarray(plano, dtype="<u8").view(np.uint8)
+    return np.unpackbits(bytes_, axis=1, count=colunas, bitorder="little").astype(bool)
+
+
+def somar_deslocado(destino, plano, dlinha, dcoluna):
+    """Faz `destino |= plano` deslocado de (dlinha, dcoluna) células.
+
+    O deslocamento de coluna é um shift de 1 bit com o bit de transporte da
+    palavra vizinha; o que sai da rede é descartado.
+    """
+    linhas = plano.shape[0]
+    inicio, fim = max(0, -dlinha), linhas - max(0, dlinha)
+    origem = plano[inicio:fim]
+    alvo = destino[inicio + dlinha : fim + dlinha]
+    if dcoluna == 0:
+        alvo |= origem
+    elif dcoluna == 1:
+        alvo |= origem << _UM
+        alvo[:, 1:] |= origem[:, :-1] >> _ULTIMO_BIT
+    else:
+        alvo |= origem >> _UM
+        alvo[:, :-1] |= origem[:, 1:] << _ULTIMO_BIT
+
+
+def _termos_colisao(tabela):
+    """(estado, bits que trocam) de cada estado alterado pela tabela."""
+    return [
+        (estado, int(tabela[estado]) ^ estado)
+        for estado in range(64)
+        if tabela[estado] != estado
+    ]
+
+
+class MotorFHPCompactado:
+    """Rede FHP com um plano de bits por `Particula` (bit-slicing).
+
+    Cada direção é um array uint64 (linhas, palavras) com 64 colunas por
+    palavra, e obstáculos e fontes também ficam em planos de bits. A colisão
+    vira uma fórmula booleana sobre palavras inteiras, gerada a partir da
+    mesma tabela de `MotorFHP`, e a propagação vira shifts de palavras. O
+    resultado é idêntico ao de `MotorFHP`.
+
+    `estados`, `obstaculos` e `fontes` são convertidos para arrays comuns na
+    leitura e na escrita, para desenho e exportação.
+    """
+
+    def __init__(self, linhas, colunas, pares=PARES_REVERSIVEIS):
+        self.linhas = linhas
+        self.colunas = colunas
+        self.tabela_colisao = criar_tabela_colisao(pares)
+        self._termos_colisao = _termos_colisao(self.tabela_colisao)
+        self._validos = empacotar(np.ones((linhas, colunas), dtype=bool))
+        self.limpar()
+
+    def _plano_vazio(self):
+        return np.zeros_like(self._validos)
+
+    def limpar(self):
+        self.planos = np.zeros((len(Particula), *self._validos.shape), np.uint64)
+        self._proximos = np.zeros_like(self.planos)
+        self._obstaculos = self._plano_vazio()
+        self._fontes = self._plano_vazio()
+        self.atualizar_mascaras()
+
+    @property
+    def estados(self):
+        estados = np.zeros((self.linhas, self.colunas), dtype=np.uint8)
+        for particula, plano in zip(Particula, self.planos):
+            estados[desempacotar(plano, self.colunas)] |= np.uint8(particula)
+        return estados
+
+    @estados.setter
+    def estados(self, estados):
+        for indice, particula in enumerate(Particula):
+            self.planos[indice] = empacotar((estados & particula) != 0)
+
+    @property
+    def obstaculos(self):
+        return desempacotar(self._obstaculos, self.colunas)
+
+    @obstaculos.setter
+    def obstaculos(self, obstaculos):
+        self._obstaculos = empacotar(obstaculos)
+        self.atualizar_mascaras()
+
+    @property
+    def fontes(self):
+        return desempacotar(self._fontes, self.colunas)
+
+    @fontes.setter
+    def fontes(self, fontes):
+        self._fontes = empacotar(fontes)
+
+    def _alternar(self, plano, r, c):
+        palavra, bit = divmod(c, PALAVRA)
+        plano[r, palavra] ^= _UM << np.uint64(bit)
+
+    def alternar_obstaculo(self, r, c):
+        self._alternar(self._obstaculos, r, c)
+        self.atualizar_mascaras()
+
+    def alternar_fonte(self, r, c):
+        self._alternar(self._fontes, r, c)
+
+    def atualizar_mascaras(self):
+        """Recalcula os planos de bloqueio a partir dos obstáculos.
+
+        Uma direção está livre quando o vizinho naquela direção é uma célula
+        válida e não é obstáculo; o vizinho é trazido de volta com o
+        deslocamento oposto, separado por colunas pares e ímpares.
+        """
+        livres = self._validos & ~self._obstaculos
+        self._bloqueio = np.empty_like(self.planos)
+        for indice in range(len(Particula)):
+            livre = self._plano_vazio()
+            for deslocamentos, paridade in (
+                (DESLOCAMENTOS_COLUNA_PAR, _COLUNAS_PARES),
+                (DESLOCAMENTOS_COLUNA_IMPAR, _COLUNAS_IMPARES),
+            ):
+                dlinha, dcoluna = deslocamentos[indice]
+                vizinho = self._plano_vazio()
+                somar_deslocado(vizinho, livres, -dlinha, -dcoluna)
+                livre |= vizinho & paridade
+            self._bloqueio[indice] = self._validos & ~livre
+
+    def _colidir(self):
+        """Aplica a tabela de colisão como fórmula booleana sobre os planos."""
+        planos = self.planos
+        negados = ~planos
+        trocas = np.zeros_like(planos)
+        for estado, troca in self._termos_colisao:
+            # Palavras com 1 nas células que estão exatamente neste estado
+            presente = None
+            for indice in range(len(Particula)):
+                fator = planos[indice] if estado >> indice & 1 else negados[indice]
+                presente = fator.copy() if presente is None else presente & fator
+            for indice in range(len(Particula)):
+                if troca >> indice & 1:
+                    trocas[indice] |= presente
+        planos ^= trocas
+
+    def passo(self):
+        """Avança a rede um passo: injeção, colisão e propagação."""
+        planos = self.planos
+        for indice, particula in enumerate(Particula):
+            if INJECAO_FONTE & particula:
+                planos[indice] |= self._fontes
+        self._colidir()
+
+        proximos = self._proximos
+        proximos[:] = 0
+        direcoes = len(Particula)
+        for indice in range(direcoes):
+            # Rebote para a direção oposta (i + 3)
+            proximos[(indice + 3) % direcoes] |= planos[indice] & self._bloqueio[indice]
+            livres = planos[indice] & ~self._bloqueio[indice]
+            for deslocamentos, paridade in (
+                (DESLOCAMENTOS_COLUNA_PAR, _COLUNAS_PARES),
+                (DESLOCAMENTOS_COLUNA_IMPAR, _COLUNAS_IMPARES),
+            ):
+                somar_deslocado(
+                    proximos[indice], livres & paridade, *deslocamentos[indice]
+                )
+
+        self._proximos = planos
+        self.planos = proximos
+
+
+MOTORES = {"bytes": MotorFHP, "bits": MotorFHPCompactado}
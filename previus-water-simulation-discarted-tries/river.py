@@ -1,30 +1,174 @@
-"""Simulação de entulhos em um rio com base em um modelo de autômato celular."""
+"""Simulação de entulhos em um rio com base em um modelo de autômato celular.
+
+O rio corre ao longo do comprimento: a linha 0 é a montante e a última linha
+deságua para fora da grade. Cada célula guarda quantas unidades de entulho
+contém, até `capacity`. A cada passo o entulho de uma célula desce para a
+célula seguinte da mesma coluna, limitado pela vazão da coluna e pelo espaço
+livre a jusante; células cheias retêm o que vem de cima e o represamento sobe
+o rio.
+
+Com `path`, a grade fica em um `numpy.memmap` e cada passo percorre o rio em
+blocos de `chunk_rows` linhas, então o comprimento pode passar da memória
+disponível. As estatísticas (histograma, total por bloco, vazão de saída) são
+acumuladas bloco a bloco durante o próprio passo.
+"""
 
 import numpy as np
-import matplotlib.pyplot as plt
+
+DEFAULT_CAPACITY = 8  # Unidades de entulho por célula
+DEFAULT_MAX_RATE = 3  # Unidades que descem por passo no centro do canal
+DEFAULT_CHUNK_ROWS = 65536
+
+
+def flow_profile(width, max_rate=DEFAULT_MAX_RATE):
+    """Vazão de cada coluna: parabólica, máxima no centro e 1 nas margens."""
+    if width == 1:
+        return np.array([max_rate], dtype=np.int32)
+    position = np.linspace(-1.0, 1.0, width)
+    rates = np.round(max_rate * (1.0 - position**2))
+    return np.maximum(rates, 1).astype(np.int32)
+
 
 class River:
-    def __init__(self, length, width, river_deformation="L"):
+    def __init__(
+        self,
+        length,
+        width,
+        river_deformation="L",
+        path=None,
+        capacity=DEFAULT_CAPACITY,
+        max_rate=DEFAULT_MAX_RATE,
+        inflow=0,
+        chunk_rows=DEFAULT_CHUNK_ROWS,
+    ):
         self.length = length
         self.width = width
         self.river_deformation = river_deformation
-        self.grid = np.zeros((length, width), dtype=int)
-        
+        self.capacity = capacity
+        self.chunk_rows = chunk_rows
+        self.rates = flow_profile(width, max_rate)
+        # Entulho que chega pela linha 0 a cada passo, por coluna
+        self.inflow = np.broadcast_to(np.asarray(inflow, dtype=np.int32), (width,))
+        if path is None:
+            self.grid = np.zeros((length, width), dtype=np.int32)
+        else:
+            self.grid = np.memmap(
+                path, dtype=np.int32, mode="w+", shape=(length, width)
+            )
+        self.steps = 0
+        self.outflow_history = []
+        self._reset_statistics()
+
+    def _chunks(self):
+        for start in range(0, self.length, self.chunk_rows):
+            yield start, min(start + self.chunk_rows, self.length)
+
+    def _reset_statistics(self):
+        self.histogram = np.zeros(self.capacity + 1, dtype=np.int64)
+        chunks = len(range(0, self.length, self.chunk_rows))
+        self.chunk_totals = np.zeros(chunks, dtype=np.int64)
+
+    def _accumulate_statistics(self, index, block):
+        self.histogram += np.bincount(block.ravel(), minlength=self.capacity + 1)
+        self.chunk_totals[index] = block.sum()
+
+    def update_statistics(self):
+        """Recalcula as estatísticas com uma passada em blocos pela grade."""
+        self._reset_statistics()
+        for index, (start, stop) in enumerate(self._chunks()):
+            self._accumulate_statistics(index, np.asarray(self.grid[start:stop]))
+
+    @property
+    def total_debris(self):
+        return int(self.chunk_totals.sum())
+
+    @property
+    def jammed_cells(self):
+        """Células cheias, que não aceitam mais entulho de montante."""
+        return int(self.histogram[self.capacity])
+
     def initialize_river(self):
         """Inicializa o rio com uma deformação específica."""
         if self.river_deformation == "L":
             self.grid[:, 0] = 1  # Deformação em forma de L
         elif self.river_deformation == "U":
             self.grid[0, :] = 1
-            
-    def show_river(self):
-        """Exibe o estado atual do rio."""
-        ax = plt.subplots(2,2, figsize=(16, 12))
-        ax[0, 0].imshow(self.grid, cmap="Blues")
+        self.update_statistics()
+
+    def dump_debris(self, start, stop, amount, columns=slice(None)):
+        """Despeja `amount` unidades por célula nas linhas [start, stop).
+
+        O que passa de `capacity` é descartado.
+        """
+        block = self.grid[start:stop, columns]
+        self.grid[start:stop, columns] = np.minimum(block + amount, self.capacity)
+        self.update_statistics()
+
+    def step(self):
+        """Avança um passo de transporte, bloco a bloco, rio abaixo.
+
+        `moved[i]`, o que desce da linha i, depende só das linhas i e i + 1 do
+        estado anterior; cada bloco lê uma linha a mais do bloco seguinte, que
+        ainda não foi reescrito, e repassa ao próximo bloco o que sai da sua
+        última linha.
+        """
+        capacity = self.capacity
+        incoming = None
+        self._reset_statistics()
+        for index, (start, stop) in enumerate(self._chunks()):
+            window = np.array(self.grid[start : min(stop + 1, self.length)])
+            current = window[: stop - start]
+            room = np.empty_like(current)
+            room[: len(window) - 1] = capacity - window[1:]
+            if stop == self.length:
+                room[-1] = capacity  # A última linha deságua livremente
+            moved = np.minimum(np.minimum(current, self.rates), room)
+
+            if incoming is None:
+                incoming = np.minimum(self.inflow, capacity - current[0] + moved[0])
+            current -= moved
+            current[0] += incoming
+            current[1:] += moved[:-1]
+            incoming = moved[-1]
+
+            self.grid[start:stop] = current
+            self._accumulate_statistics(index, current)
+        outflow = int(incoming.sum())
+
+        self.steps += 1
+        self.outflow_history.append(outflow)
+        return outflow
+
+    def run(self, steps):
+        for _ in range(steps):
+            self.step()
+        if isinstance(self.grid, np.memmap):
+            self.grid.flush()
+
+    def show_river(self, max_rows=2000):
+        """Exibe o estado atual do rio.
+
+        Rios longos são mostrados com uma linha a cada `length // max_rows`.
+        """
+        import matplotlib.pyplot as plt
+
+        stride = max(1, self.length // max_rows)
+        fig, ax = plt.subplots(2, 2, figsize=(16, 12))
+        ax[0, 0].imshow(
+            self.grid[::stride], cmap="Blues", aspect="auto", vmin=0, vmax=self.capacity
+        )
         ax[0, 0].set_title("Estado do Rio")
-        ax[0, 1].hist(self.grid.ravel(), bins=10, color="blue", alpha=0.7)
+        ax[0, 1].bar(
+            np.arange(self.capacity + 1), self.histogram, color="blue", alpha=0.7
+        )
         ax[0, 1].set_title("Distribuição de Entulhos")
-        
-        ax.legend()
-        ax.grid(True, alpha=0.3)
-        plt.show()
\ No newline at end of file
+        ax[1, 0].plot(
+            np.arange(len(self.chunk_totals)) * self.chunk_rows, self.chunk_totals
+        )
+        ax[1, 0].set_title("Entulho por Trecho do Rio")
+        ax[1, 1].plot(self.outflow_history)
+        ax[1, 1].set_title("Entulho que Sai do Rio por Passo")
+
+        for axis in (ax[0, 1], ax[1, 0], ax[1, 1]):
+            axis.grid(True, alpha=0.3)
+        plt.show()
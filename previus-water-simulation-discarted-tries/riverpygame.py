@@ -2,13 +2,15 @@ import pygame
 import sys
 import numpy as np
 import math
-from enum import IntEnum
-from functools import lru_cache
+
+from campos_fhp import CamposMacroscopicos
+from motor_fhp import MOTORES, VETORES_DIRECAO, MotorFHPCompactado, Particula
 
 # =============================================================================
 # 1. CONFIGURAÇÃO E CONSTANTES GLOBAIS
 # =============================================================================
 GRID_WIDTH, GRID_HEIGHT, HEX_SIZE, FPS = 20, 20, 20, 15
+TIPO_MOTOR = "bits"  # "bytes" (uint8 por célula) ou "bits" (um plano por direção)
 TITULO_JANELA = "Autômato Celular de Gás de Rede (FHP Minimalista)"
 SCREEN_WIDTH = int(GRID_WIDTH * HEX_SIZE * 1.5 + HEX_SIZE)
 SCREEN_HEIGHT = int(GRID_HEIGHT * HEX_SIZE * math.sqrt(3) + HEX_SIZE)
@@ -21,26 +23,13 @@ COR_HEX_FONTE = (100, 120, 150)  # Fontes azul suave
 COR_PARTICULA = (130, 170, 220, 180)  # Azul claro com transparência alfa
 COR_CONTORNO_HEX = (80, 90, 100)  # Contorno sutil
 COR_TEXTO = (200, 210, 220)  # Texto cinza claro
+COR_FLUXO = (240, 200, 120)  # Setas do campo médio
 
-
-# --- Definições do Autômato ---
-class Particula(IntEnum):
-    E = 1 << 0  # Leste
-    SE = 1 << 1  # Sudeste
-    SW = 1 << 2  # Sudoeste
-    W = 1 << 3  # Oeste
-    NW = 1 << 4  # Noroeste
-    NE = 1 << 5  # Nordeste
-
-
-VETORES_DIRECAO = {
-    Particula.E: (1, 0),
-    Particula.SE: (0.5, -np.sqrt(3) / 2),
-    Particula.SW: (-0.5, -np.sqrt(3) / 2),
-    Particula.W: (-1, 0),
-    Particula.NW: (-0.5, np.sqrt(3) / 2),
-    Particula.NE: (0.5, np.sqrt(3) / 2),
-}
+# --- Campo médio ---
+BLOCO_MEDIA = 4  # Hexágonos por lado de cada bloco
+JANELA_MEDIA = 20  # Passos na média temporal
+ESCALA_SETA = 0.9  # Comprimento da seta com velocidade 1, em blocos
+ARQUIVO_CAMPOS = "campos_fhp.npz"
 
 
 # =============================================================================
@@ -58,44 +47,13 @@ class Simulacao:
         self.rodando = True
         self.simulacao_iniciada = False
         self.delay_mouse = 0
-        self.limpar_grade()
-
-        self.MAPA_DIRECOES_OPOSTAS = self._criar_mapa_opostos()
-        self.REGRAS_DE_COLISAO = self._criar_regras_colisao()
+        self.motor = MOTORES[TIPO_MOTOR](GRID_HEIGHT, GRID_WIDTH)
+        self.campos = CamposMacroscopicos(
+            GRID_HEIGHT, GRID_WIDTH, BLOCO_MEDIA, JANELA_MEDIA
+        )
+        self.mostrar_campo = False
         self._preparar_desenho()
 
-    def _criar_mapa_opostos(self):
-        return {
-            Particula.E: Particula.W,
-            Particula.W: Particula.E,
-            Particula.NE: Particula.SW,
-            Particula.SW: Particula.NE,
-            Particula.NW: Particula.SE,
-            Particula.SE: Particula.NW,
-        }
-
-    def _criar_regras_colisao(self):
-        regras = {}
-        pares_reversiveis = [
-            (52, 25),
-            (50, 41),
-            (38, 11),
-            (22, 13),
-            (37, 19),
-            (26, 44),
-            (21, 42),
-            (27, 45),
-            (45, 54),
-            (54, 27),
-            (36, 18),
-            (18, 9),
-            (9, 36),
-        ]
-        for a, b in pares_reversiveis:
-            regras[a] = b
-            regras[b] = a
-        return regras
-
     def _preparar_desenho(self):
         self.offsets_hexagono = [
             (
@@ -106,67 +64,25 @@ class Simulacao:
         ]
         self.vetores_desenho = {p: (v[0], -v[1]) for p, v in VETORES_DIRECAO.items()}
 
+        # Centro de cada bloco do campo médio, em pixels
+        k = self.campos.bloco
+        linhas, colunas = self.campos.forma
+        centro_r = np.arange(linhas) * k + (k - 1) / 2 + 0.25
+        centro_c = np.arange(colunas) * k + (k - 1) / 2
+        self.centros_blocos_x = HEX_SIZE * 1.5 * centro_c + HEX_SIZE
+        self.centros_blocos_y = HEX_SIZE * math.sqrt(3) * centro_r + HEX_SIZE
+
     def limpar_grade(self):
-        self.estados = [[0] * GRID_WIDTH for _ in range(GRID_HEIGHT)]
-        self.obstaculos = [[False] * GRID_WIDTH for _ in range(GRID_HEIGHT)]
-        self.fontes = [[False] * GRID_WIDTH for _ in range(GRID_HEIGHT)]
+        self.motor.limpar()
+        self.campos.limpar()
 
     def _atualizar_estado(self):
-        for r in range(GRID_HEIGHT):
-            for c in range(GRID_WIDTH):
-                if self.fontes[r][c]:
-                    self.estados[r][c] |= Particula.SE | Particula.SW
-
-        estados_colididos = [
-            [
-                self.REGRAS_DE_COLISAO.get(self.estados[r][c], self.estados[r][c])
-                for c in range(GRID_WIDTH)
-            ]
-            for r in range(GRID_HEIGHT)
-        ]
-
-        novos_estados = [[0] * GRID_WIDTH for _ in range(GRID_HEIGHT)]
-        for r in range(GRID_HEIGHT):
-            for c in range(GRID_WIDTH):
-                estado_celula = estados_colididos[r][c]
-                if not estado_celula:
-                    continue
-                for particula in Particula:
-                    if estado_celula & particula:
-                        nr, nc = self._get_vizinho(r, c, particula)
-                        if (
-                            0 <= nr < GRID_HEIGHT
-                            and 0 <= nc < GRID_WIDTH
-                            and not self.obstaculos[nr][nc]
-                        ):
-                            novos_estados[nr][nc] |= particula
-                        else:
-                            novos_estados[r][c] |= self.MAPA_DIRECOES_OPOSTAS[particula]
-        self.estados = novos_estados
-
-    @staticmethod
-    @lru_cache(maxsize=None)
-    def _get_vizinho(r, c, direcao):
-        idx = int(math.log2(direcao))
-        if c % 2 == 0:
-            offsets = [
-                (r, c + 1),
-                (r + 1, c),
-                (r + 1, c - 1),
-                (r, c - 1),
-                (r - 1, c - 1),
-                (r - 1, c),
-            ]
+        self.motor.passo()
+        # Os planos de bits são contados direto, sem desempacotar a rede
+        if isinstance(self.motor, MotorFHPCompactado):
+            self.campos.acumular_planos(self.motor.planos)
         else:
-            offsets = [
-                (r, c + 1),
-                (r + 1, c + 1),
-                (r + 1, c),
-                (r, c - 1),
-                (r - 1, c),
-                (r - 1, c + 1),
-            ]
-        return offsets[idx]
+            self.campos.acumular(self.motor.estados)
 
     def _desenhar(self):
         self.display.fill(COR_FUNDO)
@@ -174,12 +90,15 @@ class Simulacao:
             (SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA
         )
 
+        estados = self.motor.estados
+        obstaculos = self.motor.obstaculos
+        fontes = self.motor.fontes
         for r in range(GRID_HEIGHT):
             for c in range(GRID_WIDTH):
                 cor_hex = COR_HEX_VAZIO
-                if self.obstaculos[r][c]:
+                if obstaculos[r, c]:
                     cor_hex = COR_HEX_OBSTACULO
-                elif self.fontes[r][c]:
+                elif fontes[r, c]:
                     cor_hex = COR_HEX_FONTE
 
                 centro = self._hex_para_pixel(r, c)
@@ -190,9 +109,9 @@ class Simulacao:
                 pygame.draw.polygon(self.display, cor_hex, pontos)
                 pygame.draw.polygon(self.display, COR_CONTORNO_HEX, pontos, 1)
 
-                if self.estados[r][c]:
+                if estados[r, c] and not self.mostrar_campo:
                     for particula in Particula:
-                        if self.estados[r][c] & particula:
+                        if estados[r, c] & particula:
                             vetor = self.vetores_desenho[particula]
                             ponta = (
                                 centro[0] + vetor[0] * HEX_SIZE * 0.7,
@@ -205,16 +124,36 @@ class Simulacao:
                                 surface_particulas, COR_PARTICULA, ponta, 2
                             )
 
+        if self.mostrar_campo:
+            self._desenhar_campo(surface_particulas)
         self.display.blit(surface_particulas, (0, 0))
 
         status_texto = "Rodando" if self.simulacao_iniciada else "Pausado"
         texto_surface = self.font.render(
-            f"Simulação: {status_texto}  (Espaço p/ start/pause)", True, COR_TEXTO
+            f"Simulação: {status_texto}  (Espaço p/ start/pause, "
+            "V campo médio, E exportar)",
+            True,
+            COR_TEXTO,
         )
         self.display.blit(texto_surface, (10, 10))
 
         pygame.display.update()
 
+    def _desenhar_campo(self, surface):
+        """Desenha a velocidade média de cada bloco como uma seta."""
+        amostra = self.campos.amostrar()
+        comprimento = ESCALA_SETA * self.campos.bloco * HEX_SIZE
+        pontas_x = self.centros_blocos_x + amostra["velocidade_x"] * comprimento
+        # O eixo y da tela cresce para baixo
+        pontas_y = (
+            self.centros_blocos_y[:, None] - amostra["velocidade_y"] * comprimento
+        )
+        for i, j in zip(*np.nonzero(amostra["densidade"])):
+            centro = (self.centros_blocos_x[j], self.centros_blocos_y[i])
+            ponta = (pontas_x[i, j], pontas_y[i, j])
+            pygame.draw.line(surface, COR_FLUXO, centro, ponta, 2)
+            pygame.draw.circle(surface, COR_FLUXO, ponta, 3)
+
     def _processar_eventos(self):
         for evento in pygame.event.get():
             if evento.type == pygame.QUIT or (
@@ -227,6 +166,11 @@ class Simulacao:
                     self.simulacao_iniciada = not self.simulacao_iniciada
                 if evento.key == pygame.K_c:
                     self.limpar_grade()
+                if evento.key == pygame.K_v:
+                    self.mostrar_campo = not self.mostrar_campo
+                if evento.key == pygame.K_e:
+                    self.campos.exportar(ARQUIVO_CAMPOS)
+                    print(f"Campos médios salvos em '{ARQUIVO_CAMPOS}'.")
 
         if self.delay_mouse <= 0:
             botoes = pygame.mouse.get_pressed()
@@ -234,9 +178,9 @@ class Simulacao:
                 r, c = self._pixel_para_hex(pygame.mouse.get_pos())
                 if r != -1:
                     if botoes[0]:
-                        self.fontes[r][c] = not self.fontes[r][c]
+                        self.motor.alternar_fonte(r, c)
                     if botoes[2]:
-                        self.obstaculos[r][c] = not self.obstaculos[r][c]
+                        self.motor.alternar_obstaculo(r, c)
                     self.delay_mouse = 12
         else:
             self.delay_mouse -= 1
@@ -0,0 +1,15 @@
+"""Coloca a raiz do repositório no `sys.path` para `pytest` sem instalação.
+
+O simulador de água antigo não é um pacote; seus módulos (`motor_fhp`,
+`campos_fhp`) são importados direto da pasta dele, como faz o
+`riverpygame.py`.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WATER = os.path.join(ROOT, "previus-water-simulation-discarted-tries")
+for path in (ROOT, WATER):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,90 @@
+"""Pincéis: desfazer restaura as camadas e as regiões devolvidas cobrem as edições."""
+
+import numpy as np
+import pytest
+
+from fire_automata.brush import BRUSH_FALLOFFS, BRUSH_SHAPES, BrushEditor
+from fire_automata.grid import FireGrid
+from fire_automata.rules import CELL_ELEVATION_LAYER, CELL_MOISTURE_LAYER, EMPTY, TREE
+from fire_automata.simulation import FireSimulation
+
+
+def _simulation(seed=6, rows=30, cols=34):
+    rng = np.random.default_rng(seed)
+    status = np.where(rng.random((rows, cols)) < 0.7, TREE, EMPTY).astype(np.int8)
+    terrain = (
+        rng.uniform(0, 20, (rows, cols)).astype(np.float32),
+        rng.uniform(0.1, 0.4, (rows, cols)).astype(np.float32),
+    )
+    grid = FireGrid(rows, cols, status=status, terrain=terrain)
+    return FireSimulation(grid, "kernel", stats=True, rng=np.random.default_rng(1))
+
+
+def _planes(grid):
+    return tuple(plane.copy() for plane in grid.layers)
+
+
+def _covered(shape, regions):
+    covered = np.zeros(shape, dtype=bool)
+    for region in regions:
+        covered[region] = True
+    return covered
+
+
+def _stroke(brushes, rng):
+    """Uma pincelada com várias aplicações sobrepostas, perto das bordas também."""
+    rows, cols = brushes.simulation.grid.shape[:2]
+    regions = []
+    x, y = int(rng.integers(-2, cols + 2)), int(rng.integers(-2, rows + 2))
+    for _ in range(6):
+        x += int(rng.integers(-2, 3))
+        y += int(rng.integers(-2, 3))
+        kind = int(rng.integers(3))
+        if kind == 0:
+            region = brushes.paint_fire(x, y)
+        elif kind == 1:
+            region = brushes.paint_layer(CELL_ELEVATION_LAYER, x, y, 7.5, 0.0, 30.0)
+        else:
+            region = brushes.paint_layer(CELL_MOISTURE_LAYER, x, y, -0.15, 0.0, 1.0)
+        if region is not None:
+            regions.append(region)
+    brushes.end_stroke()
+    return regions
+
+
+@pytest.mark.parametrize("shape", BRUSH_SHAPES)
+@pytest.mark.parametrize("falloff", BRUSH_FALLOFFS)
+def test_undo_restores_every_plane(shape, falloff):
+    simulation = _simulation()
+    brushes = BrushEditor(simulation, radius=3, shape=shape, falloff=falloff)
+    rng = np.random.default_rng(12)
+    states = [_planes(simulation.grid)]
+    for _ in range(5):
+        _stroke(brushes, rng)
+        states.append(_planes(simulation.grid))
+    assert not all(
+        np.array_equal(a, b) for a, b in zip(states[0], states[-1])
+    ), "as pinceladas não alteraram a grade"
+
+    for expected, changed in zip(reversed(states[:-1]), reversed(states[1:])):
+        regions = brushes.undo()
+        restored = _planes(simulation.grid)
+        covered = _covered(simulation.grid.shape[:2], regions)
+        for before, after, plane in zip(changed, restored, expected):
+            np.testing.assert_array_equal(after, plane)
+            assert covered[before != after].all()
+    assert brushes.undo() == []
+    assert not brushes.ignition_points
+
+
+@pytest.mark.parametrize("falloff", BRUSH_FALLOFFS)
+def test_returned_regions_cover_changed_cells(falloff):
+    simulation = _simulation(seed=8)
+    brushes = BrushEditor(simulation, radius=4, shape="circle", falloff=falloff)
+    rng = np.random.default_rng(3)
+    for _ in range(5):
+        before = _planes(simulation.grid)
+        regions = _stroke(brushes, rng)
+        covered = _covered(simulation.grid.shape[:2], regions)
+        for plane, after in zip(before, _planes(simulation.grid)):
+            assert covered[plane != after].all()
@@ -0,0 +1,27 @@
+"""As somas por bloco dos planos de bits batem com as do array de estados."""
+
+import numpy as np
+import pytest
+
+from campos_fhp import CamposMacroscopicos
+from motor_fhp import MotorFHPCompactado
+
+
+# Blocos que cabem numa palavra, que cruzam a fronteira e maiores que ela
+@pytest.mark.parametrize(
+    "linhas, colunas, bloco",
+    [(20, 20, 4), (17, 130, 3), (13, 129, 7), (70, 300, 64), (8, 150, 70), (5, 3, 4)],
+)
+def test_packed_block_sums_match_unpacked(linhas, colunas, bloco):
+    rng = np.random.default_rng(bloco)
+    motor = MotorFHPCompactado(linhas, colunas)
+    motor.estados = rng.integers(0, 64, (linhas, colunas)).astype(np.uint8)
+    campos = CamposMacroscopicos(linhas, colunas, bloco, janela=3)
+    referencia = CamposMacroscopicos(linhas, colunas, bloco, janela=3)
+    for _ in range(5):
+        motor.passo()
+        campos.acumular_planos(motor.planos)
+        referencia.acumular(motor.estados)
+        amostra, esperada = campos.amostrar(), referencia.amostrar()
+        for nome in esperada:
+            np.testing.assert_array_equal(amostra[nome], esperada[nome], nome)
@@ -0,0 +1,99 @@
+"""Com `CounterRNG`, todos os motores queimam exatamente as mesmas células."""
+
+import dataclasses
+
+import numpy as np
+import pytest
+
+from fire_automata.batch import run_batch
+from fire_automata.config import ISOMETRIC_3D
+from fire_automata.counter_rng import CounterRNG
+from fire_automata.engine import BatchedEngine
+from fire_automata.grid import FireGrid
+from fire_automata.parallel import ParallelEngine
+from fire_automata.rules import BURNED, BURNING, EMPTY, TREE
+from fire_automata.simulation import FireSimulation
+from fire_automata.tiled import TiledEngine, TiledGrid
+
+SEED = 31
+STEPS = 80
+ROWS, COLS = 61, 47
+IGNITIONS = ((23, 30), (5, 5), (46, 60))
+
+
+def _grid():
+    rng = np.random.default_rng(3)
+    status = np.where(rng.random((ROWS, COLS)) < 0.9, TREE, EMPTY).astype(np.int8)
+    terrain = (
+        rng.uniform(0, 30, (ROWS, COLS)).astype(np.float32),
+        rng.uniform(0.1, 0.4, (ROWS, COLS)).astype(np.float32),
+    )
+    grid = FireGrid(ROWS, COLS, status=status, terrain=terrain)
+    for x, y in IGNITIONS:
+        grid.status[y, x] = BURNING
+    return grid
+
+
+def _simulate(engine):
+    simulation = FireSimulation(_grid(), engine, rng=CounterRNG(SEED))
+    for _ in range(STEPS):
+        simulation.step()
+    return simulation.grid.status
+
+
+@pytest.fixture(scope="module")
+def reference():
+    status = _simulate("dense")
+    assert np.count_nonzero(status == BURNED) > ROWS * COLS // 4
+    return status
+
+
+def test_frontier(reference):
+    np.testing.assert_array_equal(_simulate("frontier"), reference)
+
+
+def test_batched(reference):
+    engine = BatchedEngine(_grid(), [CounterRNG(SEED), CounterRNG(SEED + 1)])
+    states = engine.run(STEPS)
+    np.testing.assert_array_equal(states[0], reference)
+    assert not np.array_equal(states[1], reference)
+
+
+@pytest.mark.parametrize("workers, strips", [(1, 1), (1, 7), (2, 2), (2, 13), (3, 61)])
+def test_parallel(reference, workers, strips):
+    with ParallelEngine(
+        _grid(), workers=workers, strips=strips, seed=SEED, counter_rng=True
+    ) as engine:
+        final = engine.run(STEPS)
+    np.testing.assert_array_equal(final.status, reference)
+
+
+@pytest.mark.parametrize("tile_size", [3, 8, 16, 20, 47, 64])
+def test_tiled(reference, tmp_path, tile_size):
+    tiled = TiledGrid.from_grid(str(tmp_path), _grid(), tile_size)
+    TiledEngine(tiled, rng=CounterRNG(SEED)).run(STEPS)
+    np.testing.assert_array_equal(tiled.to_grid().status, reference)
+
+
+def test_run_batch_matches_across_engines():
+    config = dataclasses.replace(ISOMETRIC_3D, tree_density=0.8)
+    results = {
+        engine: run_batch(
+            SEED,
+            30,
+            26,
+            [(15, 13), (2, 3)],
+            12,
+            config=config,
+            workers=2,
+            engine=engine,
+            batch_size=5,
+            counter_rng=True,
+        )
+        for engine in ("dense", "frontier", "batched")
+    }
+    frequency, mean_time = results["dense"]
+    assert frequency.sum() > 30
+    for engine in ("frontier", "batched"):
+        np.testing.assert_array_equal(results[engine][0], frequency)
+        np.testing.assert_array_equal(results[engine][1], mean_time)
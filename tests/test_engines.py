@@ -0,0 +1,68 @@
+"""Equivalência estatística do motor denso com o laço de referência."""
+
+import random
+
+import numpy as np
+
+from fire_automata.engine import DenseEngine
+from fire_automata.rules import (
+    BURNED,
+    BURNING,
+    CELL_ELEVATION_LAYER,
+    CELL_MOISTURE_LAYER,
+    CELL_STATUS_LAYER,
+    TREE,
+    run_step_loop,
+)
+
+SIZE = 12
+REPLICATES = 400
+# |z| acima disso em uma das ~150 células é muito improvável por acaso
+MAX_Z = 4.5
+
+
+def _grid(seed):
+    rng = np.random.default_rng(seed)
+    grid = np.zeros((SIZE, SIZE, 3))
+    grid[:, :, CELL_STATUS_LAYER] = np.where(rng.random((SIZE, SIZE)) < 0.85, TREE, 0)
+    grid[:, :, CELL_ELEVATION_LAYER] = rng.integers(0, 5, (SIZE, SIZE))
+    grid[:, :, CELL_MOISTURE_LAYER] = rng.uniform(0, 0.5, (SIZE, SIZE))
+    grid[SIZE // 2, SIZE // 2, CELL_STATUS_LAYER] = BURNING
+    return grid
+
+
+def _run_replicates(grid, step):
+    """Frequência de queima por célula e área queimada de cada réplica."""
+    burned = np.zeros(grid.shape[:2])
+    areas = []
+    for _ in range(REPLICATES):
+        current = grid.copy()
+        while (current[:, :, CELL_STATUS_LAYER] == BURNING).any():
+            current = step(current)
+        final = current[:, :, CELL_STATUS_LAYER] == BURNED
+        burned += final
+        areas.append(final.sum())
+    return burned / REPLICATES, np.array(areas)
+
+
+def _z(p1, p2, n):
+    pooled = (p1 + p2) / 2
+    se = np.sqrt(2 * pooled * (1 - pooled) / n)
+    return np.divide(np.abs(p1 - p2), se, out=np.zeros_like(se), where=se > 0)
+
+
+def test_dense_engine_matches_loop_statistically():
+    grid = _grid(3)
+    random.seed(11)
+    reference, reference_areas = _run_replicates(grid, run_step_loop)
+    engine = DenseEngine(grid, rng=np.random.default_rng(11))
+    vectorized, vectorized_areas = _run_replicates(grid, engine.step)
+
+    assert _z(reference, vectorized, REPLICATES).max() < MAX_Z
+    standard_error = np.sqrt(
+        (reference_areas.var() + vectorized_areas.var()) / REPLICATES
+    )
+    difference = abs(reference_areas.mean() - vectorized_areas.mean())
+    assert difference < MAX_Z * standard_error
+    # O cenário precisa de um fogo que se espalhe para o teste dizer algo
+    assert reference_areas.mean() > 10
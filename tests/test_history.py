@@ -0,0 +1,98 @@
+"""Snapshots gravados e lidos reproduzem o histórico, o terreno e o gerador."""
+
+import numpy as np
+import pytest
+
+from fire_automata.counter_rng import CounterRNG
+from fire_automata.grid import FireGrid
+from fire_automata.history import HistoryRecorder, load_snapshot, save_snapshot
+from fire_automata.rules import BURNING, EMPTY, TREE
+from fire_automata.simulation import FireSimulation
+
+KEYFRAME_INTERVAL = 3
+STEPS = 11
+EMPTY_STEP = 4
+
+
+def _grid(seed=5, rows=16, cols=20):
+    rng = np.random.default_rng(seed)
+    status = np.where(rng.random((rows, cols)) < 0.8, TREE, EMPTY).astype(np.int8)
+    status[rows // 2, cols // 2] = BURNING
+    terrain = (
+        rng.uniform(0, 10, (rows, cols)).astype(np.float32),
+        rng.uniform(0.1, 0.3, (rows, cols)).astype(np.float32),
+    )
+    return FireGrid(rows, cols, status=status, terrain=terrain)
+
+
+def _record(path, rng):
+    """Simula `STEPS` passos com edições de terreno, gravando cada estado."""
+    simulation = FireSimulation(_grid(), rng=rng)
+    recorder = HistoryRecorder(simulation.grid, keyframe_interval=KEYFRAME_INTERVAL)
+    statuses = [simulation.grid.status.copy()]
+    terrains = [(simulation.grid.elevation.copy(), simulation.grid.moisture.copy())]
+    for step in range(1, STEPS + 1):
+        if step == EMPTY_STEP:
+            # Passo sem nenhuma mudança: o delta gravado fica vazio
+            pass
+        else:
+            simulation.step()
+        if step == 2:
+            simulation.grid.elevation[3:6, 4:9] += 5
+            simulation.terrain_changed((slice(3, 6), slice(4, 9)))
+            recorder.terrain_changed((slice(2, 5), slice(4, 9)))
+            # Regiões sobrepostas, uma delas com fatias abertas
+            recorder.terrain_changed((slice(4, 7), slice(None)))
+        if step == 7:
+            simulation.grid.moisture[10:, :3] = 0.9
+            simulation.terrain_changed((slice(10, None), slice(0, 3)))
+            recorder.terrain_changed((slice(10, None), slice(0, 3)))
+        recorder.record(simulation.grid)
+        statuses.append(simulation.grid.status.copy())
+        terrains.append(
+            (simulation.grid.elevation.copy(), simulation.grid.moisture.copy())
+        )
+    save_snapshot(
+        path, simulation.grid, simulation.step_count, 5, simulation.engine.rng, recorder
+    )
+    return statuses, terrains
+
+
+def test_status_and_terrain_round_trip(tmp_path):
+    path = tmp_path / "history.fsnap"
+    statuses, terrains = _record(path, np.random.default_rng(3))
+    snapshot = load_snapshot(path)
+
+    assert snapshot.seed == 5
+    assert (snapshot.first_step, snapshot.last_step) == (0, STEPS)
+    np.testing.assert_array_equal(
+        np.diff(snapshot._arrays["value_offsets"])[EMPTY_STEP - 1], 0
+    )
+    for step in range(STEPS + 1):
+        np.testing.assert_array_equal(snapshot.status_at(step), statuses[step])
+        grid = snapshot.grid_at(step)
+        np.testing.assert_array_equal(grid.status, statuses[step])
+        np.testing.assert_array_equal(grid.elevation, terrains[step][0])
+        np.testing.assert_array_equal(grid.moisture, terrains[step][1])
+    np.testing.assert_array_equal(snapshot.grid().status, statuses[-1])
+    with pytest.raises(IndexError):
+        snapshot.status_at(STEPS + 1)
+
+
+def test_generator_state_is_restored(tmp_path):
+    path = tmp_path / "generator.fsnap"
+    rng = np.random.default_rng(8)
+    _record(path, rng)
+    restored = load_snapshot(path).rng()
+    np.testing.assert_array_equal(restored.random(16), rng.random(16))
+
+
+def test_counter_rng_is_restored(tmp_path):
+    path = tmp_path / "counter.fsnap"
+    rng = CounterRNG(8)
+    _record(path, rng)
+    restored = load_snapshot(path).rng()
+    assert isinstance(restored, CounterRNG)
+    assert restored.key == rng.key
+    ys, xs = np.divmod(np.arange(40), 8)
+    np.testing.assert_array_equal(restored.uniform(9, ys, xs), rng.uniform(9, ys, xs))
@@ -0,0 +1,109 @@
+"""Tabela de ignição do `KernelEngine`: atualização por região, vento e regra base."""
+
+import numpy as np
+import pytest
+
+from fire_automata.engine import KernelEngine
+from fire_automata.grid import FireGrid
+from fire_automata.rules import (
+    BURNED,
+    BURNING,
+    EMPTY,
+    TREE,
+    ignition_probability,
+    ignition_table,
+    neighborhood_offsets,
+)
+from fire_automata.simulation import FireSimulation
+
+
+def _grid(seed=0, rows=28, cols=33, flat=False, density=0.8):
+    rng = np.random.default_rng(seed)
+    status = np.where(rng.random((rows, cols)) < density, TREE, EMPTY).astype(np.int8)
+    elevation = rng.uniform(0, 6, (rows, cols)).astype(np.float32)
+    if flat:
+        elevation[...] = 2.0
+    moisture = rng.uniform(0.1, 0.5, (rows, cols)).astype(np.float32)
+    return FireGrid(rows, cols, status=status, terrain=(elevation, moisture))
+
+
+@pytest.mark.parametrize(
+    "neighborhood, radius, wind",
+    [("moore", 1, (0.0, 0.0)), ("disk", 2, (3.0, -1.5)), ("von_neumann", 3, (0, 4))],
+)
+@pytest.mark.parametrize(
+    "region",
+    [
+        (slice(10, 14), slice(7, 12)),
+        (slice(0, 3), slice(30, 33)),
+        (slice(27, 28), slice(0, 1)),
+    ],
+)
+def test_terrain_changed_matches_a_full_rebuild(neighborhood, radius, wind, region):
+    grid = _grid()
+    engine = KernelEngine(grid, neighborhood=neighborhood, radius=radius, wind=wind)
+    rng = np.random.default_rng(1)
+    shape = grid.elevation[region].shape
+    grid.elevation[region] += rng.uniform(-3, 8, shape).astype(np.float32)
+    grid.moisture[region] = rng.uniform(0, 1, shape).astype(np.float32)
+    engine.terrain_changed(grid, region)
+
+    expected = ignition_table(
+        grid.elevation,
+        grid.moisture,
+        neighborhood_offsets(neighborhood, radius),
+        engine.ignition_prob,
+        wind,
+        engine.slope_coefficient,
+        engine.spotting_decay,
+    )
+    np.testing.assert_array_equal(engine.table, expected)
+
+
+def test_wind_favours_downwind_spread():
+    grid = _grid(flat=True)
+    engine = KernelEngine(grid, wind=(6.0, 0.0))
+    offsets = [tuple(offset) for offset in engine.offsets.tolist()]
+    # Árvore a leste do fogo (vizinho em dx = -1) contra árvore a oeste
+    downwind = engine.table[offsets.index((0, -1))]
+    upwind = engine.table[offsets.index((0, 1))]
+    inner = np.s_[:, 1:-1]
+    assert (downwind[inner] > upwind[inner]).all()
+
+    rows, cols = 41, 41
+    east = west = 0
+    for seed in range(10):
+        grid = _grid(seed, rows, cols, flat=True, density=1.0)
+        grid.status[rows // 2, cols // 2] = BURNING
+        simulation = FireSimulation(
+            grid, "kernel", rng=np.random.default_rng(seed), wind=(6.0, 0.0)
+        )
+        for _ in range(12):
+            simulation.step()
+        ys, xs = np.nonzero(np.isin(simulation.grid.status, (BURNING, BURNED)))
+        east += np.count_nonzero(xs > cols // 2)
+        west += np.count_nonzero(xs < cols // 2)
+    assert east > 2 * west
+
+
+@pytest.mark.parametrize("flat", [True, False])
+def test_von_neumann_without_wind_matches_ignition_probability(flat):
+    grid = _grid(flat=flat)
+    # O declive contínuo só coincide com a regra base sem os multiplicadores
+    rules = {} if flat else {"slope_coefficient": 0.0}
+    multipliers = {} if flat else {"uphill_multiplier": 1, "downhill_multiplier": 1}
+    engine = KernelEngine(grid, neighborhood="von_neumann", radius=1, **rules)
+    rows, cols = grid.status.shape
+    ys, xs = np.mgrid[:rows, :cols]
+    for d, (dy, dx) in enumerate(engine.offsets.tolist()):
+        inside = (ys + dy >= 0) & (ys + dy < rows) & (xs + dx >= 0) & (xs + dx < cols)
+        ty, tx = ys[inside], xs[inside]
+        expected = ignition_probability(
+            grid.moisture[ty, tx],
+            grid.elevation[ty, tx],
+            grid.elevation[ty + dy, tx + dx],
+            engine.ignition_prob,
+            **multipliers,
+        )
+        np.testing.assert_allclose(engine.table[d][inside], expected, rtol=1e-6)
+        assert (engine.table[d][~inside] == 0).all()
@@ -0,0 +1,135 @@
+"""Os motores FHP reproduzem, bit a bit, o laço original do `riverpygame.py`."""
+
+import numpy as np
+import pytest
+
+from motor_fhp import MotorFHP, MotorFHPCompactado, Particula
+
+PASSOS = 30
+# Constantes copiadas da versão original, independentes de `motor_fhp`
+PARES_ORIGINAIS = [
+    (52, 25),
+    (50, 41),
+    (38, 11),
+    (22, 13),
+    (37, 19),
+    (26, 44),
+    (21, 42),
+    (27, 45),
+    (45, 54),
+    (54, 27),
+    (36, 18),
+    (18, 9),
+    (9, 36),
+]
+OPOSTOS = {
+    Particula.E: Particula.W,
+    Particula.W: Particula.E,
+    Particula.NE: Particula.SW,
+    Particula.SW: Particula.NE,
+    Particula.NW: Particula.SE,
+    Particula.SE: Particula.NW,
+}
+# Inclui redes de uma linha ou coluna e larguras que cruzam palavras de 64 bits
+FORMAS = [(20, 20), (17, 23), (1, 1), (1, 9), (9, 1), (5, 130), (3, 64), (4, 65)]
+
+
+def _passo_referencia(estados, obstaculos, fontes):
+    """O `_atualizar_estado` original, célula a célula, sobre listas."""
+    linhas, colunas = len(estados), len(estados[0])
+    regras = {}
+    for a, b in PARES_ORIGINAIS:
+        regras[a] = b
+        regras[b] = a
+    for r in range(linhas):
+        for c in range(colunas):
+            if fontes[r][c]:
+                estados[r][c] |= Particula.SE | Particula.SW
+    colididos = [[regras.get(e, e) for e in linha] for linha in estados]
+    novos = [[0] * colunas for _ in range(linhas)]
+    for r in range(linhas):
+        for c in range(colunas):
+            if c % 2 == 0:
+                vizinhos = [
+                    (r, c + 1),
+                    (r + 1, c),
+                    (r + 1, c - 1),
+                    (r, c - 1),
+                    (r - 1, c - 1),
+                    (r - 1, c),
+                ]
+            else:
+                vizinhos = [
+                    (r, c + 1),
+                    (r + 1, c + 1),
+                    (r + 1, c),
+                    (r, c - 1),
+                    (r - 1, c),
+                    (r - 1, c + 1),
+                ]
+            for particula, (nr, nc) in zip(Particula, vizinhos):
+                if not colididos[r][c] & particula:
+                    continue
+                if 0 <= nr < linhas and 0 <= nc < colunas and not obstaculos[nr][nc]:
+                    novos[nr][nc] |= particula
+                else:
+                    # Borda refletora: sem volta ao lado oposto da rede
+                    novos[r][c] |= OPOSTOS[particula]
+    return novos
+
+
+def _cenario(linhas, colunas, semente):
+    rng = np.random.default_rng(semente)
+    estados = rng.integers(0, 64, (linhas, colunas)).astype(np.uint8)
+    obstaculos = rng.random((linhas, colunas)) < 0.15
+    fontes = rng.random((linhas, colunas)) < 0.05
+    return estados, obstaculos, fontes
+
+
+def _comparar(classe, linhas, colunas, semente):
+    estados, obstaculos, fontes = _cenario(linhas, colunas, semente)
+    motor = classe(linhas, colunas)
+    motor.obstaculos = obstaculos.copy()
+    motor.fontes = fontes.copy()
+    motor.atualizar_mascaras()
+    motor.estados = estados.copy()
+
+    referencia = estados.astype(int).tolist()
+    for passo in range(PASSOS):
+        referencia = _passo_referencia(referencia, obstaculos.tolist(), fontes.tolist())
+        motor.passo()
+        np.testing.assert_array_equal(
+            motor.estados, np.array(referencia, dtype=np.uint8), f"passo {passo}"
+        )
+
+
+@pytest.mark.parametrize("classe", [MotorFHP, MotorFHPCompactado])
+@pytest.mark.parametrize("linhas, colunas", FORMAS)
+@pytest.mark.parametrize("semente", [0, 1])
+def test_engine_matches_reference_loop(classe, linhas, colunas, semente):
+    _comparar(classe, linhas, colunas, semente)
+
+
+@pytest.mark.parametrize("classe", [MotorFHP, MotorFHPCompactado])
+def test_particles_reflect_at_the_border(classe):
+    motor = classe(3, 3)
+    estados = np.zeros((3, 3), dtype=np.uint8)
+    estados[1, 2] = Particula.E
+    motor.estados = estados
+    motor.passo()
+    assert motor.estados[1, 2] == Particula.W
+    assert motor.estados[:, 0].sum() == 0
+
+
+def test_packed_engine_carries_across_words():
+    # Uma partícula para leste na última coluna de uma palavra passa para a próxima
+    motor = MotorFHPCompactado(1, 130)
+    estados = np.zeros((1, 130), dtype=np.uint8)
+    estados[0, 63] = Particula.E
+    estados[0, 128] = Particula.W
+    motor.estados = estados
+    motor.passo()
+    esperado = np.zeros((1, 130), dtype=np.uint8)
+    esperado[0, 64] = Particula.E
+    esperado[0, 127] = Particula.W
+    np.testing.assert_array_equal(motor.estados, esperado)
@@ -0,0 +1,85 @@
+"""O cache de sombreamento do `RasterRenderer` desenha o mesmo que um cache novo."""
+
+import os
+
+import numpy as np
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+pygame = pytest.importorskip("pygame")
+
+from fire_automata.brush import BrushEditor  # noqa: E402
+from fire_automata.camera import Camera  # noqa: E402
+from fire_automata.grid import FireGrid  # noqa: E402
+from fire_automata.render import RasterRenderer  # noqa: E402
+from fire_automata.rules import (  # noqa: E402
+    BURNING,
+    CELL_ELEVATION_LAYER,
+    CELL_MOISTURE_LAYER,
+    EMPTY,
+    TREE,
+)
+from fire_automata.simulation import FireSimulation  # noqa: E402
+
+MAX_ELEVATION = 40.0
+SIZE = (180, 140)
+
+
+def _simulation(rows=150, cols=170):
+    rng = np.random.default_rng(4)
+    status = np.where(rng.random((rows, cols)) < 0.7, TREE, EMPTY).astype(np.int8)
+    status[rows // 2, cols // 2] = BURNING
+    terrain = (
+        rng.uniform(0, MAX_ELEVATION, (rows, cols)).astype(np.float32),
+        rng.uniform(0.1, 0.4, (rows, cols)).astype(np.float32),
+    )
+    grid = FireGrid(rows, cols, status=status, terrain=terrain)
+    return FireSimulation(grid, "frontier", rng=np.random.default_rng(2))
+
+
+def _pixels(renderer, grid):
+    surface = pygame.Surface(SIZE)
+    renderer.draw(surface, grid)
+    return pygame.surfarray.array3d(surface)
+
+
+def test_cached_shading_matches_a_fresh_renderer():
+    simulation = _simulation()
+    camera = Camera()
+    renderer = RasterRenderer(2, MAX_ELEVATION, camera=camera)
+    brushes = BrushEditor(simulation, radius=5, shape="circle", falloff="smooth")
+    rng = np.random.default_rng(7)
+    moves = [
+        lambda: None,
+        lambda: camera.move(-37, -21),
+        lambda: camera.move(0.25, 0.25),
+        lambda: camera.zoom_at(0.3, 90, 70),
+        lambda: camera.zoom_at(0.4, 10, 120),
+        lambda: camera.move(25, -8),
+        lambda: camera.zoom_at(5.0, 90, 70),
+        lambda: camera.move(-400, 0),
+        lambda: camera.move(400, 0),
+    ]
+    for frame in range(45):
+        moves[frame % len(moves)]()
+        if frame % 2 == 0:
+            # Pinta perto do centro da janela, para cair em blocos em cache
+            x, y = renderer.screen_to_grid(*(rng.integers(40, 140, 2)))
+            layer = (CELL_ELEVATION_LAYER, CELL_MOISTURE_LAYER)[frame // 2 % 2]
+            region = brushes.paint_layer(layer, x, y, 6.0, 0.0, MAX_ELEVATION)
+            brushes.end_stroke()
+            if region is not None:
+                renderer.mark_dirty(region)
+        if frame % 7 == 6:
+            for region in brushes.undo():
+                renderer.mark_dirty(region)
+        simulation.step()
+        for ys, xs in simulation.engine.changes:
+            renderer.cells_changed(ys, xs)
+
+        fresh = RasterRenderer(
+            2, MAX_ELEVATION, camera=Camera(camera.zoom, (camera.pan_x, camera.pan_y))
+        )
+        np.testing.assert_array_equal(
+            _pixels(renderer, simulation.grid), _pixels(fresh, simulation.grid)
+        )
@@ -0,0 +1,67 @@
+"""`FireSimulation.reset` reaproveita o buffer de trás sem mudar o resultado."""
+
+import numpy as np
+import pytest
+
+from fire_automata.grid import FireGrid
+from fire_automata.rules import (
+    BURNING,
+    CELL_MOISTURE_LAYER,
+    CELL_STATUS_LAYER,
+    EMPTY,
+    TREE,
+)
+from fire_automata.simulation import FireSimulation
+
+
+def _grid(seed, rows=24, cols=30):
+    rng = np.random.default_rng(seed)
+    status = np.where(rng.random((rows, cols)) < 0.8, TREE, EMPTY).astype(np.int8)
+    status[rows // 2, cols // 2] = BURNING
+    terrain = (
+        rng.uniform(0, 20, (rows, cols)).astype(np.float32),
+        rng.uniform(0.1, 0.4, (rows, cols)).astype(np.float32),
+    )
+    return FireGrid(rows, cols, status=status, terrain=terrain)
+
+
+def _run(simulation, steps=8):
+    for _ in range(steps):
+        simulation.step()
+    return np.array(simulation.grid[:, :, CELL_STATUS_LAYER])
+
+
+def test_reset_reuses_the_back_buffer():
+    simulation = FireSimulation(_grid(1), rng=np.random.default_rng(5))
+    _run(simulation, 3)
+    planes = (simulation.grid.status, simulation._back.status)
+
+    grid = _grid(2)
+    simulation.reset(grid, 4)
+    simulation.engine.rng = np.random.default_rng(5)
+    assert any(simulation._back.status is plane for plane in planes)
+    assert simulation._back.elevation is grid.elevation
+    assert simulation._back.moisture is grid.moisture
+
+    fresh = FireSimulation(_grid(2), rng=np.random.default_rng(5))
+    fresh.reset(fresh.grid, 4)
+    np.testing.assert_array_equal(_run(simulation), _run(fresh))
+
+
+@pytest.mark.parametrize("swaps", [0, 1])
+def test_array_grid_keeps_both_buffers_in_sync(swaps):
+    grid = _grid(3).to_array()
+    simulation = FireSimulation(grid, rng=np.random.default_rng(2))
+    back = simulation._back
+    simulation.reset(grid.copy())
+    assert simulation._back is back
+    _run(simulation, swaps)
+
+    simulation.grid[2:6, 3:9, CELL_MOISTURE_LAYER] = 0.95
+    simulation.terrain_changed((slice(2, 6), slice(3, 9)))
+    simulation.step()
+    np.testing.assert_array_equal(
+        simulation.grid[:, :, CELL_MOISTURE_LAYER],
+        simulation._back[:, :, CELL_MOISTURE_LAYER],
+    )
+    assert (simulation.grid[2:6, 3:9, CELL_MOISTURE_LAYER] == 0.95).all()
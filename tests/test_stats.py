@@ -0,0 +1,124 @@
+"""As contagens incrementais de `FireStats` batem com uma recontagem da grade."""
+
+import numpy as np
+import pytest
+
+from fire_automata.brush import BrushEditor
+from fire_automata.grid import FireGrid
+from fire_automata.rules import (
+    BURNED,
+    BURNING,
+    CELL_ELEVATION_LAYER,
+    CELL_MOISTURE_LAYER,
+    EMPTY,
+    TREE,
+)
+from fire_automata.simulation import FireSimulation
+from fire_automata.stats import STATS_FIELDS, FireStats, ParquetStatsWriter
+
+STEPS = 60
+
+
+def _grid(seed=2, rows=40, cols=48):
+    rng = np.random.default_rng(seed)
+    status = np.where(rng.random((rows, cols)) < 0.75, TREE, EMPTY).astype(np.int8)
+    status[rows // 2, cols // 2] = BURNING
+    terrain = (
+        rng.uniform(0, 20, (rows, cols)).astype(np.float32),
+        rng.uniform(0.1, 0.4, (rows, cols)).astype(np.float32),
+    )
+    return FireGrid(rows, cols, status=status, terrain=terrain)
+
+
+def _assert_matches_recount(stats, grid):
+    recount = FireStats(grid, step=stats.step)
+    for state in (TREE, BURNING, BURNED, EMPTY):
+        assert stats.counts[state] == np.count_nonzero(grid.status == state)
+    assert stats.counts == recount.counts
+    assert stats.front_perimeter == recount.front_perimeter
+    assert stats.fire_bounds == recount.fire_bounds
+
+
+@pytest.mark.parametrize("engine", ["dense", "frontier", "kernel"])
+def test_counters_follow_steps_and_brush_edits(engine):
+    simulation = FireSimulation(
+        _grid(), engine, stats=True, rng=np.random.default_rng(4)
+    )
+    brushes = BrushEditor(simulation, radius=2, shape="circle", falloff="linear")
+    rng = np.random.default_rng(9)
+    rows, cols = simulation.grid.shape[:2]
+    for step in range(STEPS):
+        x, y = int(rng.integers(cols)), int(rng.integers(rows))
+        action = step % 5
+        if action == 0:
+            brushes.paint_fire(x, y)
+            brushes.end_stroke()
+        elif action == 1:
+            brushes.paint_layer(CELL_MOISTURE_LAYER, x, y, 0.3, 0.0, 1.0)
+            brushes.paint_layer(CELL_ELEVATION_LAYER, x, y, 8.0, 0.0, 50.0)
+            brushes.end_stroke()
+        elif action == 3:
+            brushes.paint_fire(x, y)
+            brushes.undo()
+        _assert_matches_recount(simulation.stats, simulation.grid)
+        simulation.step()
+        _assert_matches_recount(simulation.stats, simulation.grid)
+    assert simulation.stats.counts[BURNED] > 0
+
+
+def test_counters_follow_multi_step_burns():
+    simulation = FireSimulation(
+        _grid(seed=5), "event", stats=True, rng=np.random.default_rng(6), burn_time=2.5
+    )
+    carried = 0
+    while not simulation.stats.extinct:
+        simulation.step()
+        _assert_matches_recount(simulation.stats, simulation.grid)
+        carried = max(
+            carried, simulation.stats.counts[BURNING] - simulation.stats.ignited
+        )
+    # Células acesas em passos anteriores continuaram queimando
+    assert carried > 0
+    assert simulation.stats.extinction_step == simulation.step_count
+
+
+def test_counters_follow_cells_that_ignite_and_burn_out_in_one_step():
+    simulation = FireSimulation(
+        _grid(seed=5), "event", stats=True, rng=np.random.default_rng(6), burn_time=0.5
+    )
+    rows, cols = simulation.grid.shape[:2]
+    overlap = 0
+    while not simulation.stats.extinct:
+        simulation.step()
+        _assert_matches_recount(simulation.stats, simulation.grid)
+        (burned_ys, burned_xs), (ignited_ys, ignited_xs) = simulation.engine.changes
+        # Células que aparecem nas duas listas: acesas e apagadas no mesmo passo
+        overlap += np.intersect1d(
+            np.ravel_multi_index((burned_ys, burned_xs), (rows, cols)),
+            np.ravel_multi_index((ignited_ys, ignited_xs), (rows, cols)),
+        ).size
+    assert overlap > 0
+    assert simulation.stats.counts[BURNED] > 0
+
+
+def test_parquet_schema_does_not_depend_on_the_first_rows(tmp_path):
+    pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+    grid = _grid()
+    grid.status[grid.status == BURNING] = TREE
+    path = str(tmp_path / "stats.parquet")
+    writer = ParquetStatsWriter(path, row_group_size=3)
+    simulation = FireSimulation(grid, "frontier", stats=True)
+    simulation.stats.sink = writer
+    # O primeiro grupo só tem linhas sem fogo, com limites nulos
+    for _ in range(4):
+        simulation.step()
+    simulation.start_fire(10, 10)
+    for _ in range(5):
+        simulation.step()
+    writer.close()
+
+    table = pyarrow_parquet.read_table(path)
+    assert table.column_names == list(STATS_FIELDS)
+    assert str(table.schema.field("fire_min_y").type) == "int64"
+    assert table.column("fire_min_y").to_pylist()[:4] == [None] * 4
+    assert table.column("fire_min_y").to_pylist()[-1] is not None
@@ -0,0 +1,54 @@
+"""O modo "legacy" reproduz a grade do laço original com `random.seed(seed)`."""
+
+import random
+
+import numpy as np
+import pytest
+
+from fire_automata.rules import (
+    CELL_ELEVATION_LAYER,
+    CELL_MOISTURE_LAYER,
+    CELL_STATUS_LAYER,
+    EMPTY,
+    TREE,
+)
+from fire_automata.terrain import (
+    MAX_INITIAL_MOISTURE,
+    MIN_INITIAL_MOISTURE,
+    initialize_grid,
+)
+
+
+def _reference(cols, rows, tree_density, seed, max_elevation, integer_elevation):
+    """O laço célula a célula dos scripts originais."""
+    random.seed(seed)
+    grid = np.zeros((rows, cols, 3), dtype=np.float32)
+    for y in range(rows):
+        for x in range(cols):
+            grid[y, x, CELL_STATUS_LAYER] = (
+                TREE if random.random() < tree_density else EMPTY
+            )
+            if integer_elevation:
+                grid[y, x, CELL_ELEVATION_LAYER] = random.randint(0, max_elevation)
+            else:
+                grid[y, x, CELL_ELEVATION_LAYER] = random.uniform(0, max_elevation)
+            grid[y, x, CELL_MOISTURE_LAYER] = random.uniform(
+                MIN_INITIAL_MOISTURE, MAX_INITIAL_MOISTURE
+            )
+    return grid
+
+
+@pytest.mark.parametrize("seed", [0, 1, 42, 2024])
+@pytest.mark.parametrize(
+    "cols, rows, max_elevation", [(1, 1, 100), (37, 23, 100), (112, 62, 25), (9, 5, 1)]
+)
+@pytest.mark.parametrize("integer_elevation", [False, True])
+def test_legacy_matches_reference_loop(
+    seed, cols, rows, max_elevation, integer_elevation
+):
+    grid = initialize_grid(
+        cols, rows, 0.6, seed, max_elevation, integer_elevation, mode="legacy"
+    )
+    expected = _reference(cols, rows, 0.6, seed, max_elevation, integer_elevation)
+    for layer in (CELL_STATUS_LAYER, CELL_ELEVATION_LAYER, CELL_MOISTURE_LAYER):
+        np.testing.assert_array_equal(grid[:, :, layer], expected[:, :, layer])